@@ -1,32 +1,45 @@
 import logging
 import json
 import numpy as np
-from flask import Blueprint, jsonify, request
-from typing import Optional, List
-
-from core.utils.utils import load_config
-
-from geometry.icosahedron.generator import generate_icosahedron, subdivide_faces, generate_klee_penrose_polyhedron
-from geometry.icosahedron.dynamics import update_icosahedron_dynamics
-from geometry.spiral_torus.dynamics import update_toroidal_spiral_dynamics
-from geometry.spiral_torus.generator import generate_toroidal_spiral_system
-from geometry.cubes.generator import CubeGenerator
-from geometry.cubes.dynamics import update_cubes_dynamics
-from geometry.spiral.generator import generate_spiral_simple_initial
-from geometry.spiral.dynamics import animate_spiral_simple
-from geometry.torus_spring.generator import generate_torus_spring_system
-from geometry.torus_spring.dynamics import update_torus_spring_dynamics
-from geometry.centrifuge_laser.generator import generate_centrifuge_laser_system
-from geometry.centrifuge_laser.dynamics import update_centrifuge_laser_dynamics
-from geometry.centrifuge_laser_v2.generator import generate_centrifuge_laser_v2_data
-from geometry.crypto_token_river.generator import generate_crypto_token_river_data
-from geometry.stream.generator import generate_stream_tokens
-from geometry.metacube_oracle.generator import generate_metacube_oracle_data
+from flask import Blueprint, Response, jsonify, request
+from typing import Any, Callable, Dict, Optional, List
+
+from core.utils.utils import get_config
+from core.startup import lazy_import
+from geometry.sessions import SimulationSessionRegistry
+from geometry.runner import (
+    FRAME_FORMATS, FRAMES_MIMETYPE, MSGPACK_AVAILABLE, MSGPACK_MIMETYPES,
+    SimulationFrames, run_simulation, segments_from_sizes
+)
+
+# Moteurs géométriques chargés au premier appel de leur route (numpy/scipy compris)
+subdivide_faces = lazy_import("geometry.common", "subdivide_faces")
+generate_icosahedron = lazy_import("geometry.icosahedron.generator", "generate_icosahedron")
+generate_klee_penrose_polyhedron = lazy_import("geometry.icosahedron.generator", "generate_klee_penrose_polyhedron")
+update_icosahedron_dynamics = lazy_import("geometry.icosahedron.dynamics", "update_icosahedron_dynamics")
+ToroidalSpiralSystem = lazy_import("geometry.spiral_torus.dynamics", "ToroidalSpiralSystem")
+generate_toroidal_spiral_system = lazy_import("geometry.spiral_torus.generator", "generate_toroidal_spiral_system")
+CubeGenerator = lazy_import("geometry.cubes.generator", "CubeGenerator")
+CubeSystem = lazy_import("geometry.cubes.dynamics", "CubeSystem")
+generate_spiral_simple_initial = lazy_import("geometry.spiral.generator", "generate_spiral_simple_initial")
+animate_spiral_simple = lazy_import("geometry.spiral.dynamics", "animate_spiral_simple")
+generate_torus_spring_system = lazy_import("geometry.torus_spring.generator", "generate_torus_spring_system")
+SpringNetwork = lazy_import("geometry.torus_spring.dynamics", "SpringNetwork")
+generate_centrifuge_laser_system = lazy_import("geometry.centrifuge_laser.generator", "generate_centrifuge_laser_system")
+CentrifugeLaserSystem = lazy_import("geometry.centrifuge_laser.dynamics", "CentrifugeLaserSystem")
+CentrifugeLaserV2Generator = lazy_import("geometry.centrifuge_laser_v2.generator", "CentrifugeLaserV2Generator")
+generate_crypto_token_river_data = lazy_import("geometry.crypto_token_river.generator", "generate_crypto_token_river_data")
+generate_stream_tokens = lazy_import("geometry.stream.generator", "generate_stream_tokens")
+MetaCubeOracleGenerator = lazy_import("geometry.metacube_oracle.generator", "MetaCubeOracleGenerator")
+get_metacube_source_cache = lazy_import("geometry.metacube_oracle.generator", "get_source_cache")
 
 geometry_api = Blueprint('geometry_api', __name__)
 
+# Simulations Centrifugeuse Laser 2.0 conservées entre les requêtes d'une même session
+centrifuge_v2_sessions = SimulationSessionRegistry(CentrifugeLaserV2Generator)
+
 # Charger la configuration
-config = load_config()
+config = get_config()
 logger = logging.getLogger("geometry_api")
 
 # Paramètres par défaut pour la dynamique
@@ -50,6 +63,23 @@ DEFAULT_CUBES_CONFIG = {
     'steps': 80
 }
 
+DEFAULT_TORUS_SPRING_CONFIG = {
+    'num_spheres': 20,
+    'dt': 0.016,
+    'substeps': 1,
+    'steps': 10
+}
+
+# Bornes des paramètres des routes /animate : les positions (steps, N, 3) sont
+# préallouées et le format legacy crée un dict par corps et par frame
+ANIMATION_MAX_STEPS = 500
+# Nombre maximal de (frame, corps) par réponse : steps est réduit au-delà
+ANIMATION_MAX_POINTS = 200_000
+ANIMATION_DT_RANGE = (1e-4, 0.1)
+TORUS_SPRING_MAX_SPHERES = 2000
+TORUS_SPRING_MAX_SUBSTEPS = 16
+CENTRIFUGE_LASER_MAX_BODIES = 1000
+
 def parse_float_list(s: str) -> Optional[List[float]]:
     """Tente d'analyser une chaîne en une liste de floats."""
     try:
@@ -60,6 +90,57 @@ def parse_float_list(s: str) -> Optional[List[float]]:
     except (json.JSONDecodeError, TypeError):
         return None
 
+def requested_frame_format() -> Optional[str]:
+    """Format des frames demandé (?format=legacy|packed|delta), None s'il est inconnu."""
+    fmt = request.args.get('format', 'legacy').lower()
+    return fmt if fmt in FRAME_FORMATS else None
+
+def bounded_arg(name: str, default, low, high, type=int):
+    """
+    Paramètre de requête borné à [low, high]. ValueError si la valeur fournie ne se
+    convertit pas (ou n'est pas finie), pour une réponse 400 plutôt qu'une erreur 500.
+    """
+    if name not in request.args:
+        return default
+    value = request.args.get(name, type=type)
+    if value is None or not np.isfinite(value):
+        raise ValueError(f"Paramètre {name} invalide : {request.args[name]!r}.")
+    return min(max(value, low), high)
+
+def bounded_steps(steps: int, num_bodies: int) -> int:
+    """Nombre de frames réduit pour que steps x num_bodies reste sous ANIMATION_MAX_POINTS."""
+    return max(1, min(steps, ANIMATION_MAX_POINTS // max(1, num_bodies)))
+
+def invalid_frame_format_response():
+    return jsonify({"error": f"Invalid format. Expected one of: {', '.join(FRAME_FORMATS)}."}), 400
+
+# Types de réponse proposés aux clients des routes /animate (JSON en premier : choisi pour */*)
+ANIMATION_MIMETYPES = ['application/json', FRAMES_MIMETYPE] + (list(MSGPACK_MIMETYPES) if MSGPACK_AVAILABLE else [])
+
+def negotiated_animation_mimetype() -> str:
+    return request.accept_mimetypes.best_match(ANIMATION_MIMETYPES, default='application/json')
+
+def animation_response(frames: SimulationFrames, fmt: str, topology: Dict[str, Any],
+                       legacy_frames: Callable[[], List[Any]]):
+    """
+    Réponse d'une route /animate, négociée par l'en-tête Accept :
+    application/octet-stream (float32 brut, voir SimulationFrames.to_binary) ou
+    application/msgpack si msgpack est installé. En JSON, le format legacy (défaut,
+    utilisé par les visualiseurs) reconstruit une liste de frames complètes ; packed et
+    delta envoient la topologie une seule fois et les positions en un tableau compact.
+    """
+    mimetype = negotiated_animation_mimetype()
+    if mimetype == FRAMES_MIMETYPE:
+        response = Response(frames.to_binary(topology), mimetype=FRAMES_MIMETYPE)
+    elif mimetype in MSGPACK_MIMETYPES:
+        response = Response(frames.to_msgpack(topology), mimetype=mimetype)
+    elif fmt == 'legacy':
+        response = jsonify({'frames': legacy_frames()})
+    else:
+        response = jsonify(frames.to_payload(fmt, topology))
+    response.vary.add('Accept')
+    return response, 200
+
 # --- ROUTES POUR L'ICOSAÈDRE ---
 @geometry_api.route("/icosahedron/initial", methods=["GET"])
 def icosahedron_initial():
@@ -72,8 +153,8 @@ def subdivide_icosahedron():
         radius = float(request.args.get('radius', 1.0))
         position = json.loads(request.args.get('position', '[0,0,0]'))
         icosahedron = generate_klee_penrose_polyhedron(radius=radius, position=position)
-        subdivided = subdivide_faces(icosahedron['vertices'], icosahedron['faces'])
-        return jsonify({'vertices': subdivided[0], 'faces': subdivided[1]}), 200
+        vertices, faces = subdivide_faces(icosahedron['vertices'], icosahedron['faces'], project_to_sphere=False)
+        return jsonify({'vertices': vertices.tolist(), 'faces': faces.tolist()}), 200
     except Exception as e:
         logger.error(f"Erreur lors de la subdivision de l'icosaèdre : {e}")
         return jsonify({'error': str(e)}), 500
@@ -102,22 +183,32 @@ def animate_icosahedron():
     rotation_axis = np.array(rotation_axis, dtype=float) if rotation_axis else None
 
     params = {'sigma': sigma, 'epsilon': epsilon, 'rho': rho, 'zeta': zeta}
+    fmt = requested_frame_format()
+    if fmt is None:
+        return invalid_frame_format_response()
 
     try:
-        vertices, faces = generate_icosahedron(radius, position, rotation_axis, rotation_angle)
-        phi = np.random.normal(scale=0.01, size=len(vertices))
-        frames = []
-        for _ in range(steps):
-            vertices, phi = update_icosahedron_dynamics(vertices, faces, phi, dt, params)
-            frames.append({
-                'vertices': vertices.tolist(),
-                'faces': faces.tolist()
-            })
-        return jsonify({'frames': frames})
+        frames, faces = simulate_icosahedron(steps, radius, position, rotation_axis, rotation_angle, dt, params)
+        faces_list = faces.tolist()
+        return animation_response(
+            frames, fmt, {'faces': faces_list},
+            lambda: [{'vertices': vertices, 'faces': faces_list} for vertices in frames.positions.tolist()]
+        )
     except Exception as e:
         logger.error(f"Erreur lors de l'animation de l'icosaèdre : {e}")
         return jsonify({'error': f'Erreur lors de l\'animation de l\'icosaèdre : {e}'}), 500
 
+def simulate_icosahedron(steps, radius, position, rotation_axis, rotation_angle, dt, params):
+    """Simule steps pas de la dynamique de l'icosaèdre ; renvoie (frames, faces)."""
+    vertices, faces = generate_icosahedron(radius, position, rotation_axis, rotation_angle)
+    state = {'vertices': vertices, 'phi': np.random.normal(scale=0.01, size=len(vertices))}
+
+    def step(out):
+        state['vertices'], state['phi'] = update_icosahedron_dynamics(state['vertices'], faces, state['phi'], dt, params)
+        out[:] = state['vertices']
+
+    return run_simulation(step, steps, len(vertices)), faces
+
 def get_icosahedron_animate(steps=10, radius=1.0, position=None, rotation_axis=None, rotation_angle=0.0,
                             dt=0.01, sigma=10.0, epsilon=0.3, rho=28.0, zeta=2.1):
     if position is None:
@@ -125,16 +216,9 @@ def get_icosahedron_animate(steps=10, radius=1.0, position=None, rotation_axis=N
     if rotation_axis is None:
         rotation_axis = np.array([0.0, 1.0, 0.0])
     params = {'sigma': sigma, 'epsilon': epsilon, 'rho': rho, 'zeta': zeta}
-    vertices, faces = generate_icosahedron(radius, position, rotation_axis, rotation_angle)
-    phi = np.random.normal(scale=0.01, size=len(vertices))
-    frames = []
-    for _ in range(steps):
-        vertices, phi = update_icosahedron_dynamics(vertices, faces, phi, dt, params)
-        frames.append({
-            'vertices': vertices.tolist(),
-            'faces': faces.tolist()
-        })
-    return frames
+    frames, faces = simulate_icosahedron(steps, radius, position, rotation_axis, rotation_angle, dt, params)
+    faces_list = faces.tolist()
+    return [{'vertices': vertices, 'faces': faces_list} for vertices in frames.positions.tolist()]
 
 # --- ROUTES POUR LA SPIRALE TORIQUE ---
 @geometry_api.route('/toroidal_spiral/initial', methods=['GET'])
@@ -160,19 +244,31 @@ def animate_toroidal_spiral():
         n_points = int(request.args.get('n_points', 24))
         chaos_factor = float(request.args.get('chaos_factor', 0.05))
         noise_level = float(request.args.get('noise_level', 0.1))
-        system = generate_toroidal_spiral_system(R, r, n_turns, n_points)
-        frames = []
-        current_state = system
-        for _ in range(steps):
-            current_state = update_toroidal_spiral_dynamics(
-                current_state, chaos_factor=chaos_factor, noise_level=noise_level
-            )
-            frames.append({
-                'spiral': {
-                    'points': current_state['spiral']['points']
-                }
-            })
-        return jsonify({'frames': frames}), 200
+        fmt = requested_frame_format()
+        if fmt is None:
+            return invalid_frame_format_response()
+        system = ToroidalSpiralSystem.generate(R, r, n_turns, n_points)
+
+        def step(out):
+            out[:] = system.advance(1, chaos_factor=chaos_factor, noise_level=noise_level)
+
+        frames = run_simulation(step, steps, system.num_points)
+
+        def legacy_frames():
+            attributes = system.point_attributes()
+            return [
+                {'spiral': {'points': [{'position': pos, **attrs} for pos, attrs in zip(positions, attributes)]}}
+                for positions in frames.positions.tolist()
+            ]
+
+        # Attributs constants des points (type, taille, couleur) en colonnes : envoyés une seule fois
+        topology = {
+            'point_types': ['sphere', 'cube'],
+            'types': system.types.tolist(),
+            'sizes': system.sizes.tolist(),
+            'colors': system.colors.ravel().tolist()
+        }
+        return animation_response(frames, fmt, topology, legacy_frames)
     except Exception as e:
         logger.error(f"Erreur lors de l'animation de la spirale toroïdale : {e}")
         return jsonify({'error': str(e)}), 500
@@ -225,38 +321,62 @@ def get_initial_cubes():
 @geometry_api.route('/cubes/animate', methods=['GET'])
 def animate_cubes():
     steps = int(request.args.get('steps', 10))
-    generator = CubeGenerator()
+    dt = float(request.args.get('dt', DEFAULT_CUBES_CONFIG['dt']))
+    chaos = float(request.args.get('chaos', 0.3))
+    num_cubes = int(request.args.get('num_cubes', DEFAULT_CUBES_CONFIG['num_cubes']))
+    cube_size = float(request.args.get('cube_size', DEFAULT_CUBES_CONFIG['cube_size']))
+    num_balls_per_cube = int(request.args.get('num_balls_per_cube', DEFAULT_CUBES_CONFIG['num_balls_per_cube']))
+    space_bounds = float(request.args.get('space_bounds', DEFAULT_CUBES_CONFIG['space_bounds']))
+    fmt = requested_frame_format()
+    if fmt is None:
+        return invalid_frame_format_response()
 
     try:
-        # Génération initiale avec validation
-        initial_data = []
-        for cube in generator.generate_cubes_system():
-            validated_cube = {
-                'position': cube.get('position', [0, 0, 0]),
-                'rotation': cube.get('rotation', [0, 0, 0]),
-                'size': cube.get('size', 8.0),
-                'color': cube.get('color', '#3498db')
-            }
-            initial_data.append(validated_cube)
-
-        frames = [{"cubes": initial_data}]
-
-        # Génération des frames suivantes
-        for _ in range(steps):
-            updated_data = []
-            for cube in frames[-1]["cubes"]:
-                updated_cube = update_cubes_dynamics(cube)
-                # Garantir les propriétés manquantes
-                updated_cube.setdefault('position', cube.get('position', [0, 0, 0]))
-                updated_cube.setdefault('rotation', cube.get('rotation', [0, 0, 0]))
-                updated_cube.setdefault('size', cube.get('size', 8.0))
-                updated_cube.setdefault('color', cube.get('color', '#3498db'))
-                updated_data.append(updated_cube)
-            
-            frames.append({"cubes": updated_data})
-
-        return jsonify({'frames': frames})
-    
+        system = CubeSystem.generate(
+            num_cubes=num_cubes,
+            cube_size=cube_size,
+            num_balls_per_cube=num_balls_per_cube,
+            space_bounds=space_bounds
+        )
+        n, b = system.num_cubes, system.num_balls
+        segments = segments_from_sizes(cubes=n, rotations=n, balls=n * b)
+
+        # Positions, rotations (angles d'Euler) et billes écrites directement dans la frame
+        def step(out):
+            system.step(1, delta_time=dt, chaos=chaos, confinement_size=space_bounds)
+            out[:n] = system.positions
+            out[n:2 * n] = system.rotations
+            out[2 * n:] = system.ball_positions.reshape(-1, 3)
+
+        frames = run_simulation(step, steps, segments['balls'][1], segments)
+        sizes = system.sizes.tolist()
+
+        def legacy_frames():
+            positions = frames.segment('cubes').tolist()
+            rotations = frames.segment('rotations').tolist()
+            balls = frames.segment('balls').reshape(frames.steps, n, b, 3).tolist()
+            return [
+                [
+                    {
+                        'position': positions[s][i],
+                        'rotation': rotations[s][i],
+                        'size': sizes[i],
+                        'color': '#3498db',
+                        'balls': [{'position': pos} for pos in balls[s][i]]
+                    }
+                    for i in range(n)
+                ]
+                for s in range(frames.steps)
+            ]
+
+        topology = {
+            'sizes': sizes,
+            'color': '#3498db',
+            'num_balls_per_cube': b,
+            'ball_radii': system.ball_radii.tolist()
+        }
+        return animation_response(frames, fmt, topology, legacy_frames)
+
     except Exception as e:
         logger.error(f"Erreur lors de l'animation des cubes : {e}")
         return jsonify({'error': str(e)}), 500
@@ -315,27 +435,6 @@ def animate_spiral_simple_route():
         logger.error(f"Erreur dans /geometry/spiral_simple/animate : {e}")
         return jsonify({"error": str(e)}), 500
     
-# --- FONCTIONS UTILES POUR LA SUBDIVISION ---
-def subdivide_faces(vertices, faces):
-    import numpy as np
-    # Toujours convertir en liste Python
-    new_vertices = vertices.tolist() if isinstance(vertices, np.ndarray) else list(vertices)
-    new_faces = []
-    for face in faces:
-        v1, v2, v3 = [new_vertices[i] for i in face]
-        mid1 = [(v1[i] + v2[i]) / 2 for i in range(3)]
-        mid2 = [(v2[i] + v3[i]) / 2 for i in range(3)]
-        mid3 = [(v3[i] + v1[i]) / 2 for i in range(3)]
-        new_vertices.extend([mid1, mid2, mid3])
-        idx = len(new_vertices)
-        new_faces.extend([
-            [face[0], idx-3, idx-1],
-            [face[1], idx-2, idx-3],
-            [face[2], idx-1, idx-2],
-            [idx-3, idx-2, idx-1]
-        ])
-    return new_vertices, new_faces
-
 # --- ALIAS POUR LA COMPATIBILITÉ FRONTEND ---
 @geometry_api.route('/spiral_torus/initial', methods=['GET'])
 def get_initial_spiral_torus():
@@ -360,19 +459,48 @@ def get_initial_torus_spring():
 @geometry_api.route('/torus_spring/animate', methods=['GET'])
 def animate_torus_spring():
     """Animation du système tore-ressorts-sphères."""
+    fmt = requested_frame_format()
+    if fmt is None:
+        return invalid_frame_format_response()
     try:
-        frames = []
-        system = generate_torus_spring_system()
-        
-        for i in range(10):
-            system = update_torus_spring_dynamics(system)
-            frames.append({
-                "spheres": system["spheres"],
-                "springs": system["springs"],
-                "torus": system["torus"]
-            })
-        
-        return jsonify({"frames": frames})
+        steps = bounded_arg('steps', DEFAULT_TORUS_SPRING_CONFIG['steps'], 1, ANIMATION_MAX_STEPS)
+        num_spheres = bounded_arg('num_spheres', DEFAULT_TORUS_SPRING_CONFIG['num_spheres'], 1, TORUS_SPRING_MAX_SPHERES)
+        dt = bounded_arg('dt', DEFAULT_TORUS_SPRING_CONFIG['dt'], *ANIMATION_DT_RANGE, type=float)
+        substeps = bounded_arg('substeps', DEFAULT_TORUS_SPRING_CONFIG['substeps'], 1, TORUS_SPRING_MAX_SUBSTEPS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        system = generate_torus_spring_system(num_spheres=num_spheres)
+        spheres = system["spheres"]
+        attributes = [{k: v for k, v in sphere.items() if k not in ("position", "velocity")} for sphere in spheres]
+        network = SpringNetwork.from_dict(system)
+        # Les vitesses ne servent qu'aux frames JSON legacy
+        record_velocities = fmt == 'legacy' and negotiated_animation_mimetype() == 'application/json'
+
+        def step(out):
+            out[:] = network.step(dt, substeps=substeps)
+            if record_velocities:
+                return {"velocities": network.velocities.copy()}
+
+        steps = bounded_steps(steps, len(spheres))
+        frames = run_simulation(step, steps, len(spheres))
+
+        def legacy_frames():
+            velocities = frames.channels["velocities"].tolist() if steps else []
+            return [
+                {
+                    "spheres": [
+                        {**attrs, "position": pos, "velocity": vel}
+                        for attrs, pos, vel in zip(attributes, positions, frame_velocities)
+                    ],
+                    "springs": system["springs"],
+                    "torus": system["torus"]
+                }
+                for positions, frame_velocities in zip(frames.positions.tolist(), velocities)
+            ]
+
+        topology = {"spheres": attributes, "springs": system["springs"], "torus": system["torus"]}
+        return animation_response(frames, fmt, topology, legacy_frames)
     except Exception as e:
         logger.error(f"Erreur animation torus-spring: {e}")
         return jsonify({"error": str(e)}), 500
@@ -390,22 +518,56 @@ def get_initial_centrifuge_laser():
 @geometry_api.route('/centrifuge_laser/animate', methods=['GET'])
 def animate_centrifuge_laser():
     """Animation du système centrifugeuse laser."""
+    fmt = requested_frame_format()
+    if fmt is None:
+        return invalid_frame_format_response()
     try:
-        frames = []
-        system = generate_centrifuge_laser_system()
-        
-        for i in range(10):
-            system = update_centrifuge_laser_dynamics(system)
-            frames.append({
-                "laser_center": system["laser_center"],
-                "arm_top": system["arm_top"],
-                "arm_bottom": system["arm_bottom"],
-                "spheres": system["spheres"],
-                "cubes": system["cubes"],
-                "physics": system["physics"]
-            })
-        
-        return jsonify({"frames": frames})
+        steps = bounded_arg('steps', 10, 1, ANIMATION_MAX_STEPS)
+        dt = bounded_arg('dt', 0.016, *ANIMATION_DT_RANGE, type=float)
+        num_spheres = bounded_arg('num_spheres', 12, 0, CENTRIFUGE_LASER_MAX_BODIES)
+        num_cubes = bounded_arg('num_cubes', 8, 0, CENTRIFUGE_LASER_MAX_BODIES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        system = generate_centrifuge_laser_system(num_spheres=num_spheres, num_cubes=num_cubes)
+        spheres, cubes = system["spheres"], system["cubes"]
+        segments = segments_from_sizes(spheres=len(spheres), cubes=len(cubes))
+        steps = bounded_steps(steps, len(spheres) + len(cubes))
+
+        # Mouvement en forme close : toute la chronologie en une évaluation (steps, N, 3)
+        timeline = CentrifugeLaserSystem.from_dict(system).timeline(steps, delta_time=dt)
+        positions = timeline.pop("positions")
+        frames = SimulationFrames(positions, timeline, segments)
+        sphere_attributes = [{k: v for k, v in sphere.items() if k != "position"} for sphere in spheres]
+        cube_attributes = [{k: v for k, v in cube.items() if k != "position"} for cube in cubes]
+
+        def legacy_frames():
+            channels = {name: values.tolist() for name, values in frames.channels.items()}
+            sphere_positions = frames.segment("spheres").tolist()
+            cube_positions = frames.segment("cubes").tolist()
+            return [
+                {
+                    "laser_center": {**system["laser_center"],
+                                     "intensity": channels["laser_intensity"][s],
+                                     "color": channels["laser_color"][s]},
+                    "arm_top": {**system["arm_top"], "rotation": channels["arm_top_rotation"][s]},
+                    "arm_bottom": {**system["arm_bottom"], "rotation": channels["arm_bottom_rotation"][s]},
+                    "spheres": [{**attrs, "position": pos} for attrs, pos in zip(sphere_attributes, sphere_positions[s])],
+                    "cubes": [{**attrs, "position": pos} for attrs, pos in zip(cube_attributes, cube_positions[s])],
+                    "physics": system["physics"]
+                }
+                for s in range(frames.steps)
+            ]
+
+        topology = {
+            "laser_center": system["laser_center"],
+            "arm_top": system["arm_top"],
+            "arm_bottom": system["arm_bottom"],
+            "spheres": sphere_attributes,
+            "cubes": cube_attributes,
+            "physics": system["physics"]
+        }
+        return animation_response(frames, fmt, topology, legacy_frames)
     except Exception as e:
         logger.error(f"Erreur animation centrifuge laser: {e}")
         return jsonify({"error": str(e)}), 500
@@ -457,14 +619,18 @@ def generate_stream():
 
 @geometry_api.route('/centrifuge_laser_v2/animate', methods=['GET'])
 def animate_centrifuge_laser_v2():
-    """Animation révolutionnaire de la Centrifugeuse Laser 2.0."""
+    """
+    Animation révolutionnaire de la Centrifugeuse Laser 2.0. La simulation continue
+    d'une requête à l'autre tant que le client renvoie l'identifiant ?session= reçu ;
+    "restarted" signale qu'elle a été perdue (expirée ou inconnue) et recommencée.
+    """
     try:
-        frames = []
-        for i in range(10):  # 10 frames d'animation
-            frame_data = generate_centrifuge_laser_v2_data()
-            frames.append(frame_data)
-        
-        return jsonify({"frames": frames})
+        num_frames = min(max(request.args.get('frames', 10, type=int), 1), 100)
+        requested = request.args.get('session')
+        session_id, frames = centrifuge_v2_sessions.run(
+            requested, lambda generator: generator.advance(num_frames)
+        )
+        return jsonify({"frames": frames, "session": session_id, "restarted": bool(requested) and session_id != requested})
     except Exception as e:
         logger.error(f"Erreur animation Centrifugeuse Laser V2: {e}")
         return jsonify({"error": str(e)}), 500
@@ -473,14 +639,28 @@ def animate_centrifuge_laser_v2():
 def animate_metacube_oracle():
     """Animation révolutionnaire du MetaCube Oracle Kaléidoscopique."""
     try:
-        # Génération de frames multiples pour animation fluide
-        frames = []
-        for i in range(5):  # 5 frames pour fluidité
-            frame_data = generate_metacube_oracle_data()
-            frames.append(frame_data)
-        
-        return jsonify({"frames": frames})
+        # Frames multiples pour animation fluide ; les sources sont envoyées une seule fois
+        num_frames = min(max(request.args.get('frames', 5, type=int), 1), 50)
+        return jsonify(MetaCubeOracleGenerator().generate_frames(num_frames))
     except Exception as e:
         logger.error(f"Erreur animation MetaCube Oracle: {e}")
         return jsonify({"error": str(e)}), 500
 
+@geometry_api.route('/metacube_oracle/entropy', methods=['GET'])
+def metacube_oracle_entropy():
+    """
+    Télémétrie d'entropie des sources du MetaCube (worker courant) : entropie de la
+    dernière valeur, de la fenêtre glissante et du cumul. counts=1 joint les histogrammes
+    cumulés pour les fusionner avec ceux des autres workers.
+    """
+    try:
+        cache = get_metacube_source_cache()
+        include_counts = request.args.get('counts', '').lower() in ('1', 'true', 'yes')
+        return jsonify({
+            "sources": cache.telemetry.snapshot(include_counts=include_counts),
+            "status": cache.status()
+        })
+    except Exception as e:
+        logger.error(f"Erreur télémétrie MetaCube Oracle: {e}")
+        return jsonify({"error": str(e)}), 500
+
@@ -1,12 +1,20 @@
 import os
+import json
 import logging
+# En premier : le profileur d'imports (STARTUP_PROFILE_IMPORTS) doit précéder les imports lourds
+from core.startup import mark_ready, startup_report
+from core.warmup import is_ready, start_background_warmup, warmup_status
+from typing import Optional
 from logging.handlers import RotatingFileHandler
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
 from sentry_sdk.integrations.flask import FlaskIntegration
 import sentry_sdk
 from api.geometry_api import geometry_api
-from core.utils import load_config, generate_quantum_geometric_entropy, get_area_weather_data, combine_weather_data, get_quantum_entropy, TokenStreamGenerator
+from core.utils import load_config, get_config, generate_quantum_geometric_entropy, get_area_weather_data, combine_weather_data, get_quantum_entropy, TokenStreamGenerator
+from entropy.pool import EntropyPool, get_entropy_pool, ENTROPY_POOL_ENABLED
+from entropy.health import health_report
+from streams.token_feed import TokenGeneratorRegistry, StreamCursor, stream_tokens_body, CHAR_OPTION_KEYS, TOKEN_STREAM_MAX_TOKENS
 # Configuration du logger
 logger = logging.getLogger(__name__)
 LOG_FILENAME = "app.log"
@@ -20,14 +28,16 @@ log_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logger.addHandler(log_handler)
 logger.setLevel(LOG_LEVEL)
 
-# Initialisation de Sentry
-sentry_sdk.init(
-    dsn=os.environ.get("SENTRY_DSN"),
-    integrations=[FlaskIntegration()],
-    traces_sample_rate=1.0,
-    environment=os.getenv("FLASK_ENV", "dev")
-)
-logger.info("Sentry initialized with DSN: %s", os.environ.get("SENTRY_DSN"))
+# Initialisation de Sentry (uniquement avec un DSN : FlaskIntegration inspecte tous les
+# paquets installés au démarrage, ce qui est inutile quand Sentry est désactivé)
+if os.environ.get("SENTRY_DSN"):
+    sentry_sdk.init(
+        dsn=os.environ.get("SENTRY_DSN"),
+        integrations=[FlaskIntegration()],
+        traces_sample_rate=1.0,
+        environment=os.getenv("FLASK_ENV", "dev")
+    )
+    logger.info("Sentry initialized with DSN: %s", os.environ.get("SENTRY_DSN"))
 
 # Initialisation de l'application Flask
 app = Flask(__name__)
@@ -46,27 +56,64 @@ def log_warning(message: str) -> None:
 def log_info(message: str) -> None:
     logger.info(message)
 
-# Charge la configuration
-config = load_config()
+# Charge la configuration (lue une seule fois par processus)
+config = get_config()
+
+# Géométries pouvant contribuer à une graine, et celles du pool principal
+SEED_GEOMETRIES = ("icosahedron", "cubes", "spiral_simple", "spiral_torus")
+DEFAULT_SEED_GEOMETRIES = ("icosahedron", "cubes")
+
+def seed_source_selection(geometries, weather_enabled: bool = True) -> tuple:
+    """Jeu de sources normalisé (géométries connues triées, météo) : clé des pools d'entropie."""
+    return tuple(g for g in SEED_GEOMETRIES if g in (geometries or ())), bool(weather_enabled)
+
+def collect_entropy_for(geometries, weather_enabled: bool = True) -> Optional[bytes]:
+    """Collecte de l'entropie limitée aux géométries et à la météo demandées (quantique, horloges et bruit local toujours inclus)."""
+    return generate_quantum_geometric_entropy(
+        geometries=list(geometries),
+        use_weather=weather_enabled,
+        use_icosahedron="icosahedron" in geometries,
+        use_quantum=True,
+        use_timestamps=True,
+        use_local_noise=True,
+        use_cubes="cubes" in geometries,
+        use_spiral_torus="spiral_torus" in geometries,
+        use_spiral_simple="spiral_simple" in geometries,
+        get_area_weather_data=get_area_weather_data,
+        combine_weather_data=combine_weather_data,
+        config=config,
+        get_quantum_entropy=get_quantum_entropy
+    )
+
+def collect_fresh_entropy() -> Optional[bytes]:
+    """Collecte complète de l'entropie (météo, géométries, quantique...)."""
+    return collect_entropy_for(DEFAULT_SEED_GEOMETRIES, True)
+
+def get_app_entropy_pool(geometries=DEFAULT_SEED_GEOMETRIES, weather_enabled: bool = True) -> EntropyPool:
+    """
+    Pool d'entropie du worker pour un jeu de sources. Le pool principal (sources par
+    défaut) est réensemencé en arrière-plan ; les autres jeux, demandés par les clients,
+    ont leur propre pool créé à la demande, réensemencé au premier tirage puis à expiration.
+    """
+    selection = seed_source_selection(geometries, weather_enabled)
+    if selection == seed_source_selection(DEFAULT_SEED_GEOMETRIES, True):
+        return get_entropy_pool(collect_fresh_entropy)
+    return get_entropy_pool(lambda: collect_entropy_for(*selection), key=selection, start=False)
+
+def draw_entropy_seed(personalization: bytes = b"") -> Optional[bytes]:
+    """Tire une graine depuis le pool, ou collecte à la demande si le pool est désactivé."""
+    if not ENTROPY_POOL_ENABLED:
+        return collect_fresh_entropy()
+    return get_app_entropy_pool().draw(32, personalization)
+
+# Générateurs de tokens longue durée du worker, ensemencés depuis le pool
+token_generators = TokenGeneratorRegistry(lambda: draw_entropy_seed(b"token-stream"))
 
 # Routes principales de l'API
 @app.route('/generate_random', methods=['GET'])
 def generate_random():
     try:
-        entropy_seed_bytes = generate_quantum_geometric_entropy(
-            use_weather=True,
-            use_icosahedron=True,
-            use_quantum=True,
-            use_timestamps=True,
-            use_local_noise=True,
-            use_cubes=True,
-            use_spiral_torus=False,
-            use_spiral_simple=False,
-            get_area_weather_data=get_area_weather_data,
-            combine_weather_data=combine_weather_data,
-            config=config,
-            get_quantum_entropy=get_quantum_entropy
-        )
+        entropy_seed_bytes = draw_entropy_seed()
         if not entropy_seed_bytes:
             logger.error("Échec de la récupération de l'entropie pour la génération de nombre aléatoire.")
             return jsonify({"error": "Failed to generate final entropy"}), 500
@@ -80,6 +127,38 @@ def generate_random():
         sentry_sdk.capture_exception(e)
         return jsonify({"error": str(e)}), 500
 
+@app.route('/entropy_pool/stats', methods=['GET'])
+def entropy_pool_stats():
+    """Métriques du pool d'entropie du worker (âge, durée de réensemencement...)."""
+    if not ENTROPY_POOL_ENABLED:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **get_app_entropy_pool().stats()})
+
+@app.route('/entropy/health', methods=['GET'])
+def entropy_health():
+    """Tests de santé continus du worker : sortie du DRBG, graines et sources de graine."""
+    return jsonify(health_report())
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Vivacité du worker."""
+    return jsonify({"status": "ok"})
+
+@app.route('/health/ready', methods=['GET'])
+def health_ready():
+    """Disponibilité : ouverte une fois les caches géométriques préchauffés."""
+    if is_ready():
+        return jsonify({"status": "ready", **warmup_status()})
+    # Sans préchauffage avant fork (pas de preload), le worker se préchauffe en arrière-plan
+    start_background_warmup()
+    return jsonify({"status": "warming_up", **warmup_status()}), 503
+
+@app.route('/startup/profile', methods=['GET'])
+def startup_profile():
+    """Coût du démarrage du worker : imports et chargements différés."""
+    top = max(1, request.args.get('top', 25, type=int))
+    return jsonify(startup_report(top))
+
 @app.route('/entropy', methods=['GET'])
 def entropy_route():
     try:
@@ -97,20 +176,7 @@ def entropy_route():
 @app.route('/final_entropy', methods=['GET'])
 def final_entropy():
     try:
-        final_entropy_bytes = generate_quantum_geometric_entropy(
-            use_weather=True,
-            use_icosahedron=True,
-            use_quantum=True,
-            use_timestamps=True,
-            use_local_noise=True,
-            use_cubes=True,
-            use_spiral_torus=False,
-            use_spiral_simple=False,
-            get_area_weather_data=get_area_weather_data,
-            combine_weather_data=combine_weather_data,
-            config=config,
-            get_quantum_entropy=get_quantum_entropy
-        )
+        final_entropy_bytes = draw_entropy_seed()
         if final_entropy_bytes:
             return jsonify({"final_entropy": final_entropy_bytes.hex()})
         else:
@@ -122,6 +188,11 @@ def final_entropy():
 
 @app.route("/api/generate_token", methods=["POST"])
 def generate_token():
+    """
+    Token à partir d'une graine issue des seules sources choisies (geometries,
+    weather_enabled) ; quantique, horloges et bruit local sont toujours inclus.
+    Avec le pool activé, la graine est tirée du pool de ce jeu de sources.
+    """
     try:
         data = request.get_json()
         length = data.get("length", 32)
@@ -131,21 +202,16 @@ def generate_token():
         weather_enabled = data.get("weather_enabled", True)
         geometries = data.get("geometries", [])
 
-        entropy_bytes = generate_quantum_geometric_entropy(
-            geometries=geometries,
-            use_weather=weather_enabled,
-            use_icosahedron="icosahedron" in geometries,
-            use_quantum=True,
-            use_timestamps=True,
-            use_local_noise=True,
-            use_cubes="cubes" in geometries,
-            use_spiral_torus="spiral_torus" in geometries,
-            use_spiral_simple="spiral_simple" in geometries,
-            get_area_weather_data=get_area_weather_data,
-            combine_weather_data=combine_weather_data,
-            config=config,
-            get_quantum_entropy=get_quantum_entropy
-        )
+        # La graine ne provient que des sources demandées : chaque jeu de sources a son pool
+        selection = seed_source_selection(geometries, weather_enabled)
+        if ENTROPY_POOL_ENABLED:
+            # Les options de la requête personnalisent en plus la dérivation depuis le pool
+            personalization = json.dumps(
+                {"geometries": geometries, "weather_enabled": weather_enabled}, sort_keys=True
+            ).encode()
+            entropy_bytes = get_app_entropy_pool(*selection).draw(32, personalization)
+        else:
+            entropy_bytes = collect_entropy_for(*selection)
         if not entropy_bytes:
             logger.error("Échec de la récupération de l'entropie pour la génération de token.")
             return jsonify({"error": "Failed to generate entropy"}), 500
@@ -179,13 +245,7 @@ def stream_tokens():
             return jsonify({'error': 'Length must be between 8 and 128'}), 400
 
         try:
-            generator = TokenStreamGenerator(char_options=char_options)
-            tokens = []
-            for _ in range(num_tokens):
-                token = generator.generate_token(length)
-                if token is None:
-                    return jsonify({'error': 'No character set selected'}), 400
-                tokens.append(token)
+            tokens = token_generators.generate(char_options, num_tokens, length)
         except ValueError as e:
             return jsonify({'error': str(e)}), 400
 
@@ -197,10 +257,42 @@ def stream_tokens():
 
 @app.route("/api/token/stream", methods=["GET"])
 def token_stream():
-    from core.utils import TokenStreamGenerator
-    generator = TokenStreamGenerator()
-    token = generator.generate_token(32)
-    return jsonify({"token": token})
+    """
+    Sans format : un token JSON. Avec format=sse (ou Accept: text/event-stream) ou
+    format=ndjson : flux de count tokens en blocs, repris via Last-Event-ID.
+    """
+    try:
+        length = int(request.args.get('length', 32))
+        count = int(request.args.get('count', 1))
+        fmt = request.args.get('format')
+        if fmt is None and 'text/event-stream' in request.headers.get('Accept', ''):
+            fmt = 'sse'
+        char_options = {
+            key: request.args.get(key, 'true').lower() in ('1', 'true', 'yes') for key in CHAR_OPTION_KEYS
+        }
+
+        if fmt not in ('sse', 'ndjson'):
+            return jsonify({"token": token_generators.generate(char_options, 1, length)[0]})
+
+        if not 1 <= count <= TOKEN_STREAM_MAX_TOKENS:
+            return jsonify({"error": f"count doit être entre 1 et {TOKEN_STREAM_MAX_TOKENS}"}), 400
+        cursor = StreamCursor.resume(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+        # Validation (longueur, jeux de caractères) avant l'ouverture du flux
+        token_generators.generate(char_options, 0, length)
+
+        body = stream_tokens_body(token_generators, char_options, length, count, cursor, fmt)
+        mimetype = 'text/event-stream' if fmt == 'sse' else 'application/x-ndjson'
+        return Response(body, mimetype=mimetype, headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+            'X-Stream-Id': cursor.stream_id
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Erreur dans le flux de tokens : {e}", exc_info=True)
+        sentry_sdk.capture_exception(e)
+        return jsonify({"error": str(e)}), 500
 
 # Routes pour servir le frontend (développement local sans Vite proxy)
 @app.route('/')
@@ -219,6 +311,8 @@ def test_sentry():
         sentry_sdk.capture_exception(e)
         return jsonify({"error": "Sentry test triggered"}), 500
 
+mark_ready()
+
 if __name__ == '__main__':
     try:
         loaded_config = load_config()
@@ -0,0 +1,202 @@
+"""
+Mode de service asynchrone (ASGI) de l'application.
+
+    uvicorn core.asgi:application
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn -c gunicorn.conf.py
+
+Les routes dépendant d'appels amont (météo) sont servies nativement en asyncio ;
+toutes les autres routes Flask (blueprint geometry_api compris) sont exécutées telles
+quelles dans un pool de threads, ce qui garde la boucle d'événements libre pendant
+les calculs géométriques.
+"""
+import os
+import sys
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import sentry_sdk
+from flask import jsonify
+
+from core.app import app, config
+from core.warmup import start_background_warmup
+from core.utils import combine_weather_data
+from entropy.weather.client import get_weather_client, HTTPX_AVAILABLE
+
+if HTTPX_AVAILABLE:
+    import httpx
+
+logger = logging.getLogger("asgi")
+
+# Threads disponibles pour les vues Flask synchrones
+ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "64"))
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def build_environ(scope: Scope, body: bytes) -> Dict[str, Any]:
+    """Construit l'environnement WSGI (PEP 3333) d'une requête HTTP ASGI."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        if name == "CONTENT_LENGTH":
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _read_body(receive: Receive) -> bytes:
+    body = bytearray()
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return bytes(body)
+
+
+async def _send_wsgi_response(send: Send, response) -> None:
+    """Relaie une réponse Flask déjà construite (corps en mémoire)."""
+    body = response.get_data()
+    await send({
+        "type": "http.response.start",
+        "status": response.status_code,
+        "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in response.headers.items()],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class OracleASGIApp:
+    """
+    Application ASGI : routes asynchrones natives, puis repli sur l'application WSGI
+    (Flask) exécutée dans un pool de threads. Les réponses en flux (SSE) sont
+    transmises bloc par bloc.
+    """
+    def __init__(self, wsgi_app, max_threads: int = ASGI_WSGI_THREADS):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="asgi-wsgi")
+        self.http: Optional["httpx.AsyncClient"] = None
+        self.routes: Dict[Tuple[str, str], Callable[[Scope, Receive, Send], Awaitable[None]]] = {
+            ("GET", "/entropy"): self.entropy,
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        handler = self.routes.get((scope["method"], scope["path"]))
+        if handler is not None:
+            await handler(scope, receive, send)
+        else:
+            await self.call_wsgi(scope, receive, send)
+
+    async def send_json(self, scope: Scope, send: Send, payload: Any, status: int = 200) -> None:
+        """
+        Réponse JSON d'une route native construite par le pipeline de réponse Flask
+        (after_request : en-têtes CORS de flask-cors compris), identique à celle de la
+        route Flask de même URL.
+        """
+        with self.wsgi_app.request_context(build_environ(scope, b"")):
+            response = self.wsgi_app.make_response((jsonify(payload), status))
+            response = self.wsgi_app.process_response(response)
+        await _send_wsgi_response(send, response)
+
+    async def lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                start_background_warmup()
+                if HTTPX_AVAILABLE:
+                    self.http = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
+                else:
+                    logger.warning("httpx non disponible : les requêtes météo asynchrones passent par un pool de threads.")
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.http is not None:
+                    await self.http.aclose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def entropy(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Équivalent asynchrone de GET /entropy (météo combinée des coordonnées)."""
+        try:
+            weather_data = await get_weather_client().get_area_async(config['coordinates'], self.http)
+            combined_weather = combine_weather_data(weather_data)
+            if combined_weather:
+                await self.send_json(scope, send, combined_weather)
+            else:
+                await self.send_json(scope, send, {"error": "Failed to retrieve combined weather data"}, 500)
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération asynchrone de l'entropie météo : {e}", exc_info=True)
+            sentry_sdk.capture_exception(e)
+            await self.send_json(scope, send, {"error": str(e)}, 500)
+
+    async def call_wsgi(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Exécute la vue Flask dans le pool de threads et relaie sa réponse."""
+        loop = asyncio.get_running_loop()
+        environ = build_environ(scope, await _read_body(receive))
+        response_start: Dict[str, Any] = {}
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+            response_start["status"] = int(status.split(" ", 1)[0])
+            response_start["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+            return lambda data: None
+
+        def run() -> Tuple[Any, Any]:
+            result = self.wsgi_app(environ, start_response)
+            iterator = iter(result)
+            return result, iterator
+
+        result, iterator = await loop.run_in_executor(self.executor, run)
+        sentinel = object()
+        try:
+            # Le premier bloc déclenche start_response pour les réponses générées à la volée
+            chunk = await loop.run_in_executor(self.executor, next, iterator, sentinel)
+            await send({
+                "type": "http.response.start",
+                "status": response_start["status"],
+                "headers": response_start["headers"],
+            })
+            while chunk is not sentinel:
+                if chunk:
+                    await send({"type": "http.response.body", "body": bytes(chunk), "more_body": True})
+                chunk = await loop.run_in_executor(self.executor, next, iterator, sentinel)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                await loop.run_in_executor(self.executor, close)
+
+
+application = OracleASGIApp(app)
@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import logging
+import importlib
+import threading
+from importlib.abc import MetaPathFinder
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("startup")
+
+# Active le chronométrage de chaque import (à placer avant les imports lourds)
+STARTUP_PROFILE_IMPORTS = os.getenv("STARTUP_PROFILE_IMPORTS", "false").lower() in ("1", "true", "yes")
+
+_process_start = time.monotonic()
+_ready_at: Optional[float] = None
+_lazy_lock = threading.RLock()
+_lazy_load_times: Dict[str, float] = {}
+
+
+class LazyAttribute:
+    """
+    Référence paresseuse vers un module ou un de ses attributs : le module n'est importé
+    qu'au premier appel ou au premier accès d'attribut, et le coût de ce chargement est
+    enregistré pour startup_report().
+    """
+    def __init__(self, module_name: str, attr_name: Optional[str] = None):
+        self._module_name = module_name
+        self._attr_name = attr_name
+        self._target: Any = None
+
+    def _resolve(self) -> Any:
+        target = self._target
+        if target is None:
+            with _lazy_lock:
+                if self._target is None:
+                    already_loaded = self._module_name in sys.modules
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._module_name)
+                    if not already_loaded:
+                        elapsed = time.perf_counter() - start
+                        _lazy_load_times[self._module_name] = elapsed
+                        logger.info(f"Chargement différé de {self._module_name} : {elapsed * 1000:.1f} ms")
+                    self._target = getattr(module, self._attr_name) if self._attr_name else module
+                target = self._target
+        return target
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __repr__(self) -> str:
+        state = "chargé" if self._target is not None else "différé"
+        return f"<LazyAttribute {self._module_name}.{self._attr_name or ''} ({state})>"
+
+
+def lazy_import(module_name: str, attr_name: Optional[str] = None) -> LazyAttribute:
+    """lazy_import("geometry.cubes.dynamics", "CubeSystem") s'utilise comme l'objet importé."""
+    return LazyAttribute(module_name, attr_name)
+
+
+class _TimedLoader:
+    """Enveloppe d'un loader : mesure la durée (cumulée, sous-modules compris) de exec_module."""
+    def __init__(self, loader, name: str, times: Dict[str, float]):
+        self._loader = loader
+        self._name = name
+        self._times = times
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._times[self._name] = time.perf_counter() - start
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class ImportProfiler(MetaPathFinder):
+    """Chronomètre l'import de chaque module chargé après son installation."""
+    def __init__(self):
+        self.times: Dict[str, float] = {}
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, fullname, self.times)
+                return spec
+        return None
+
+
+_profiler: Optional[ImportProfiler] = None
+
+
+def install_import_profiler() -> ImportProfiler:
+    """Installe (une seule fois) le profileur d'imports en tête de sys.meta_path."""
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler()
+        sys.meta_path.insert(0, _profiler)
+    return _profiler
+
+
+def mark_ready() -> None:
+    """Marque la fin de l'initialisation de l'application (imports eux-mêmes inclus)."""
+    global _ready_at
+    if _ready_at is None:
+        _ready_at = time.monotonic()
+        logger.info(f"Application prête en {_ready_at - _process_start:.3f}s")
+
+
+def startup_report(top: int = 25) -> Dict[str, Any]:
+    """Coût du démarrage : durée jusqu'à mark_ready, imports les plus coûteux et chargements différés."""
+    imports: List[Dict[str, Any]] = []
+    if _profiler is not None:
+        slowest = sorted(_profiler.times.items(), key=lambda item: item[1], reverse=True)[:top]
+        imports = [{"module": name, "ms": round(seconds * 1000, 2)} for name, seconds in slowest]
+    with _lazy_lock:
+        lazy = {name: round(seconds * 1000, 2) for name, seconds in _lazy_load_times.items()}
+    return {
+        "ready_seconds": round(_ready_at - _process_start, 4) if _ready_at is not None else None,
+        "import_profiling": _profiler is not None,
+        "imports": imports,
+        "lazy_loads_ms": lazy
+    }
+
+
+if STARTUP_PROFILE_IMPORTS:
+    install_import_profiler()
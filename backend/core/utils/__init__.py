@@ -1,4 +1,4 @@
-from .utils import load_config, get_area_weather_data, combine_weather_data
+from .utils import load_config, get_config, get_area_weather_data, combine_weather_data
 from entropy.quantum.quantum_nodes import get_quantum_entropy
 from streams.token_stream import TokenStreamGenerator
 from entropy.quantum.entropy_oracle import generate_quantum_geometric_entropy
@@ -1,16 +1,21 @@
-import requests
 import json
 import os
 import logging
 import hashlib
 import time
 import random
+import functools
 from typing import List, Dict, Optional, Any, Tuple
 
+from core.startup import lazy_import
+
+requests = lazy_import("requests")
+
 
 # --- IMPORT CORRIGÉ POUR QUANTUM_NODES ---
 # get_quantum_entropy sera importé d'ici dans entropy_oracle.py
 from entropy.quantum.quantum_nodes import get_quantum_entropy
+from entropy.weather.client import get_weather_client
 
 logger = logging.getLogger("entropy_generator")
 
@@ -66,51 +71,22 @@ def load_config() -> Dict[str, Any]:
         logger.error(f"Erreur inattendue lors de la surcharge de la configuration : {e}")
     return config
 
-# L'objet config global est chargé une fois lors de l'importation de ce module
-config = load_config()
+@functools.lru_cache(maxsize=1)
+def get_config() -> Dict[str, Any]:
+    """Configuration du processus, lue une seule fois (config.json + variables d'environnement)."""
+    return load_config()
+
+# L'objet config global est partagé par tous les modules via get_config()
+config = get_config()
 
 
 def get_current_weather_data(lat: float, lon: float) -> Optional[Dict[str, Any]]:
-    """Récupère les données météo actuelles pour une paire de coordonnées."""
-    try:
-        url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={lat}&longitude={lon}"
-            "&current_weather=true"
-            "&hourly=temperature_2m,relative_humidity_2m,pressure_msl,cloudcover,precipitation,windgusts_10m"
-            "&forecast_days=1"
-            "&timezone=auto"
-        )
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        weather = data.get("current_weather", {})
-        hourly = data.get("hourly", {})
-        idx = 0
-        return {
-            "temperature": weather.get("temperature"),
-            "humidity": hourly.get("relative_humidity_2m", [None])[idx],
-            "pressure": hourly.get("pressure_msl", [None])[idx],
-            "wind_speed": weather.get("windspeed"),
-            "wind_gust": hourly.get("windgusts_10m", [None])[idx],
-            "clouds": hourly.get("cloudcover", [None])[idx],
-            "precipitation": hourly.get("precipitation", [None])[idx]
-        }
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Erreur lors de la récupération des données météo pour {lat}, {lon} : {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Erreur inattendue lors de la récupération des données météo : {e}")
-        return None
+    """Récupère les données météo actuelles pour une paire de coordonnées (via le client partagé)."""
+    return get_weather_client().get_current(lat, lon)
 
 def get_area_weather_data(coordinates: List[Tuple[float, float]]) -> List[Optional[Dict[str, Any]]]:
-    """Récupère les données météo pour une liste de coordonnées."""
-    all_data = []
-    for lat, lon in coordinates:
-        data = get_current_weather_data(lat, lon)
-        if data:
-            all_data.append(data)
-    return all_data
+    """Récupère les données météo pour une liste de coordonnées, en parallèle et avec cache."""
+    return get_weather_client().get_area(coordinates)
 
 def combine_weather_data(all_data: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
     """Combine les données météo de plusieurs points."""
@@ -0,0 +1,89 @@
+import os
+import gc
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("warmup")
+
+# Niveaux de subdivision Klee-Penrose précalculés (sommets, faces et opérateur des voisins)
+WARMUP_ICOSA_LEVELS = [int(level) for level in os.getenv("WARMUP_ICOSA_LEVELS", "0,1,2,3").split(",") if level.strip()]
+# Paramétrages (R, r, n_turns, n_points) de spirale toroïdale précalculés
+WARMUP_SPIRAL_TORUS_PARAMS = [(8.0, 2.0, 3, 24)]
+
+_ready = threading.Event()
+_lock = threading.Lock()
+_started_pid: Optional[int] = None
+_status: Dict[str, Any] = {"started_at": None, "duration": None, "error": None}
+
+
+def warm_up(icosa_levels: Optional[List[int]] = None) -> bool:
+    """
+    Remplit les caches géométriques partagés : modules de géométrie, maillages subdivisés
+    et leurs opérateurs de voisinage, tables de paramétrage des spirales.
+    Exécuté dans le maître gunicorn avant le fork, les pages sont ensuite partagées
+    en copie-sur-écriture par tous les workers. Idempotent.
+    """
+    if _ready.is_set():
+        return True
+    levels = WARMUP_ICOSA_LEVELS if icosa_levels is None else icosa_levels
+    start = time.monotonic()
+    _status["started_at"] = time.time()
+    try:
+        from geometry.icosahedron.generator import get_klee_penrose_mesh, generate_icosahedron
+        from geometry.icosahedron.dynamics import get_mesh_operator
+        from geometry.spiral_torus.generator import toroidal_parametrization
+        from geometry.spiral_torus import dynamics as _spiral_torus_dynamics  # noqa: F401
+        from geometry.cubes import dynamics as _cubes_dynamics  # noqa: F401
+
+        vertices, faces = generate_icosahedron()
+        get_mesh_operator(faces, len(vertices))
+        for level in levels:
+            mesh = get_klee_penrose_mesh(level)
+            mesh.operator  # structure des voisins (CSR) construite une fois
+        for params in WARMUP_SPIRAL_TORUS_PARAMS:
+            toroidal_parametrization(*params)
+    except Exception as e:
+        _status["error"] = str(e)
+        logger.error(f"Échec du préchauffage des caches géométriques : {e}", exc_info=True)
+        return False
+
+    _status["duration"] = time.monotonic() - start
+    _status["icosa_levels"] = list(levels)
+    _ready.set()
+    logger.info(f"Caches géométriques préchauffés en {_status['duration']:.3f}s (niveaux {levels}).")
+    return True
+
+
+def warm_up_before_fork() -> bool:
+    """
+    Préchauffage dans le maître gunicorn (preload_app) : les objets créés sont ensuite
+    gelés (gc.freeze) pour que le ramasse-miettes des workers ne touche pas leurs pages.
+    """
+    ready = warm_up()
+    gc.collect()
+    gc.freeze()
+    return ready
+
+
+def start_background_warmup() -> None:
+    """Lance le préchauffage dans un thread du processus courant s'il n'est pas déjà fait."""
+    global _started_pid
+    with _lock:
+        if _ready.is_set() or _started_pid == os.getpid():
+            return
+        _started_pid = os.getpid()
+    threading.Thread(target=warm_up, name="geometry-warmup", daemon=True).start()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    return _ready.wait(timeout)
+
+
+def warmup_status() -> Dict[str, Any]:
+    return {"ready": _ready.is_set(), **_status}
@@ -0,0 +1,167 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("entropy_collector")
+
+# Délai par défaut accordé à une source avant qu'elle ne soit ignorée (secondes)
+DEFAULT_SOURCE_TIMEOUT = float(os.getenv("ENTROPY_SOURCE_TIMEOUT", "3.0"))
+# Nombre de threads pour les sources I/O (météo, QRNG...)
+COLLECTOR_MAX_THREADS = int(os.getenv("ENTROPY_COLLECTOR_THREADS", "8"))
+# Pool de processus optionnel pour les simulations géométriques
+COLLECTOR_USE_PROCESSES = os.getenv("ENTROPY_COLLECTOR_PROCESSES", "false").lower() in ("1", "true", "yes")
+COLLECTOR_MAX_PROCESSES = int(os.getenv("ENTROPY_COLLECTOR_MAX_PROCESSES", str(min(4, os.cpu_count() or 1))))
+
+
+class EntropySource:
+    """
+    Description d'une source d'entropie à collecter.
+
+    Args:
+        name (str): Nom de la source (clé du résultat).
+        func (Callable): Fonction produisant la contribution de la source.
+        args (Tuple): Arguments positionnels de func.
+        kwargs (Dict): Arguments nommés de func.
+        timeout (float): Délai maximal (secondes) depuis le début de la collecte.
+        cpu_bound (bool): True pour une simulation pouvant s'exécuter dans le pool de processus.
+            func et ses arguments doivent alors être picklables.
+    """
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        args: Tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        cpu_bound: bool = False
+    ):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.timeout = DEFAULT_SOURCE_TIMEOUT if timeout is None else timeout
+        self.cpu_bound = cpu_bound
+
+
+class EntropyCollector:
+    """
+    Exécute les sources d'entropie en parallèle, chacune avec sa propre échéance.
+    Les sources terminées à temps sont retournées, les autres sont abandonnées :
+    la latence est bornée par la source la plus lente (ou son échéance), pas par la somme.
+    """
+    def __init__(
+        self,
+        max_threads: int = COLLECTOR_MAX_THREADS,
+        use_processes: bool = COLLECTOR_USE_PROCESSES,
+        max_processes: int = COLLECTOR_MAX_PROCESSES
+    ):
+        self.max_threads = max_threads
+        self.use_processes = use_processes
+        self.max_processes = max_processes
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+
+    def _check_fork(self) -> None:
+        """Les exécuteurs ne survivent pas à un fork : on les recrée dans le processus enfant."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._thread_executor = None
+            self._process_executor = None
+
+    def _get_thread_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            self._check_fork()
+            if self._thread_executor is None:
+                self._thread_executor = ThreadPoolExecutor(
+                    max_workers=self.max_threads, thread_name_prefix="entropy-source"
+                )
+            return self._thread_executor
+
+    def _get_process_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            self._check_fork()
+            if self._process_executor is None:
+                self._process_executor = ProcessPoolExecutor(max_workers=self.max_processes)
+            return self._process_executor
+
+    def _submit(self, source: EntropySource) -> Future:
+        if source.cpu_bound and self.use_processes:
+            try:
+                return self._get_process_executor().submit(source.func, *source.args, **source.kwargs)
+            except Exception as e:
+                # Pool cassé ou arguments non picklables : repli sur le pool de threads
+                logger.warning(f"Pool de processus indisponible pour {source.name}, repli sur thread : {e}")
+                with self._lock:
+                    self._process_executor = None
+        return self._get_thread_executor().submit(source.func, *source.args, **source.kwargs)
+
+    def collect(
+        self,
+        sources: List[EntropySource],
+        on_result: Optional[Callable[[str, Any], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Lance toutes les sources et attend chacune jusqu'à son échéance.
+
+        Args:
+            sources (List[EntropySource]): Sources à exécuter.
+            on_result (Callable): Appelé (nom, valeur) dès qu'une source termine avec succès.
+
+        Returns:
+            Dict[str, Any]: Résultats non nuls des sources terminées à temps, par nom.
+        """
+        start = time.monotonic()
+        futures: Dict[Future, EntropySource] = {}
+        for source in sources:
+            try:
+                futures[self._submit(source)] = source
+            except Exception as e:
+                logger.error(f"Impossible de lancer la source {source.name}: {e}")
+
+        results: Dict[str, Any] = {}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            expired = {f for f in pending if now >= start + futures[f].timeout}
+            for future in expired:
+                future.cancel()
+                logger.warning(f"Source d'entropie {futures[future].name} ignorée : échéance de {futures[future].timeout}s dépassée.")
+            pending -= expired
+            if not pending:
+                break
+
+            next_deadline = min(start + futures[f].timeout for f in pending)
+            done, pending = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                source = futures[future]
+                try:
+                    value = future.result()
+                except Exception as e:
+                    logger.error(f"Erreur dans la source d'entropie {source.name}: {e}")
+                    continue
+                if value is None:
+                    continue
+                results[source.name] = value
+                logger.debug(f"Source {source.name} collectée en {time.monotonic() - start:.3f}s")
+                if on_result is not None:
+                    on_result(source.name, value)
+
+        return results
+
+
+_default_collector: Optional[EntropyCollector] = None
+_default_collector_lock = threading.Lock()
+
+
+def get_default_collector() -> EntropyCollector:
+    """Retourne le collecteur partagé du processus (créé au premier appel)."""
+    global _default_collector
+    with _default_collector_lock:
+        if _default_collector is None:
+            _default_collector = EntropyCollector()
+        return _default_collector
@@ -0,0 +1,178 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Classes fixes de l'estimateur : bornes (unités de scène) et nombre de classes.
+# Les valeurs hors bornes sont comptées dans les classes extrêmes.
+ENTROPY_HISTOGRAM_BINS = int(os.getenv("ENTROPY_HISTOGRAM_BINS", "64"))
+ENTROPY_HISTOGRAM_RANGE = float(os.getenv("ENTROPY_HISTOGRAM_RANGE", "16.0"))
+# Nombre d'observations conservées par la fenêtre glissante d'une source
+ENTROPY_WINDOW_SIZE = int(os.getenv("ENTROPY_WINDOW_SIZE", "32"))
+
+
+def shannon_entropy(counts: np.ndarray) -> float:
+    """Entropie de Shannon (bits) d'un histogramme de comptes."""
+    counts = counts[counts > 0]
+    total = counts.sum()
+    if total <= 0:
+        return 0.0
+    probabilities = counts / total
+    return float(-np.sum(probabilities * np.log2(probabilities)))
+
+
+class HistogramEntropy:
+    """
+    Accumulateur d'entropie à classes fixes : update() ajoute les comptes d'un tableau
+    (np.bincount sur les indices de classe, sans liste intermédiaire), merge() additionne
+    un autre accumulateur de même découpage (autre frame, autre worker). to_dict() /
+    from_dict() transportent les comptes d'un processus à l'autre.
+    """
+    def __init__(
+        self,
+        bins: int = ENTROPY_HISTOGRAM_BINS,
+        value_range: Tuple[float, float] = (-ENTROPY_HISTOGRAM_RANGE, ENTROPY_HISTOGRAM_RANGE),
+        counts: Optional[np.ndarray] = None
+    ):
+        self.bins = int(bins)
+        self.value_range = (float(value_range[0]), float(value_range[1]))
+        if self.bins < 1 or self.value_range[1] <= self.value_range[0]:
+            raise ValueError("Découpage d'histogramme invalide.")
+        self._scale = self.bins / (self.value_range[1] - self.value_range[0])
+        self.counts = np.zeros(self.bins, dtype=np.int64) if counts is None else np.array(counts, dtype=np.int64).reshape(self.bins)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def compatible(self, other: "HistogramEntropy") -> bool:
+        return self.bins == other.bins and self.value_range == other.value_range
+
+    def bin_counts(self, values) -> np.ndarray:
+        """Comptes par classe des valeurs finies d'un tableau (vue aplatie, quelle que soit sa forme)."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        values = values[np.isfinite(values)]
+        index = ((values - self.value_range[0]) * self._scale).astype(np.intp)
+        np.clip(index, 0, self.bins - 1, out=index)
+        return np.bincount(index, minlength=self.bins)
+
+    def update(self, values) -> "HistogramEntropy":
+        self.counts += self.bin_counts(values)
+        return self
+
+    def merge(self, other: "HistogramEntropy") -> "HistogramEntropy":
+        if not self.compatible(other):
+            raise ValueError("Fusion d'histogrammes de découpages différents.")
+        self.counts += other.counts
+        return self
+
+    def entropy(self) -> float:
+        return shannon_entropy(self.counts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"bins": self.bins, "range": list(self.value_range), "counts": self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HistogramEntropy":
+        return cls(bins=data["bins"], value_range=tuple(data["range"]), counts=data["counts"])
+
+
+class SlidingWindowEntropy:
+    """
+    Entropie sur les window dernières observations : anneau de comptes (window, bins) et
+    somme courante ; push() retire l'observation la plus ancienne en O(bins).
+    """
+    def __init__(
+        self,
+        window: int = ENTROPY_WINDOW_SIZE,
+        bins: int = ENTROPY_HISTOGRAM_BINS,
+        value_range: Tuple[float, float] = (-ENTROPY_HISTOGRAM_RANGE, ENTROPY_HISTOGRAM_RANGE)
+    ):
+        self.window = max(1, int(window))
+        self.histogram = HistogramEntropy(bins, value_range)
+        self._ring = np.zeros((self.window, self.histogram.bins), dtype=np.int64)
+        self._next = 0
+        self.observations = 0
+
+    def push(self, counts: np.ndarray) -> "SlidingWindowEntropy":
+        """Ajoute les comptes d'une observation (HistogramEntropy.bin_counts)."""
+        slot = self._next
+        self.histogram.counts += counts - self._ring[slot]
+        self._ring[slot] = counts
+        self._next = (slot + 1) % self.window
+        self.observations += 1
+        return self
+
+    def update(self, values) -> "SlidingWindowEntropy":
+        return self.push(self.histogram.bin_counts(values))
+
+    def entropy(self) -> float:
+        return self.histogram.entropy()
+
+
+class EntropyTelemetry:
+    """
+    Télémétrie d'entropie par source : pour chaque source, les comptes de sa dernière
+    observation, une fenêtre glissante et un cumul depuis le démarrage du worker.
+    observe() n'est appelé qu'à l'arrivée de nouvelles données ; combined() fusionne
+    les dernières observations des sources demandées en O(sources x bins).
+    """
+    def __init__(
+        self,
+        window: int = ENTROPY_WINDOW_SIZE,
+        bins: int = ENTROPY_HISTOGRAM_BINS,
+        value_range: Tuple[float, float] = (-ENTROPY_HISTOGRAM_RANGE, ENTROPY_HISTOGRAM_RANGE)
+    ):
+        self.window = window
+        self.bins = bins
+        self.value_range = value_range
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict[str, Any]] = {}
+
+    def _histogram(self) -> HistogramEntropy:
+        return HistogramEntropy(self.bins, self.value_range)
+
+    def observe(self, name: str, values) -> np.ndarray:
+        """Enregistre une observation de la source name ; renvoie ses comptes par classe."""
+        counts = self._histogram().bin_counts(values)
+        with self._lock:
+            state = self._sources.get(name)
+            if state is None:
+                state = self._sources[name] = {
+                    "latest": self._histogram(),
+                    "window": SlidingWindowEntropy(self.window, self.bins, self.value_range),
+                    "total": self._histogram()
+                }
+            state["latest"].counts = counts
+            state["window"].push(counts)
+            state["total"].counts += counts
+        return counts
+
+    def combined(self, names=None) -> HistogramEntropy:
+        """Fusion des dernières observations des sources names (toutes par défaut)."""
+        merged = self._histogram()
+        with self._lock:
+            for name, state in self._sources.items():
+                if names is None or name in names:
+                    merged.merge(state["latest"])
+        return merged
+
+    def snapshot(self, include_counts: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Entropies courantes par source (bits). include_counts joint les comptes cumulés,
+        fusionnables avec ceux d'autres workers via HistogramEntropy.from_dict().merge().
+        """
+        with self._lock:
+            report = {}
+            for name, state in self._sources.items():
+                report[name] = {
+                    "latest_bits": state["latest"].entropy(),
+                    "window_bits": state["window"].entropy(),
+                    "total_bits": state["total"].entropy(),
+                    "observations": state["window"].observations,
+                    "samples": state["total"].total
+                }
+                if include_counts:
+                    report[name]["histogram"] = state["total"].to_dict()
+            return report
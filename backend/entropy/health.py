@@ -0,0 +1,396 @@
+import os
+import math
+import time
+import hashlib
+import logging
+import threading
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger("entropy_health")
+
+HEALTH_TESTS_ENABLED = os.getenv("HEALTH_TESTS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Probabilité de fausse alarme par test : 2^-HEALTH_TEST_ALPHA_EXPONENT (SP 800-90B : 2^-20 à 2^-40)
+HEALTH_TEST_ALPHA_EXPONENT = int(os.getenv("HEALTH_TEST_ALPHA_EXPONENT", "40"))
+# Octets accumulés avant d'exécuter les tests (coût numpy amorti sur le lot)
+HEALTH_TEST_BATCH = int(os.getenv("HEALTH_TEST_BATCH", "16384"))
+# Fenêtre du test de proportion adaptative (échantillons non binaires : 512)
+HEALTH_APT_WINDOW = int(os.getenv("HEALTH_APT_WINDOW", "512"))
+# Fenêtre du test du khi-deux sur la fréquence des octets
+HEALTH_CHI_SQUARE_WINDOW = int(os.getenv("HEALTH_CHI_SQUARE_WINDOW", "65536"))
+# Durée (secondes) pendant laquelle une contribution peut rester identique avant que sa
+# source soit déclarée figée. Exprimée en temps et non en nombre d'appels : la météo est
+# servie depuis le cache du client (WEATHER_CACHE_TTL, puis WEATHER_CACHE_STALE_TTL) et se
+# répète légitimement entre deux requêtes à Open-Meteo, quel que soit le trafic.
+SEED_SOURCE_STUCK_AFTER = float(os.getenv("SEED_SOURCE_STUCK_AFTER", "7200"))
+# Sources de graine constantes par construction (géométrie déterministe), non surveillées
+CONSTANT_SEED_SOURCES = ("icosahedron",)
+
+
+def repetition_count_cutoff(min_entropy: float, alpha_exponent: int = HEALTH_TEST_ALPHA_EXPONENT) -> int:
+    """Seuil du test de comptage des répétitions : C = 1 + ceil(-log2(alpha) / H)."""
+    return 1 + math.ceil(alpha_exponent / min_entropy)
+
+
+def adaptive_proportion_cutoff(
+    window: int,
+    min_entropy: float,
+    alpha_exponent: int = HEALTH_TEST_ALPHA_EXPONENT
+) -> int:
+    """
+    Seuil du test de proportion adaptative (SP 800-90B 4.4.2) :
+    C = 1 + CRITBINOM(window, 2^-H, 1 - alpha), le plus petit k tel que
+    P(Binomiale(window, 2^-H) > k) <= alpha.
+    """
+    alpha = 2.0 ** -alpha_exponent
+    p = 2.0 ** -min_entropy
+    n = window
+    tail = 0.0
+    # Queue de distribution accumulée par le haut pour éviter la perte de précision de 1 - CDF
+    for k in range(n, -1, -1):
+        pmf = math.comb(n, k) * p ** k * (1 - p) ** (n - k)
+        if tail + pmf > alpha:
+            return 1 + k
+        tail += pmf
+    return 1
+
+
+def chi_square_critical(degrees: int, alpha_exponent: int = HEALTH_TEST_ALPHA_EXPONENT) -> float:
+    """Valeur critique du khi-deux (approximation de Wilson-Hilferty)."""
+    z = -NormalDist().inv_cdf(2.0 ** -alpha_exponent)
+    k = float(degrees)
+    return k * (1 - 2 / (9 * k) + z * math.sqrt(2 / (9 * k))) ** 3
+
+
+class RepetitionCountTest:
+    """
+    Test de comptage des répétitions (SP 800-90B 4.4.1) sur des lots d'octets : longueurs
+    des séries d'octets identiques calculées d'un bloc, la série en cours étant reportée
+    d'un lot au suivant. Une série n'est comptée qu'une fois en échec.
+    """
+    def __init__(self, cutoff: int):
+        self.cutoff = cutoff
+        self.samples = 0
+        self.failures = 0
+        self.longest_run = 0
+        self._last = -1
+        self._run = 0
+
+    def update(self, samples: np.ndarray) -> int:
+        n = len(samples)
+        if not n:
+            return 0
+        # Indices i tels que samples[i + 1] == samples[i] : rares sur une sortie saine,
+        # les séries se reconstituent à partir de ce petit tableau
+        same = np.flatnonzero(samples[1:] == samples[:-1])
+        if same.size:
+            breaks = np.flatnonzero(np.diff(same) != 1)
+            starts = same[np.concatenate(([0], breaks + 1))]
+            ends = same[np.concatenate((breaks, [same.size - 1]))] + 1
+            runs = ends - starts + 1
+        else:
+            starts = ends = runs = np.zeros(0, dtype=np.intp)
+        carried = int(samples[0]) == self._last
+        if carried:
+            if starts.size and starts[0] == 0:
+                runs[0] += self._run
+            else:
+                starts, ends, runs = (np.concatenate(([0], starts)), np.concatenate(([0], ends)),
+                                      np.concatenate(([1 + self._run], runs)))
+        failures = int(np.count_nonzero(runs >= self.cutoff))
+        if carried and self._run >= self.cutoff:
+            failures -= 1  # Série déjà comptée au lot précédent
+        self._last = int(samples[-1])
+        self._run = int(runs[-1]) if ends.size and ends[-1] == n - 1 else 1
+        self.samples += n
+        self.failures += failures
+        self.longest_run = max(self.longest_run, int(runs.max()) if runs.size else 1)
+        return failures
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cutoff": self.cutoff, "failures": self.failures, "longest_run": self.longest_run}
+
+
+class AdaptiveProportionTest:
+    """
+    Test de proportion adaptative (SP 800-90B 4.4.2) : dans chaque fenêtre de window
+    octets, le nombre d'occurrences du premier octet ne doit pas atteindre cutoff.
+    Les fenêtres complètes d'un lot sont évaluées ensemble (tableau (k, window)) ; la
+    fenêtre entamée est reportée au lot suivant.
+    """
+    def __init__(self, window: int, cutoff: int):
+        self.window = window
+        self.cutoff = cutoff
+        self.windows = 0
+        self.failures = 0
+        self.max_count = 0
+        self._reference = 0
+        self._count = 0
+        self._position = 0
+
+    def _close(self, counts) -> int:
+        counts = np.asarray(counts)
+        self.windows += counts.size
+        self.max_count = max(self.max_count, int(counts.max()))
+        return int(np.count_nonzero(counts >= self.cutoff))
+
+    def update(self, samples: np.ndarray) -> int:
+        n = len(samples)
+        i = 0
+        failures = 0
+        if self._position and n:
+            i = min(self.window - self._position, n)
+            self._count += int(np.count_nonzero(samples[:i] == self._reference))
+            self._position += i
+            if self._position == self.window:
+                failures += self._close([self._count])
+                self._position = 0
+        full = (n - i) // self.window
+        if full:
+            block = samples[i:i + full * self.window].reshape(full, self.window)
+            failures += self._close(np.count_nonzero(block == block[:, :1], axis=1))
+            i += full * self.window
+        if i < n:
+            self._reference = samples[i]
+            self._count = int(np.count_nonzero(samples[i:] == self._reference))
+            self._position = n - i
+        self.failures += failures
+        return failures
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window": self.window, "cutoff": self.cutoff, "windows": self.windows,
+            "failures": self.failures, "max_count": self.max_count
+        }
+
+
+class ByteFrequencyTest:
+    """
+    Khi-deux d'uniformité des fréquences d'octets (255 degrés de liberté), évalué à
+    chaque fenêtre de window octets ; les comptes sont accumulés par np.bincount.
+    """
+    def __init__(self, window: int, critical: float):
+        self.window = window
+        self.critical = critical
+        self.windows = 0
+        self.failures = 0
+        self.last_statistic: Optional[float] = None
+        self._counts = np.zeros(256, dtype=np.int64)
+        self._observed = 0
+
+    def update(self, samples: np.ndarray) -> int:
+        failures = 0
+        i = 0
+        n = len(samples)
+        while i < n:
+            take = min(self.window - self._observed, n - i)
+            self._counts += np.bincount(samples[i:i + take], minlength=256)
+            self._observed += take
+            i += take
+            if self._observed == self.window:
+                expected = self.window / 256
+                statistic = float(np.sum((self._counts - expected) ** 2) / expected)
+                self.last_statistic = statistic
+                self.windows += 1
+                failures += statistic > self.critical
+                self._counts[:] = 0
+                self._observed = 0
+        self.failures += failures
+        return failures
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window": self.window, "critical": round(self.critical, 1), "windows": self.windows,
+            "failures": self.failures, "last_statistic": self.last_statistic
+        }
+
+
+class HealthMonitor:
+    """
+    Tests de santé continus sur un flux d'octets (sortie du DRBG, graines). observe()
+    ne fait qu'ajouter les octets à un tampon ; les trois tests vectorisés s'exécutent
+    quand batch_size octets sont en attente, soit un coût amorti O(1) par octet.
+    observe_sample() détecte en plus la répétition d'un échantillon entier (graine
+    de repli constante). Le moniteur n'interrompt jamais le flux : les échecs sont
+    journalisés et comptés, healthy passe à False.
+    """
+    def __init__(
+        self,
+        name: str,
+        min_entropy: float = 8.0,
+        batch_size: int = HEALTH_TEST_BATCH,
+        apt_window: int = HEALTH_APT_WINDOW,
+        chi_square_window: int = HEALTH_CHI_SQUARE_WINDOW,
+        alpha_exponent: int = HEALTH_TEST_ALPHA_EXPONENT
+    ):
+        self.name = name
+        self.batch_size = max(1, batch_size)
+        self.repetition = RepetitionCountTest(repetition_count_cutoff(min_entropy, alpha_exponent))
+        self.proportion = AdaptiveProportionTest(
+            apt_window, adaptive_proportion_cutoff(apt_window, min_entropy, alpha_exponent)
+        )
+        self.frequency = ByteFrequencyTest(chi_square_window, chi_square_critical(255, alpha_exponent))
+        self.bytes_tested = 0
+        self.samples = 0
+        self.repeated_samples = 0
+        self.last_failure: Optional[float] = None
+        self._last_sample: Optional[bytes] = None
+        self._pending = bytearray()
+        self._lock = threading.Lock()
+
+    @property
+    def failures(self) -> int:
+        return self.repetition.failures + self.proportion.failures + self.frequency.failures + self.repeated_samples
+
+    @property
+    def healthy(self) -> bool:
+        return self.failures == 0
+
+    def _record(self, test: str, failures: int, was_healthy: bool) -> None:
+        if not failures:
+            return
+        if was_healthy:
+            logger.warning(f"Test de santé {test} en échec sur {self.name} ({failures} échec(s))")
+        self.last_failure = time.time()
+
+    def _run(self) -> None:
+        if not self._pending:
+            return
+        samples = np.frombuffer(bytes(self._pending), dtype=np.uint8)
+        del self._pending[:]
+        for test_name, test in (
+            ("repetition_count", self.repetition),
+            ("adaptive_proportion", self.proportion),
+            ("byte_frequency", self.frequency)
+        ):
+            was_healthy = self.healthy
+            self._record(test_name, test.update(samples), was_healthy)
+        self.bytes_tested += len(samples)
+
+    def observe(self, data) -> None:
+        """Ajoute des octets au flux surveillé ; les tests s'exécutent par lots."""
+        if not HEALTH_TESTS_ENABLED:
+            return
+        with self._lock:
+            self._pending += data
+            if len(self._pending) >= self.batch_size:
+                self._run()
+
+    def observe_sample(self, sample: bytes) -> None:
+        """Échantillon entier (graine) : une graine identique à la précédente est un échec."""
+        if not HEALTH_TESTS_ENABLED:
+            return
+        digest = hashlib.blake2b(sample, digest_size=16).digest()
+        with self._lock:
+            self.samples += 1
+            if digest == self._last_sample:
+                was_healthy = self.healthy
+                self.repeated_samples += 1
+                self._record("repeated_sample", 1, was_healthy)
+            self._last_sample = digest
+        self.observe(sample)
+
+    def flush(self) -> None:
+        """Exécute les tests sur les octets en attente, quel que soit leur nombre."""
+        with self._lock:
+            self._run()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "healthy": self.healthy,
+                "failures": self.failures,
+                "last_failure": self.last_failure,
+                "bytes_tested": self.bytes_tested,
+                "bytes_pending": len(self._pending),
+                "samples": self.samples,
+                "repeated_samples": self.repeated_samples,
+                "repetition_count": self.repetition.stats(),
+                "adaptive_proportion": self.proportion.stats(),
+                "byte_frequency": self.frequency.stats()
+            }
+
+
+class SeedSourceMonitor:
+    """
+    Détection des sources de graine figées (flux météo bloqué...) : une source dont la
+    contribution reste identique pendant stuck_after secondes est déclarée figée jusqu'à
+    ce qu'elle change. Les répétitions servies par un cache pendant sa durée de validité
+    ne déclenchent donc rien, quel que soit le nombre d'appels. Seule une empreinte courte
+    de chaque contribution est conservée.
+    """
+    def __init__(self, stuck_after: float = SEED_SOURCE_STUCK_AFTER, exempt: Iterable[str] = CONSTANT_SEED_SOURCES):
+        self.stuck_after = stuck_after
+        self.exempt = frozenset(exempt)
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label: str, value: Any) -> None:
+        if not HEALTH_TESTS_ENABLED or label in self.exempt:
+            return
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        elif isinstance(value, np.ndarray):
+            value = np.ascontiguousarray(value).tobytes()
+        digest = hashlib.blake2b(bytes(value), digest_size=16).digest()
+        now = time.monotonic()
+        with self._lock:
+            state = self._sources.setdefault(label, {
+                "digest": None, "since": now, "run": 0, "stuck": False, "contributions": 0, "stuck_events": 0
+            })
+            state["contributions"] += 1
+            if digest != state["digest"]:
+                state.update(digest=digest, since=now, run=1, stuck=False)
+                return
+            state["run"] += 1
+            if not state["stuck"] and now - state["since"] >= self.stuck_after:
+                state["stuck"] = True
+                state["stuck_events"] += 1
+                logger.warning(
+                    f"Source de graine {label} figée : contribution identique depuis {now - state['since']:.0f}s "
+                    f"({state['run']} contributions)"
+                )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                label: {
+                    "stuck": state["stuck"],
+                    "identical_run": state["run"],
+                    "unchanged_for": round(now - state["since"], 1),
+                    "contributions": state["contributions"],
+                    "stuck_events": state["stuck_events"]
+                }
+                for label, state in self._sources.items()
+            }
+
+
+_monitors: Dict[str, HealthMonitor] = {}
+_monitors_lock = threading.Lock()
+seed_source_monitor = SeedSourceMonitor()
+
+
+def get_health_monitor(name: str, **kwargs) -> HealthMonitor:
+    """Moniteur nommé partagé par le processus (créé au premier appel avec kwargs)."""
+    with _monitors_lock:
+        monitor = _monitors.get(name)
+        if monitor is None:
+            monitor = _monitors[name] = HealthMonitor(name, **kwargs)
+        return monitor
+
+
+def health_report() -> Dict[str, Any]:
+    """Compteurs de tous les moniteurs du worker et état des sources de graine."""
+    with _monitors_lock:
+        monitors = dict(_monitors)
+    report = {name: monitor.stats() for name, monitor in monitors.items()}
+    sources = seed_source_monitor.stats()
+    return {
+        "enabled": HEALTH_TESTS_ENABLED,
+        "healthy": all(stats["healthy"] for stats in report.values()) and not any(s["stuck"] for s in sources.values()),
+        "monitors": report,
+        "seed_sources": sources
+    }
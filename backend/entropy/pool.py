@@ -0,0 +1,189 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+logger = logging.getLogger("entropy_pool")
+
+# Intervalle entre deux réensemencements en arrière-plan (secondes)
+ENTROPY_POOL_RESEED_INTERVAL = float(os.getenv("ENTROPY_POOL_RESEED_INTERVAL", "60"))
+# Âge au-delà duquel un tirage déclenche un réensemencement immédiat (secondes)
+ENTROPY_POOL_MAX_AGE = float(os.getenv("ENTROPY_POOL_MAX_AGE", "300"))
+ENTROPY_POOL_ENABLED = os.getenv("ENTROPY_POOL_ENABLED", "true").lower() in ("1", "true", "yes")
+
+POOL_KEY_SIZE = 32
+
+
+def _derive(key: bytes, label: bytes, length: int) -> bytes:
+    """Dérivation à clé (BLAKE3 keyed XOF, repli BLAKE2b à clé pour length <= 64)."""
+    if BLAKE3_AVAILABLE:
+        return blake3.blake3(label, key=key).digest(length)
+    if length > 64:
+        raise ValueError("Longueur de dérivation > 64 octets non supportée sans BLAKE3.")
+    return hashlib.blake2b(label, key=key, digest_size=length).digest()
+
+
+class EntropyPool:
+    """
+    Pool d'entropie longue durée, propre à un processus worker.
+
+    Un ordonnanceur en arrière-plan réensemence périodiquement le pool avec reseed_func
+    (typiquement generate_quantum_geometric_entropy), hors du chemin des requêtes.
+    Les requêtes tirent leurs graines par dérivation (hash-ratchet) : chaque tirage
+    remplace la clé interne par une fonction à sens unique de l'ancienne, de sorte
+    qu'une compromission de l'état ne révèle pas les graines déjà distribuées.
+    """
+    def __init__(
+        self,
+        reseed_func: Callable[[], Optional[bytes]],
+        reseed_interval: float = ENTROPY_POOL_RESEED_INTERVAL,
+        max_age: float = ENTROPY_POOL_MAX_AGE
+    ):
+        self.reseed_func = reseed_func
+        self.reseed_interval = reseed_interval
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._reseed_lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+
+        self._key = os.urandom(POOL_KEY_SIZE)
+        self._counter = 0
+        self._seeded = False
+        self._last_reseed: Optional[float] = None
+        self._last_reseed_duration: Optional[float] = None
+        self._reseed_count = 0
+        self._reseed_failures = 0
+        self._draws = 0
+
+    def reseed(self) -> bool:
+        """
+        Collecte une graine fraîche et l'injecte dans le pool.
+        Un seul réensemencement à la fois : les appels concurrents reviennent immédiatement.
+        """
+        if not self._reseed_lock.acquire(blocking=False):
+            return False
+        try:
+            start = time.monotonic()
+            try:
+                fresh = self.reseed_func()
+            except Exception as e:
+                logger.error(f"Erreur lors du réensemencement du pool d'entropie : {e}", exc_info=True)
+                fresh = None
+            duration = time.monotonic() - start
+
+            with self._lock:
+                self._last_reseed_duration = duration
+                if not fresh:
+                    self._reseed_failures += 1
+                    logger.warning("Réensemencement du pool d'entropie échoué, conservation de l'état courant.")
+                    return False
+                material = self._key + fresh + time.time_ns().to_bytes(8, "big") + os.urandom(16)
+                self._key = _derive(self._key, b"reseed" + material, POOL_KEY_SIZE)
+                self._seeded = True
+                self._last_reseed = time.monotonic()
+                self._reseed_count += 1
+            logger.info(f"Pool d'entropie réensemencé en {duration:.3f}s")
+            return True
+        finally:
+            self._reseed_lock.release()
+
+    def _ensure_seeded(self) -> bool:
+        """Attend le réensemencement en cours (ou en lance un) si le pool n'est pas encore ensemencé."""
+        with self._reseed_lock:
+            return self._seeded or self.reseed()
+
+    def draw(self, length: int = 32, personalization: bytes = b"") -> Optional[bytes]:
+        """
+        Tire une graine de length octets dérivée du pool (quelques microsecondes).
+        Le premier tirage attend le réensemencement initial ; ensuite, un pool trop
+        ancien est réensemencé en arrière-plan sans bloquer la requête.
+
+        Returns:
+            Optional[bytes]: La graine, ou None si le pool n'a jamais pu être ensemencé.
+        """
+        if not self._seeded and not self._ensure_seeded():
+            logger.error("Pool d'entropie non ensemencé.")
+            return None
+
+        with self._lock:
+            counter_bytes = self._counter.to_bytes(8, "big")
+            output = _derive(self._key, b"output" + counter_bytes + personalization, length)
+            self._key = _derive(self._key, b"ratchet" + counter_bytes, POOL_KEY_SIZE)
+            self._counter += 1
+            self._draws += 1
+            age = time.monotonic() - self._last_reseed
+
+        if age > self.max_age:
+            logger.warning(f"Pool d'entropie âgé de {age:.1f}s, réensemencement immédiat.")
+            threading.Thread(target=self.reseed, name="entropy-pool-reseed", daemon=True).start()
+        return output
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.reseed_interval):
+            self.reseed()
+
+    def start(self) -> None:
+        """Démarre l'ordonnanceur de réensemencement (thread démon)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="entropy-pool-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Arrête l'ordonnanceur de réensemencement."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Métriques du pool : âge, durée du dernier réensemencement, compteurs."""
+        with self._lock:
+            return {
+                "seeded": self._seeded,
+                "pool_age": time.monotonic() - self._last_reseed if self._last_reseed is not None else None,
+                "last_reseed_duration": self._last_reseed_duration,
+                "reseed_count": self._reseed_count,
+                "reseed_failures": self._reseed_failures,
+                "draws": self._draws,
+                "reseed_interval": self.reseed_interval,
+                "scheduler_running": self._thread is not None and self._thread.is_alive(),
+                "pid": self._pid
+            }
+
+
+_pools: Dict[Hashable, EntropyPool] = {}
+_pool_lock = threading.Lock()
+
+
+def get_entropy_pool(
+    reseed_func: Callable[[], Optional[bytes]],
+    key: Hashable = "default",
+    start: bool = True,
+    **pool_kwargs
+) -> EntropyPool:
+    """
+    Retourne le pool du processus courant pour key (un pool par jeu de sources), créé
+    au premier appel ; start=False le laisse sans ordonnanceur (réensemencé au premier
+    tirage, puis dès qu'il dépasse max_age). Après un fork (workers gunicorn), un nouveau
+    pool est créé : deux workers ne partagent jamais le même état.
+    """
+    with _pool_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._pid != os.getpid():
+            pool = _pools[key] = EntropyPool(reseed_func, **pool_kwargs)
+            if start:
+                pool.start()
+        return pool
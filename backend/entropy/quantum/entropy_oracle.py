@@ -1,8 +1,10 @@
 import os
 import time
 import json
+import struct
 import hashlib
 import logging
+import numpy as np
 from typing import Optional, List, Dict, Any, Tuple
 
 try:
@@ -12,19 +14,26 @@ except ImportError:
     BLAKE3_AVAILABLE = False
 
 # --- IMPORTS DES MODULES GÉOMÉTRIQUES ---
-from geometry.icosahedron.generator import generate_klee_penrose_polyhedron
-from geometry.spiral_torus.generator import generate_toroidal_spiral_system
-from geometry.spiral_torus.dynamics import update_toroidal_spiral_dynamics
-from geometry.cubes.generator import CubeGenerator
-from geometry.cubes.dynamics import update_cubes_dynamics
+# Chargés au premier calcul de la source correspondante
+from core.startup import lazy_import
+get_klee_penrose_mesh = lazy_import("geometry.icosahedron.generator", "get_klee_penrose_mesh")
+ToroidalSpiralSystem = lazy_import("geometry.spiral_torus.dynamics", "ToroidalSpiralSystem")
+CubeSystem = lazy_import("geometry.cubes.dynamics", "CubeSystem")
 
 # --- AUTRES SOURCES D'ENTROPIE ET UTILITAIRES ---
-from geometry.fractal import FractalLSystem
-from entropy.quantum.quantum_nodes import QuantumNode
-from entropy.temporal.temporal_entropy import get_world_timestamps, mix_timestamps
+get_world_timestamps = lazy_import("entropy.temporal.temporal_entropy", "get_world_timestamps")
+mix_timestamps = lazy_import("entropy.temporal.temporal_entropy", "mix_timestamps")
+from entropy.collector import EntropyCollector, EntropySource, get_default_collector
+from entropy.signature import SignatureHasher, SeedAccumulator, array_signature
+from entropy.health import get_health_monitor, seed_source_monitor
 
 logger = logging.getLogger("entropy_oracle")
 
+# Tests de santé des graines : graines assemblées et graines finales (repli compris).
+# Une graine est un lot à elle seule : les tests s'exécutent à chaque graine.
+SEED_HEALTH = get_health_monitor("seed", batch_size=32)
+FINAL_SEED_HEALTH = get_health_monitor("final_seed", batch_size=32)
+
 # Paramètres par défaut pour la dynamique
 DEFAULT_GEOMETRY_PARAMS = {
     'sigma': 10.0,
@@ -46,33 +55,21 @@ def get_cubes_entropy(
     delta_time: float = 0.016
 ) -> Optional[bytes]:
     try:
-        cube_generator = CubeGenerator()
-        cubes_system = cube_generator.generate_cubes_system(
+        system = CubeSystem.generate(
             num_cubes=num_cubes, 
             cube_size=cube_size, 
             num_balls_per_cube=num_balls_per_cube, 
             space_bounds=space_bounds
         )
+        system.step(simulation_steps, delta_time=delta_time, chaos=0.05)
         
-        current_cubes_state = cubes_system
-        for _ in range(simulation_steps):
-            current_cubes_state = update_cubes_dynamics(
-                current_cubes_state, 
-                delta_time=delta_time,
-                chaos=0.05
-            )
-        
-        signature_data = []
-        for cube in current_cubes_state:
-            signature_data.extend(cube["position"])
-            signature_data.extend(cube["rotation"])
-            signature_data.extend(cube["angular_velocity"])
-            for ball in cube["balls"]:
-                signature_data.extend(ball["position"])
-                signature_data.extend(ball["velocity"])
-        
-        signature_string = json.dumps(signature_data, sort_keys=True)
-        hashed_signature = hashlib.blake2b(signature_string.encode(), digest_size=32).digest()
+        hashed_signature = array_signature("cubes", [
+            ("positions", system.positions),
+            ("rotations", system.rotations),
+            ("angular_velocities", system.angular_velocities),
+            ("ball_positions", system.ball_positions),
+            ("ball_velocities", system.ball_velocities)
+        ])
         
         logger.info(f"Entropie des cubes générée avec succès: {hashed_signature.hex()}")
         return hashed_signature
@@ -96,14 +93,13 @@ def get_spiral_entropy(
         if get_entropy_data is None:
             raise ValueError("La fonction utilitaire get_entropy_data doit être fournie en argument.")
         entropy = get_entropy_data()
-        import numpy as np
         np.random.seed(int(entropy * 1000) % 2**32)
         theta = np.linspace(0, 4 * np.pi, steps)
         z = np.linspace(-height / 2, height / 2, steps)
         r = radius * (1 + 0.1 * np.sin(theta))
         x = r * np.cos(theta)
         y = r * np.sin(theta)
-        points = np.vstack((x, y, z)).T.tolist()
+        points = np.vstack((x, y, z)).T
 
         weather_influence = 1.0
         if use_weather and get_area_weather_data and combine_weather_data and config:
@@ -112,15 +108,16 @@ def get_spiral_entropy(
             if processed_weather:
                 temp = processed_weather.get('temperature', 20.0)
                 weather_influence = 1.0 + 0.01 * (temp - 20.0)
-                points = [[p[0] * weather_influence, p[1] * weather_influence, p[2]] for p in points]
+                points[:, :2] *= weather_influence
 
-        entropy_data = {
-            "points": points,
-            "timestamp": time.time_ns(),
-            "weather_influence": weather_influence
-        }
-        entropy_string = json.dumps(entropy_data, sort_keys=True)
-        entropy_hash = hashlib.sha3_512(entropy_string.encode()).digest().hex()
+        entropy_hash = (
+            SignatureHasher("spiral_simple", digest_size=64)
+            .update_array("points", points)
+            .update_array("timestamp", time.time_ns(), dtype="<i8")
+            .update_scalar("weather_influence", weather_influence)
+            .hexdigest()
+        )
+        points = points.tolist()
 
         frames = [{
             "spiral_positions": points,
@@ -144,29 +141,89 @@ def get_spiral_torus_entropy(
     noise_level: float = 0.1
 ) -> Optional[bytes]:
     try:
-        system = generate_toroidal_spiral_system(R, r, n_turns, n_points)
-        current_system = system
-        for _ in range(simulation_steps):
-            current_system = update_toroidal_spiral_dynamics(
-                current_system,
-                delta_time=delta_time,
-                chaos=chaos_factor,
-                noise_level=noise_level
-            )
-        
-        signature_data = []
-        for point in current_system["spiral"]["points"]:
-            signature_data.extend(point["position"])
-            signature_data.append(point["size"])
-        
-        signature_string = json.dumps(signature_data, sort_keys=True)
-        hashed_signature = hashlib.blake2b(signature_string.encode(), digest_size=32).digest()
+        system = ToroidalSpiralSystem.generate(R, r, n_turns, n_points)
+        system.advance(
+            simulation_steps,
+            delta_time=delta_time,
+            chaos_factor=chaos_factor,
+            noise_level=noise_level
+        )
+        hashed_signature = array_signature("spiral_torus", [
+            ("positions", system.positions),
+            ("sizes", system.sizes)
+        ])
         logger.info(f"Entropie de la spirale toroïdale générée: {hashed_signature.hex()}")
         return hashed_signature
     except Exception as e:
         logger.error(f"Erreur dans get_spiral_torus_entropy: {e}", exc_info=True)
         return None
 
+# --- CONTRIBUTIONS INDIVIDUELLES À LA GRAINE ---
+# Fonctions de niveau module (picklables) exécutées par le collecteur concurrent.
+def _weather_seed_part(get_area_weather_data, combine_weather_data, coordinates) -> Optional[str]:
+    all_weather_data_raw = get_area_weather_data(coordinates)
+    weather_data_processed = combine_weather_data(all_weather_data_raw)
+    if not weather_data_processed:
+        logger.warning("Aucune donnée météo disponible.")
+        return None
+    return json.dumps(weather_data_processed, sort_keys=True)
+
+def _icosahedron_seed_part(subdivisions: int) -> Optional[bytes]:
+    mesh = get_klee_penrose_mesh(subdivisions)
+    if not len(mesh.vertices):
+        logger.warning("Aucune donnée d'icosaèdre générée.")
+        return None
+    return array_signature("icosahedron", [("vertices", mesh.vertices)])
+
+def _quantum_seed_part(get_quantum_entropy) -> Optional[str]:
+    quantum_entropy_value = get_quantum_entropy()
+    return str(quantum_entropy_value) if quantum_entropy_value is not None else None
+
+def _timestamps_seed_part() -> Optional[str]:
+    timestamps_list = get_world_timestamps()
+    mixed_timestamps_string = mix_timestamps(timestamps_list, mode='hybrid')
+    if not mixed_timestamps_string:
+        logger.warning("Aucune entropie temporelle mondiale générée.")
+        return None
+    return mixed_timestamps_string
+
+def _local_noise_seed_part() -> str:
+    return os.urandom(16).hex()
+
+def _cubes_seed_part(**cubes_kwargs) -> Optional[bytes]:
+    cubes_entropy_bytes = get_cubes_entropy(**cubes_kwargs)
+    if not cubes_entropy_bytes:
+        logger.warning("Aucune entropie des cubes générée.")
+        return None
+    return cubes_entropy_bytes
+
+def _spiral_simple_seed_part(**spiral_kwargs) -> Optional[bytes]:
+    spiral_simple_frames = get_spiral_entropy(get_entropy_data=lambda: 0.5, **spiral_kwargs)
+    if not spiral_simple_frames:
+        logger.warning("Aucune entropie de spirale simple générée.")
+        return None
+    # L'empreinte couvre déjà les points, l'horodatage et l'influence météo
+    return bytes.fromhex(spiral_simple_frames[0]["entropy_hash"])
+
+def _spiral_torus_seed_part(**spiral_torus_kwargs) -> Optional[bytes]:
+    spiral_torus_entropy_bytes = get_spiral_torus_entropy(**spiral_torus_kwargs)
+    if not spiral_torus_entropy_bytes:
+        logger.warning("Aucune entropie de la spirale toroïdale générée.")
+        return None
+    return spiral_torus_entropy_bytes
+
+# Échéance par source (secondes depuis le début de la collecte)
+DEFAULT_SOURCE_TIMEOUTS = {
+    'weather': 6.0,
+    'icosahedron': 3.0,
+    'quantum': 2.0,
+    'timestamps': 1.0,
+    'local_noise': 1.0,
+    'cubes': 3.0,
+    'spiral_simple': 6.0,
+    'spiral_torus': 3.0
+}
+
 # --- FONCTION PRINCIPALE D'ORCHESTRATION D'ENTROPIE ---
 def generate_quantum_geometric_entropy(
     length: int = 32,
@@ -195,107 +252,113 @@ def generate_quantum_geometric_entropy(
     get_area_weather_data=None,
     combine_weather_data=None,
     config: Optional[Dict] = None,
-    get_quantum_entropy=None
+    get_quantum_entropy=None,
+    source_timeouts: Optional[Dict[str, float]] = None,
+    collector: Optional[EntropyCollector] = None
 ) -> Optional[bytes]:
+    """
+    Assemble la graine finale à partir des sources activées, collectées en parallèle.
+    Chaque source dispose de sa propre échéance (DEFAULT_SOURCE_TIMEOUTS, surchargeable
+    via source_timeouts) ; la graine est construite à partir des sources terminées à temps,
+    hachées en flux par un SeedAccumulator au fil de leur achèvement.
+    """
     try:
-        seed_string_parts = []
-        seed_string_parts.append(str(time.time_ns()))
+        timeouts = {**DEFAULT_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        sources = []
 
         # Entropie Météo
         if use_weather and get_area_weather_data and combine_weather_data and config:
-            all_weather_data_raw = get_area_weather_data(config['coordinates'])
-            weather_data_processed = combine_weather_data(all_weather_data_raw)
-            if weather_data_processed:
-                seed_string_parts.append(json.dumps(weather_data_processed, sort_keys=True))
-            else:
-                logger.warning("Aucune donnée météo disponible.")
+            sources.append(EntropySource(
+                'weather', _weather_seed_part,
+                args=(get_area_weather_data, combine_weather_data, config['coordinates']),
+                timeout=timeouts['weather']
+            ))
 
         # Entropie Icosaèdre
         if use_icosahedron:
-            icosahedron_frames = generate_klee_penrose_polyhedron(subdivisions=icosa_subdivisions)
-            if icosahedron_frames:
-                seed_string_parts.append(json.dumps({"vertices": icosahedron_frames["vertices"]}, sort_keys=True))
-            else:
-                logger.warning("Aucune donnée d'icosaèdre générée.")
+            sources.append(EntropySource(
+                'icosahedron', _icosahedron_seed_part, args=(icosa_subdivisions,),
+                timeout=timeouts['icosahedron'], cpu_bound=True
+            ))
 
         # Entropie Quantique
         if use_quantum and get_quantum_entropy:
-            quantum_entropy_value = get_quantum_entropy()
-            if quantum_entropy_value is not None:
-                seed_string_parts.append(str(quantum_entropy_value))
+            sources.append(EntropySource(
+                'quantum', _quantum_seed_part, args=(get_quantum_entropy,),
+                timeout=timeouts['quantum']
+            ))
 
         # Entropie Temporelle
         if use_timestamps:
-            timestamps_list = get_world_timestamps()
-            mixed_timestamps_string = mix_timestamps(timestamps_list, mode='hybrid')
-            if mixed_timestamps_string:
-                seed_string_parts.append(mixed_timestamps_string)
-            else:
-                logger.warning("Aucune entropie temporelle mondiale générée.")
+            sources.append(EntropySource('timestamps', _timestamps_seed_part, timeout=timeouts['timestamps']))
 
         # Entropie Bruit Local
         if use_local_noise:
-            seed_string_parts.append(os.urandom(16).hex())
+            sources.append(EntropySource('local_noise', _local_noise_seed_part, timeout=timeouts['local_noise']))
 
         # Entropie Cubes
         if use_cubes:
-            cubes_entropy_bytes = get_cubes_entropy(
-                num_cubes=cubes_num_cubes,
-                cube_size=cubes_cube_size,
-                num_balls_per_cube=cubes_num_balls_per_cube,
-                space_bounds=cubes_space_bounds
-            )
-            if cubes_entropy_bytes:
-                seed_string_parts.append(cubes_entropy_bytes.hex())
-            else:
-                logger.warning("Aucune entropie des cubes générée.")
-
-        # Entropie Spirale Simple
+            sources.append(EntropySource(
+                'cubes', _cubes_seed_part,
+                kwargs={
+                    'num_cubes': cubes_num_cubes,
+                    'cube_size': cubes_cube_size,
+                    'num_balls_per_cube': cubes_num_balls_per_cube,
+                    'space_bounds': cubes_space_bounds
+                },
+                timeout=timeouts['cubes'], cpu_bound=True
+            ))
+
+        # Entropie Spirale Simple (peut interroger la météo : exécutée dans un thread)
         if use_spiral_simple:
-            spiral_simple_frames = get_spiral_entropy(
-                config=config,
-                steps=spiral_simple_steps,
-                radius=spiral_simple_radius,
-                height=spiral_simple_height,
-                use_weather=use_weather,
-                use_quantum=use_quantum,
-                get_area_weather_data=get_area_weather_data,
-                combine_weather_data=combine_weather_data,
-                get_entropy_data=lambda: 0.5
-            )
-            if spiral_simple_frames:
-                seed_string_parts.append(json.dumps(spiral_simple_frames, sort_keys=True))
-            else:
-                logger.warning("Aucune entropie de spirale simple générée.")
+            sources.append(EntropySource(
+                'spiral_simple', _spiral_simple_seed_part,
+                kwargs={
+                    'config': config,
+                    'steps': spiral_simple_steps,
+                    'radius': spiral_simple_radius,
+                    'height': spiral_simple_height,
+                    'use_weather': use_weather,
+                    'use_quantum': use_quantum,
+                    'get_area_weather_data': get_area_weather_data,
+                    'combine_weather_data': combine_weather_data
+                },
+                timeout=timeouts['spiral_simple']
+            ))
 
         # Entropie Spirale Toroïdale
         if use_spiral_torus:
-            spiral_torus_entropy_bytes = get_spiral_torus_entropy(
-                R=spiral_torus_R,
-                r=spiral_torus_r,
-                n_turns=spiral_torus_n_turns,
-                n_points=spiral_torus_n_points
-            )
-            if spiral_torus_entropy_bytes:
-                seed_string_parts.append(spiral_torus_entropy_bytes.hex())
-            else:
-                logger.warning("Aucune entropie de la spirale toroïdale générée.")
+            sources.append(EntropySource(
+                'spiral_torus', _spiral_torus_seed_part,
+                kwargs={
+                    'R': spiral_torus_R,
+                    'r': spiral_torus_r,
+                    'n_turns': spiral_torus_n_turns,
+                    'n_points': spiral_torus_n_points
+                },
+                timeout=timeouts['spiral_torus'], cpu_bound=True
+            ))
+
+        # Chaque contribution est hachée dès sa réception (ordre d'achèvement),
+        # étiquetée par le nom de sa source et préfixée par sa longueur
+        accumulator = SeedAccumulator()
+        accumulator.add('time_ns', struct.pack("<Q", time.time_ns()))
+
+        def on_result(name: str, value: Any) -> None:
+            accumulator.add(name, value)
+            seed_source_monitor.observe(name, value)
+
+        results = (collector or get_default_collector()).collect(sources, on_result=on_result)
 
         # Vérification des sources d'entropie
-        if len(seed_string_parts) == 1 and seed_string_parts[0] == str(time.time_ns()):
+        if not results:
             logger.error("Aucune source d'entropie (hors timestamp) n'a contribué.")
             return None
 
-        seed_string = "".join(seed_string_parts)
-        
-        # Hachage final
-        if BLAKE3_AVAILABLE:
-            seed = blake3.blake3(seed_string.encode()).digest(length)
-        else:
-            logger.warning("BLAKE3 non disponible, fallback vers SHA3-512.")
-            seed = hashlib.sha3_512(seed_string.encode()).digest()[:length]
+        seed = accumulator.digest(length)
+        SEED_HEALTH.observe_sample(seed)
 
-        logger.info("Entropie finale générée avec succès.")
+        logger.info(f"Entropie finale générée avec succès ({len(results)}/{len(sources)} sources).")
         return seed
     except Exception as e:
         logger.error(f"Erreur inattendue dans generate_quantum_geometric_entropy: {e}", exc_info=True)
@@ -323,8 +386,12 @@ def get_final_entropy(
         if not seed:
             raise ValueError("Échec de la génération de l'entropie")
         if hash_algo == 'blake3' and BLAKE3_AVAILABLE:
-            return blake3.blake3(seed).digest()
-        return hashlib.sha3_512(seed).digest()[:32]
+            final_seed = blake3.blake3(seed).digest()
+        else:
+            final_seed = hashlib.sha3_512(seed).digest()[:32]
     except Exception as e:
         logger.error(f"Erreur dans get_final_entropy: {e}", exc_info=True)
-        return hashlib.sha3_512(b"fallback_seed").digest()[:32]
\ No newline at end of file
+        final_seed = hashlib.sha3_512(b"fallback_seed").digest()[:32]
+    # Une graine de repli constante se répète d'un appel à l'autre : détectée ici
+    FINAL_SEED_HEALTH.observe_sample(final_seed)
+    return final_seed
\ No newline at end of file
@@ -0,0 +1,157 @@
+import struct
+import hashlib
+import logging
+from typing import Iterable, Tuple, Union
+
+import numpy as np
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+logger = logging.getLogger("entropy_signature")
+
+# Format binaire canonique des signatures (version 1), tout en little-endian :
+#
+#   en-tête : b"OESG" | version (u8) | len(domaine) (u16) | domaine (UTF-8)
+#   champ   : len(label) (u16) | label (UTF-8) | type (1 octet ASCII)
+#             | ndim (u8) | ndim × dimension (u32) | données
+#
+# Types : b"d" float64, b"i" int32, b"q" int64, b"b" octets bruts (ndim = 1, dimension = longueur).
+# Les tableaux sont convertis en C-order little-endian avant hachage : une même géométrie
+# donne la même signature quelle que soit la plateforme ou la disposition mémoire d'origine.
+SIGNATURE_MAGIC = b"OESG"
+SIGNATURE_VERSION = 1
+
+_DTYPE_CODES = {
+    np.dtype("<f8"): b"d",
+    np.dtype("<i4"): b"i",
+    np.dtype("<i8"): b"q",
+}
+
+ArrayLike = Union[np.ndarray, Iterable[float], float, int]
+
+
+def _encode_label(label: str) -> bytes:
+    encoded = label.encode("utf-8")
+    if len(encoded) > 0xFFFF:
+        raise ValueError(f"Label de signature trop long : {len(encoded)} octets")
+    return struct.pack("<H", len(encoded)) + encoded
+
+
+def _new_hasher(algorithm: str, digest_size: int):
+    if algorithm == "blake3":
+        if BLAKE3_AVAILABLE:
+            return blake3.blake3()
+        logger.warning("BLAKE3 non disponible, fallback vers BLAKE2b.")
+    elif algorithm != "blake2b":
+        raise ValueError(f"Algorithme de signature inconnu : {algorithm}")
+    return hashlib.blake2b(digest_size=digest_size)
+
+
+class SignatureHasher:
+    """
+    Hachage incrémental de signatures géométriques au format binaire canonique.
+    Les tampons numpy sont transmis directement au haché (memoryview), sans
+    conversion en liste ni en chaîne.
+
+    Args:
+        domain (str): Séparation de domaine (ex. "cubes", "spiral_torus").
+        digest_size (int): Taille de l'empreinte en octets (1..64 pour BLAKE2b).
+        algorithm (str): "blake2b" (défaut, bibliothèque standard) ou "blake3".
+    """
+    def __init__(self, domain: str, digest_size: int = 32, algorithm: str = "blake2b"):
+        self.domain = domain
+        self.digest_size = digest_size
+        self._hasher = _new_hasher(algorithm, digest_size)
+        self._xof = not isinstance(self._hasher, type(hashlib.blake2b()))
+        self._hasher.update(SIGNATURE_MAGIC + struct.pack("<B", SIGNATURE_VERSION) + _encode_label(domain))
+
+    def _update_field(self, label: str, code: bytes, shape: Tuple[int, ...], data) -> None:
+        header = _encode_label(label) + code + struct.pack(f"<B{len(shape)}I", len(shape), *shape)
+        self._hasher.update(header)
+        self._hasher.update(data)
+
+    def update_array(self, label: str, values: ArrayLike, dtype: str = "<f8") -> "SignatureHasher":
+        """Ajoute un tableau (converti en float64 par défaut, ou "<i4"/"<i8")."""
+        dtype = np.dtype(dtype)
+        if dtype not in _DTYPE_CODES:
+            raise ValueError(f"Type de tableau non supporté pour une signature : {dtype}")
+        array = np.ascontiguousarray(values, dtype=dtype)
+        self._update_field(label, _DTYPE_CODES[dtype], array.shape, memoryview(array).cast("B"))
+        return self
+
+    def update_scalar(self, label: str, value: float) -> "SignatureHasher":
+        """Ajoute un scalaire flottant (float64)."""
+        return self.update_array(label, np.float64(value))
+
+    def update_bytes(self, label: str, data: bytes) -> "SignatureHasher":
+        """Ajoute des octets bruts."""
+        self._update_field(label, b"b", (len(data),), data)
+        return self
+
+    def digest(self) -> bytes:
+        if self._xof:
+            return self._hasher.digest(length=self.digest_size)
+        return self._hasher.digest()
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+
+def array_signature(
+    domain: str,
+    fields: Iterable[Tuple[str, ArrayLike]],
+    digest_size: int = 32,
+    algorithm: str = "blake2b"
+) -> bytes:
+    """Signature d'une suite ordonnée de champs (label, tableau float64)."""
+    hasher = SignatureHasher(domain, digest_size=digest_size, algorithm=algorithm)
+    for label, values in fields:
+        hasher.update_array(label, values)
+    return hasher.digest()
+
+
+class SeedAccumulator:
+    """
+    Assemblage en flux de la graine finale : chaque contribution est hachée dès qu'elle
+    est produite, sans chaîne intermédiaire.
+
+    Format (little-endian) : b"OESD" | version (u8) | len(domaine) (u16) | domaine,
+    puis pour chaque contribution : len(label) (u16) | label | len(données) (u64) | données.
+    Le label et la longueur séparent les domaines : deux découpages différents des
+    mêmes octets ne peuvent pas produire la même graine.
+
+    Args:
+        domain (str): Séparation de domaine de la graine.
+        algorithm (str): "blake3" (défaut) ou "sha3" (SHA3-512, longueur ≤ 64).
+    """
+    def __init__(self, domain: str = "oracle-seed", algorithm: str = "blake3"):
+        if algorithm == "blake3" and not BLAKE3_AVAILABLE:
+            logger.warning("BLAKE3 non disponible, fallback vers SHA3-512.")
+            algorithm = "sha3"
+        if algorithm not in ("blake3", "sha3"):
+            raise ValueError(f"Algorithme de graine inconnu : {algorithm}")
+        self.algorithm = algorithm
+        self._hasher = blake3.blake3() if algorithm == "blake3" else hashlib.sha3_512()
+        self._hasher.update(b"OESD" + struct.pack("<B", SIGNATURE_VERSION) + _encode_label(domain))
+        self.labels = []
+
+    def add(self, label: str, value: Union[bytes, bytearray, memoryview, str, np.ndarray]) -> None:
+        """Ajoute une contribution (octets, chaîne UTF-8 ou tableau numpy)."""
+        if isinstance(value, str):
+            data = memoryview(value.encode("utf-8"))
+        elif isinstance(value, np.ndarray):
+            data = memoryview(np.ascontiguousarray(value)).cast("B")
+        else:
+            data = memoryview(value).cast("B")
+        self._hasher.update(_encode_label(label) + struct.pack("<Q", data.nbytes))
+        self._hasher.update(data)
+        self.labels.append(label)
+
+    def digest(self, length: int = 32) -> bytes:
+        if self.algorithm == "blake3":
+            return self._hasher.digest(length)
+        return self._hasher.digest()[:length]
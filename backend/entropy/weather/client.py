@@ -0,0 +1,285 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.startup import lazy_import
+
+# requests n'est chargé qu'à la création du premier client
+requests = lazy_import("requests")
+HTTPAdapter = lazy_import("requests.adapters", "HTTPAdapter")
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+logger = logging.getLogger("weather_client")
+
+OPEN_METEO_API_URL = os.getenv("OPEN_METEO_API_URL", "https://api.open-meteo.com/v1/forecast")
+# Les valeurs horaires Open-Meteo évoluent lentement : une réponse reste fraîche 10 minutes
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+# Au-delà du TTL et jusqu'à cette limite, la valeur est servie pendant un rafraîchissement en arrière-plan
+WEATHER_CACHE_STALE_TTL = float(os.getenv("WEATHER_CACHE_STALE_TTL", "3600"))
+WEATHER_REQUEST_TIMEOUT = float(os.getenv("WEATHER_REQUEST_TIMEOUT", "5"))
+WEATHER_MAX_WORKERS = int(os.getenv("WEATHER_MAX_WORKERS", "8"))
+WEATHER_BREAKER_THRESHOLD = int(os.getenv("WEATHER_BREAKER_THRESHOLD", "5"))
+WEATHER_BREAKER_RESET_TIMEOUT = float(os.getenv("WEATHER_BREAKER_RESET_TIMEOUT", "30"))
+
+
+def parse_open_meteo_response(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extrait les grandeurs utiles d'une réponse Open-Meteo (heure courante)."""
+    weather = data.get("current_weather", {})
+    hourly = data.get("hourly", {})
+    idx = 0  # premier index horaire (heure courante)
+    return {
+        "temperature": weather.get("temperature"),
+        "humidity": hourly.get("relative_humidity_2m", [None])[idx],
+        "pressure": hourly.get("pressure_msl", [None])[idx],
+        "wind_speed": weather.get("windspeed"),
+        "wind_gust": hourly.get("windgusts_10m", [None])[idx],
+        "clouds": hourly.get("cloudcover", [None])[idx],
+        "precipitation": hourly.get("precipitation", [None])[idx]
+    }
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur simple : après failure_threshold échecs consécutifs, les appels sont
+    refusés pendant reset_timeout secondes, puis un appel d'essai est autorisé (demi-ouvert).
+    """
+    def __init__(self, failure_threshold: int = WEATHER_BREAKER_THRESHOLD, reset_timeout: float = WEATHER_BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Disjoncteur météo ouvert après {self._failures} échecs consécutifs.")
+                self._opened_at = time.monotonic()
+
+
+class WeatherClient:
+    """
+    Client Open-Meteo partagé : session HTTP keep-alive, interrogation concurrente des
+    coordonnées, cache TTL par coordonnée avec stale-while-revalidate et disjoncteur.
+    """
+    def __init__(
+        self,
+        base_url: str = OPEN_METEO_API_URL,
+        timeout: float = WEATHER_REQUEST_TIMEOUT,
+        ttl: float = WEATHER_CACHE_TTL,
+        stale_ttl: float = WEATHER_CACHE_STALE_TTL,
+        max_workers: int = WEATHER_MAX_WORKERS,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather")
+
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[float, float], Tuple[float, Dict[str, Any]]] = {}
+        self._refreshing: set = set()
+        # Requêtes asynchrones en vol (utilisées uniquement depuis la boucle d'événements)
+        self._inflight: Dict[Tuple[float, float], "asyncio.Future"] = {}
+
+    def _build_url(self, lat: float, lon: float) -> str:
+        return (
+            f"{self.base_url}?"
+            f"latitude={lat}&longitude={lon}"
+            "&current_weather=true"
+            "&hourly=temperature_2m,relative_humidity_2m,pressure_msl,cloudcover,precipitation,windgusts_10m"
+            "&forecast_days=1"
+            "&timezone=auto"
+        )
+
+    def _fetch(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """Interroge Open-Meteo (sans cache) en respectant le disjoncteur."""
+        if not self.breaker.allow():
+            logger.debug(f"Disjoncteur météo ouvert, requête ignorée pour {lat}, {lon}")
+            return None
+        try:
+            response = self.session.get(self._build_url(lat, lon), timeout=self.timeout)
+            response.raise_for_status()
+            data = parse_open_meteo_response(response.json())
+        except requests.exceptions.RequestException as e:
+            self.breaker.record_failure()
+            logger.error(f"Erreur lors de la récupération des données météo pour {lat}, {lon} : {e}")
+            return None
+        except Exception as e:
+            self.breaker.record_failure()
+            logger.error(f"Erreur inattendue lors de la récupération des données météo : {e}")
+            return None
+        self.breaker.record_success()
+        self._store(lat, lon, data)
+        return data
+
+    def _revalidate(self, lat: float, lon: float) -> None:
+        try:
+            self._fetch(lat, lon)
+        finally:
+            with self._lock:
+                self._refreshing.discard((lat, lon))
+
+    def _store(self, lat: float, lon: float, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._cache[(lat, lon)] = (time.monotonic(), data)
+
+    def _cached(self, lat: float, lon: float) -> Tuple[Optional[Tuple[float, Dict[str, Any]]], Optional[Dict[str, Any]]]:
+        """
+        Consulte le cache : retourne (entrée, valeur servable). La valeur est servable si
+        elle est fraîche, ou périmée (un rafraîchissement en arrière-plan est alors lancé).
+        """
+        key = (lat, lon)
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is None:
+            return None, None
+        age = time.monotonic() - entry[0]
+        if age < self.ttl:
+            return entry, entry[1]
+        if age < self.stale_ttl:
+            with self._lock:
+                start_refresh = key not in self._refreshing
+                self._refreshing.add(key)
+            if start_refresh:
+                self._executor.submit(self._revalidate, lat, lon)
+            return entry, entry[1]
+        return entry, None
+
+    def get_current(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """Données météo d'une coordonnée : cache frais, sinon valeur périmée + rafraîchissement, sinon requête."""
+        entry, cached = self._cached(lat, lon)
+        if cached is not None:
+            return cached
+        data = self._fetch(lat, lon)
+        if data is None and entry is not None:
+            # Source indisponible : une valeur expirée vaut mieux que rien
+            return entry[1]
+        return data
+
+    def get_area(self, coordinates: List[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        """Interroge toutes les coordonnées en parallèle ; l'ordre est conservé, les échecs omis."""
+        futures = [self._executor.submit(self.get_current, lat, lon) for lat, lon in coordinates]
+        return [data for data in (future.result() for future in futures) if data]
+
+    async def _fetch_async(self, http: "httpx.AsyncClient", lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """Équivalent asynchrone de _fetch (httpx), avec le même disjoncteur et le même cache."""
+        if not self.breaker.allow():
+            logger.debug(f"Disjoncteur météo ouvert, requête ignorée pour {lat}, {lon}")
+            return None
+        try:
+            response = await http.get(self._build_url(lat, lon), timeout=self.timeout)
+            response.raise_for_status()
+            data = parse_open_meteo_response(response.json())
+        except Exception as e:
+            self.breaker.record_failure()
+            logger.error(f"Erreur lors de la récupération asynchrone des données météo pour {lat}, {lon} : {e}")
+            return None
+        self.breaker.record_success()
+        self._store(lat, lon, data)
+        return data
+
+    async def get_current_async(self, lat: float, lon: float, http: Optional["httpx.AsyncClient"] = None) -> Optional[Dict[str, Any]]:
+        """
+        Version asynchrone de get_current. Sans client httpx, la requête bloquante est
+        déléguée au pool de threads du client : la boucle d'événements n'est jamais bloquée.
+        """
+        entry, cached = self._cached(lat, lon)
+        if cached is not None:
+            return cached
+        # Une seule requête en vol par coordonnée : les appels concurrents attendent son résultat
+        key = (lat, lon)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            if http is None:
+                inflight = asyncio.get_running_loop().run_in_executor(self._executor, self._fetch, lat, lon)
+            else:
+                inflight = asyncio.ensure_future(self._fetch_async(http, lat, lon))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        data = await asyncio.shield(inflight)
+        if data is None and entry is not None:
+            return entry[1]
+        return data
+
+    async def get_area_async(self, coordinates: List[Tuple[float, float]], http: Optional["httpx.AsyncClient"] = None) -> List[Dict[str, Any]]:
+        """Version asynchrone de get_area : toutes les coordonnées sont attendues concurremment."""
+        results = await asyncio.gather(*(self.get_current_async(lat, lon, http) for lat, lon in coordinates))
+        return [data for data in results if data]
+
+    def clear(self) -> None:
+        """Vide le cache."""
+        with self._lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+_client: Optional[WeatherClient] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+def get_weather_client() -> WeatherClient:
+    """Client météo partagé du processus (recréé après un fork)."""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = WeatherClient()
+            _client_pid = os.getpid()
+        return _client
+
+
+def reset_weather_client() -> None:
+    """Oublie le client partagé (cache et disjoncteur compris)."""
+    global _client
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
@@ -1,8 +1,9 @@
-import requests
 import json
 import logging
 from typing import List, Dict, Optional, Tuple, Any
 
+from entropy.weather.client import get_weather_client
+
 # Les fonctions de logging seront gérées par le logger principal via app.py
 # et passées en paramètre ou définies localement si nécessaire.
 # Pour l'instant, on n'importe pas logger directement ici.
@@ -11,49 +12,12 @@ from typing import List, Dict, Optional, Tuple, Any
 logger = logging.getLogger("weather_data_collector")
 
 def get_current_weather_data(lat: float, lon: float) -> Optional[Dict[str, Any]]:
-    """Récupère les données météo actuelles pour une paire de coordonnées."""
-    try:
-        # Assurez-vous que l'URL est correctement formée
-        url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={lat}&longitude={lon}"
-            "&current_weather=true"  # Correction ici : &current_weather=true
-            "&hourly=temperature_2m,relative_humidity_2m,pressure_msl,cloudcover,precipitation,windgusts_10m"
-            "&forecast_days=1"
-            "&timezone=auto"
-        )
-        response = requests.get(url, timeout=5)
-        response.raise_for_status() # Lève une exception pour les codes d'erreur HTTP (4xx, 5xx)
-        data = response.json()
-        
-        weather = data.get("current_weather", {})
-        hourly = data.get("hourly", {})
-        idx = 0  # premier index horaire (heure courante)
-        
-        return {
-            "temperature": weather.get("temperature"),
-            "humidity": hourly.get("relative_humidity_2m", [None])[idx],
-            "pressure": hourly.get("pressure_msl", [None])[idx],
-            "wind_speed": weather.get("windspeed"),
-            "wind_gust": hourly.get("windgusts_10m", [None])[idx],
-            "clouds": hourly.get("cloudcover", [None])[idx],
-            "precipitation": hourly.get("precipitation", [None])[idx]
-        }
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Erreur lors de la récupération des données météo pour {lat}, {lon} : {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Erreur inattendue lors de la récupération des données météo : {e}")
-        return None
+    """Récupère les données météo actuelles pour une paire de coordonnées (via le client partagé)."""
+    return get_weather_client().get_current(lat, lon)
 
 def get_area_weather_data(coordinates: List[Tuple[float, float]]) -> List[Optional[Dict[str, Any]]]:
-    """Récupère les données météo pour une liste de coordonnées."""
-    all_data = []
-    for lat, lon in coordinates:
-        data = get_current_weather_data(lat, lon)
-        if data:
-            all_data.append(data)
-    return all_data
+    """Récupère les données météo pour une liste de coordonnées, en parallèle et avec cache."""
+    return get_weather_client().get_area(coordinates)
 
 def combine_weather_data(all_data: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
     """Combine les données météo de plusieurs points."""
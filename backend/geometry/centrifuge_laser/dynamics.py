@@ -1,10 +1,100 @@
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 import time
 
 logger = logging.getLogger(__name__)
 
+
+class CentrifugeLaserSystem:
+    """
+    Centrifugeuse laser en forme close : les positions sont une fonction pure du temps
+    et des constantes de chaque corps (initial_angle, inertia_delay), stockées en tableaux.
+    evaluate(times) calcule toute une chronologie (T, N, 3) en une seule évaluation
+    vectorisée (sphères puis cubes sur l'axe N).
+    """
+    def __init__(
+        self,
+        sphere_angles: np.ndarray,
+        sphere_delays: np.ndarray,
+        cube_angles: np.ndarray,
+        cube_delays: np.ndarray,
+        pulse_frequency: float = 0.005,
+        rotation_speed: float = 0.02
+    ):
+        self.sphere_angles = np.array(sphere_angles, dtype=np.float64).reshape(-1)
+        self.sphere_delays = np.array(sphere_delays, dtype=np.float64).reshape(-1)
+        self.cube_angles = np.array(cube_angles, dtype=np.float64).reshape(-1)
+        self.cube_delays = np.array(cube_delays, dtype=np.float64).reshape(-1)
+        self.pulse_frequency = float(pulse_frequency)
+        self.rotation_speed = float(rotation_speed)
+
+    @property
+    def num_spheres(self) -> int:
+        return self.sphere_angles.shape[0]
+
+    @property
+    def num_cubes(self) -> int:
+        return self.cube_angles.shape[0]
+
+    @classmethod
+    def from_dict(cls, system_data: Dict[str, Any], rotation_speed: float = 0.02) -> "CentrifugeLaserSystem":
+        spheres = system_data.get("spheres", [])
+        cubes = system_data.get("cubes", [])
+        return cls(
+            sphere_angles=[sphere["initial_angle"] for sphere in spheres],
+            sphere_delays=[sphere["inertia_delay"] for sphere in spheres],
+            cube_angles=[cube["initial_angle"] for cube in cubes],
+            cube_delays=[cube["inertia_delay"] for cube in cubes],
+            pulse_frequency=system_data["laser_center"]["pulse_frequency"],
+            rotation_speed=rotation_speed
+        )
+
+    def evaluate(self, times) -> Dict[str, np.ndarray]:
+        """
+        État de la centrifugeuse aux instants times (secondes, tableau (T,)) :
+        positions (T, N, 3), laser_intensity (T,), laser_color (T, 3),
+        arm_top_rotation et arm_bottom_rotation (T,).
+        """
+        t = np.asarray(times, dtype=np.float64).reshape(-1)
+        rotation = t * self.rotation_speed
+        pulse = (np.sin(t * self.pulse_frequency) + 1) / 2
+        hue = (t * 0.001) % 1
+
+        # Sphères : effet centrifuge + voile, rotation retardée par l'inertie
+        delayed = rotation[:, None] * self.sphere_delays[None, :]
+        angle = self.sphere_angles[None, :] + delayed
+        radius = 5 + np.cos(angle * 2) * 1.5 + pulse[:, None] * 0.5
+        spheres = np.stack((
+            np.cos(angle * 1.5) * (2 + pulse[:, None] * 0.3),
+            radius * np.sin(angle) + np.sin(delayed * 3) * 0.8,
+            np.cos(angle * 3) * 1.5
+        ), axis=-1)
+
+        # Cubes : rotation en opposition de phase, effet centrifuge horizontal
+        delayed = -rotation[:, None] * self.cube_delays[None, :]
+        angle = self.cube_angles[None, :] + delayed
+        radius = 6 + np.sin(angle * 3) * 2 + pulse[:, None] * 0.8
+        cubes = np.stack((
+            radius * np.cos(angle),
+            np.sin(angle * 2) * 1.5 + np.cos(delayed * 2) * 0.5,
+            np.sin(angle * 4) * 1
+        ), axis=-1)
+
+        return {
+            "positions": np.concatenate((spheres, cubes), axis=1),
+            "laser_intensity": 0.5 + pulse * 1.5,
+            "laser_color": 0.5 + 0.5 * np.sin((hue[:, None] + np.array([0.0, 0.33, 0.66])) * 2 * np.pi),
+            "arm_top_rotation": rotation,
+            "arm_bottom_rotation": rotation * 0.7  # Vitesse différente
+        }
+
+    def timeline(self, steps: int, delta_time: float = 0.016, start_time: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Chronologie de steps frames espacées de delta_time à partir de start_time (maintenant par défaut)."""
+        start = time.time() if start_time is None else start_time
+        return self.evaluate(start + np.arange(steps) * delta_time)
+
+
 def update_centrifuge_laser_dynamics(
     system_data: Dict[str, Any],
     delta_time: float = 0.016,
@@ -12,58 +102,20 @@ def update_centrifuge_laser_dynamics(
 ) -> Dict[str, Any]:
     """Met à jour la dynamique de la centrifugeuse laser."""
     try:
-        current_time = time.time()
-        
-        # Rotation de la centrifugeuse
-        centrifuge_rotation = current_time * rotation_speed
-        
-        # Pulse laser
-        pulse = (np.sin(current_time * system_data["laser_center"]["pulse_frequency"]) + 1) / 2
-        system_data["laser_center"]["intensity"] = 0.5 + pulse * 1.5
-        
-        # Couleur laser changeante
-        hue = (current_time * 0.001) % 1
-        system_data["laser_center"]["color"] = [
-            0.5 + 0.5 * np.sin(hue * 2 * np.pi),
-            0.5 + 0.5 * np.sin((hue + 0.33) * 2 * np.pi),
-            0.5 + 0.5 * np.sin((hue + 0.66) * 2 * np.pi)
-        ]
-        
-        # Rotation des tiges
-        system_data["arm_top"]["rotation"] = centrifuge_rotation
-        system_data["arm_bottom"]["rotation"] = centrifuge_rotation * 0.7  # Vitesse différente
-        
-        # Mouvement des sphères (effet voile avec inertie)
-        for sphere in system_data["spheres"]:
-            delayed_rotation = centrifuge_rotation * sphere["inertia_delay"]
-            angle = sphere["initial_angle"] + delayed_rotation
-            
-            # Effet centrifuge + voile
-            radius = 5 + np.cos(angle * 2) * 1.5 + pulse * 0.5
-            height = radius * np.sin(angle) + np.sin(delayed_rotation * 3) * 0.8
-            
-            sphere["position"] = [
-                np.cos(angle * 1.5) * (2 + pulse * 0.3),
-                height,
-                np.cos(angle * 3) * 1.5
-            ]
-        
-        # Mouvement des cubes (opposition de phase)
-        for cube in system_data["cubes"]:
-            delayed_rotation = -centrifuge_rotation * cube["inertia_delay"]  # Opposition
-            angle = cube["initial_angle"] + delayed_rotation
-            
-            # Effet centrifuge horizontal
-            radius = 6 + np.sin(angle * 3) * 2 + pulse * 0.8
-            
-            cube["position"] = [
-                radius * np.cos(angle),
-                np.sin(angle * 2) * 1.5 + np.cos(delayed_rotation * 2) * 0.5,
-                np.sin(angle * 4) * 1
-            ]
-        
+        engine = CentrifugeLaserSystem.from_dict(system_data, rotation_speed=rotation_speed)
+        state = engine.evaluate([time.time()])
+
+        system_data["laser_center"]["intensity"] = float(state["laser_intensity"][0])
+        system_data["laser_center"]["color"] = state["laser_color"][0].tolist()
+        system_data["arm_top"]["rotation"] = float(state["arm_top_rotation"][0])
+        system_data["arm_bottom"]["rotation"] = float(state["arm_bottom_rotation"][0])
+
+        positions = state["positions"][0].tolist()
+        for body, position in zip(system_data["spheres"] + system_data["cubes"], positions):
+            body["position"] = position
+
         return system_data
-        
+
     except Exception as e:
         logger.error(f"Erreur dynamique centrifuge laser: {e}")
         return system_data
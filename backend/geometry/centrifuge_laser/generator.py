@@ -38,53 +38,49 @@ def generate_centrifuge_laser_system(
             "type": "horizontal"
         }
         
-        # Sphères avec positions initiales
-        spheres = []
-        for i in range(num_spheres):
-            angle = (i / num_spheres) * 2 * np.pi
-            radius = 5 + np.cos(angle * 2) * 1.5
-            
-            spheres.append({
+        # Sphères avec positions initiales (angles répartis sur le cercle)
+        index = np.arange(num_spheres)
+        angles = index / num_spheres * 2 * np.pi
+        radius = 5 + np.cos(angles * 2) * 1.5
+        positions = np.column_stack((np.cos(angles * 1.5) * 2, radius * np.sin(angles), np.cos(angles * 3) * 1.5))
+        colors = np.column_stack((0.3 + 0.7 * np.sin(index * 0.5), 0.3 + 0.7 * np.cos(index * 0.7), np.full(num_spheres, 0.8)))
+        delays = np.random.uniform(0.3, 0.8, num_spheres)
+        spheres = [
+            {
                 "id": i,
-                "position": [
-                    np.cos(angle * 1.5) * 2,
-                    radius * np.sin(angle),
-                    np.cos(angle * 3) * 1.5
-                ],
+                "position": position,
                 "velocity": [0, 0, 0],
                 "radius": 0.5,
-                "color": [
-                    0.3 + 0.7 * np.sin(i * 0.5),
-                    0.3 + 0.7 * np.cos(i * 0.7),
-                    0.8
-                ],
+                "color": color,
                 "initial_angle": angle,
-                "inertia_delay": np.random.uniform(0.3, 0.8)
-            })
-        
+                "inertia_delay": delay
+            }
+            for i, position, color, angle, delay in zip(
+                index.tolist(), positions.tolist(), colors.tolist(), angles.tolist(), delays.tolist()
+            )
+        ]
+
         # Cubes avec positions initiales
-        cubes = []
-        for i in range(num_cubes):
-            angle = (i / num_cubes) * 2 * np.pi
-            radius = 6 + np.sin(angle * 3) * 2
-            
-            cubes.append({
+        index = np.arange(num_cubes)
+        angles = index / num_cubes * 2 * np.pi
+        radius = 6 + np.sin(angles * 3) * 2
+        positions = np.column_stack((radius * np.cos(angles), np.sin(angles * 2) * 1.5, np.sin(angles * 4) * 1))
+        colors = np.column_stack((np.full(num_cubes, 0.8), 0.3 + 0.7 * np.sin(index * 0.3), 0.3 + 0.7 * np.cos(index * 0.4)))
+        delays = np.random.uniform(0.3, 0.8, num_cubes)
+        cubes = [
+            {
                 "id": i,
-                "position": [
-                    radius * np.cos(angle),
-                    np.sin(angle * 2) * 1.5,
-                    np.sin(angle * 4) * 1
-                ],
+                "position": position,
                 "velocity": [0, 0, 0],
                 "size": 0.6,
-                "color": [
-                    0.8,
-                    0.3 + 0.7 * np.sin(i * 0.3),
-                    0.3 + 0.7 * np.cos(i * 0.4)
-                ],
+                "color": color,
                 "initial_angle": angle,
-                "inertia_delay": np.random.uniform(0.3, 0.8)
-            })
+                "inertia_delay": delay
+            }
+            for i, position, color, angle, delay in zip(
+                index.tolist(), positions.tolist(), colors.tolist(), angles.tolist(), delays.tolist()
+            )
+        ]
         
         return {
             "type": "centrifuge_laser_system",
@@ -3,6 +3,7 @@ import secrets
 import time
 import random  # CORRECTION: Utiliser random au lieu de core.utils.utils
 import logging
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +14,13 @@ def get_entropy_data():
 class CentrifugeLaserV2Generator:
     """Générateur révolutionnaire pour Centrifugeuse Laser 2.0 avec collisions physiques."""
 
-    def __init__(self):
+    def __init__(self, sphere_count: int = 8, cube_count: int = 6):
         self.system_random = secrets.SystemRandom()
+        # Tirages vectorisés (perturbations des sphères) : générateur ensemencé par le système
+        self.rng = np.random.default_rng(secrets.randbits(128))
+        self.sphere_count = sphere_count
+        self.cube_count = cube_count
+        self.frame_count = 0
 
         # CORRECTION: Utiliser float64 dès l'initialisation
         self.core_size_base = 0.4
@@ -32,11 +38,15 @@ class CentrifugeLaserV2Generator:
         self.explosion_intensity = 0.0
         self.last_collision_time = 0.0
 
-    def generate_centrifuge_v2_data(self) -> dict:
-        """Génère les données pour la Centrifugeuse Laser 2.0."""
+    def generate_centrifuge_v2_data(self, current_time: Optional[float] = None) -> dict:
+        """
+        Avance la simulation d'une frame (mouvement de la tige 6H, collisions, oscillation
+        du satellite) et renvoie son état. L'état persiste d'un appel à l'autre.
+        """
         try:
             entropy = get_entropy_data()
-            current_time = time.time()
+            current_time = time.time() if current_time is None else current_time
+            self.frame_count += 1
 
             # 1. NOYAU VARIABLE ALÉATOIRE
             core_size = self.core_size_base + (
@@ -107,64 +117,9 @@ class CentrifugeLaserV2Generator:
             ], dtype=np.float64)
             self.satellite_centrifuge_position = self.arm_6h_position + satellite_offset
 
-            # 5. GÉNÉRATION DES SPHÈRES ET CUBES AVEC ENTROPIE MAXIMALE
-            spheres = []
-            cubes = []
-
-            # Sphères autour de la tige 12H (affectées par les collisions)
-            sphere_count = 8
-            for i in range(sphere_count):
-                angle = (i / sphere_count) * 2 * np.pi + current_time * 0.5
-                radius = 3 + np.sin(current_time * 2 + i) * 0.5
-
-                # Perturbation lors des explosions
-                if self.collision_active:
-                    radius += self.explosion_intensity * self.system_random.uniform(0, 2)
-                    angle += self.explosion_intensity * self.system_random.uniform(-0.5, 0.5)
-
-                sphere_pos = [
-                    float(np.cos(angle) * radius),
-                    float(8 + np.sin(angle * 2) * 2),
-                    float(np.sin(angle) * radius)
-                ]
-
-                # Couleur influencée par l'explosion
-                explosion_factor = self.explosion_intensity if self.collision_active else 0
-                sphere_color = [
-                    0.3 + explosion_factor * 0.7,
-                    0.5 - explosion_factor * 0.3,
-                    0.8 - explosion_factor * 0.6
-                ]
-
-                spheres.append({
-                    "position": sphere_pos,
-                    "color": sphere_color,
-                    "radius": 0.4 + explosion_factor * 0.3
-                })
-
-            # Cubes autour de la tige 6H mobile
-            cube_count = 6
-            for i in range(cube_count):
-                angle = (i / cube_count) * 2 * np.pi + current_time * 0.3
-                radius = 4
-
-                cube_pos = [
-                    self.arm_6h_position[0] + np.cos(angle) * radius,
-                    self.arm_6h_position[1] + np.sin(angle) * radius,
-                    self.arm_6h_position[2] + np.cos(angle * 1.5) * radius * 0.5
-                ]
-
-                cube_color = [
-                    0.8 - i * 0.1,
-                    0.4 + i * 0.1,
-                    0.6 + np.sin(current_time + i) * 0.2
-                ]
-
-                cubes.append({
-                    "position": cube_pos,
-                    "color": cube_color,
-                    "size": 0.6
-                })
+            # 5. GÉNÉRATION DES SPHÈRES ET CUBES AVEC ENTROPIE MAXIMALE (placement vectorisé)
+            spheres = self._place_spheres(current_time)
+            cubes = self._place_cubes(current_time)
 
             return {
                 "type": "centrifuge_laser_v2",
@@ -197,13 +152,69 @@ class CentrifugeLaserV2Generator:
                 "spheres": spheres,
                 "cubes": cubes,
                 "entropy_quality": entropy,
-                "timestamp": current_time
+                "timestamp": current_time,
+                "frame": self.frame_count
             }
 
         except Exception as e:
             logger.error(f"Erreur génération Centrifugeuse Laser V2: {e}")
             return {"error": str(e)}
 
+    def _place_spheres(self, current_time: float) -> List[dict]:
+        """Sphères autour de la tige 12H (affectées par les collisions)."""
+        index = np.arange(self.sphere_count)
+        angles = index / self.sphere_count * 2 * np.pi + current_time * 0.5
+        radii = 3 + np.sin(current_time * 2 + index) * 0.5
+
+        # Perturbation lors des explosions
+        if self.collision_active:
+            radii = radii + self.explosion_intensity * self.rng.uniform(0, 2, self.sphere_count)
+            angles = angles + self.explosion_intensity * self.rng.uniform(-0.5, 0.5, self.sphere_count)
+
+        positions = np.column_stack((np.cos(angles) * radii, 8 + np.sin(angles * 2) * 2, np.sin(angles) * radii))
+
+        # Couleur influencée par l'explosion (commune à toutes les sphères)
+        explosion_factor = self.explosion_intensity if self.collision_active else 0
+        color = [
+            0.3 + explosion_factor * 0.7,
+            0.5 - explosion_factor * 0.3,
+            0.8 - explosion_factor * 0.6
+        ]
+        radius = 0.4 + explosion_factor * 0.3
+        return [{"position": position, "color": list(color), "radius": radius} for position in positions.tolist()]
+
+    def _place_cubes(self, current_time: float) -> List[dict]:
+        """Cubes autour de la tige 6H mobile."""
+        index = np.arange(self.cube_count)
+        angles = index / self.cube_count * 2 * np.pi + current_time * 0.3
+        radius = 4
+        positions = self.arm_6h_position + np.column_stack((
+            np.cos(angles) * radius,
+            np.sin(angles) * radius,
+            np.cos(angles * 1.5) * radius * 0.5
+        ))
+        colors = np.column_stack((0.8 - index * 0.1, 0.4 + index * 0.1, 0.6 + np.sin(current_time + index) * 0.2))
+        return [
+            {"position": position, "color": color, "size": 0.6}
+            for position, color in zip(positions.tolist(), colors.tolist())
+        ]
+
+    def advance(self, frames: int = 1) -> List[dict]:
+        """Avance la simulation de frames frames consécutives (horloge murale)."""
+        return [self.generate_centrifuge_v2_data() for _ in range(frames)]
+
+    def __getstate__(self) -> dict:
+        # L'état physique seul : les sources aléatoires sont réensemencées au chargement
+        state = self.__dict__.copy()
+        del state["system_random"], state["rng"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.system_random = secrets.SystemRandom()
+        self.rng = np.random.default_rng(secrets.randbits(128))
+
+
 def generate_centrifuge_laser_v2_data() -> dict:
     """Interface principale pour génération Centrifugeuse Laser 2.0."""
     generator = CentrifugeLaserV2Generator()
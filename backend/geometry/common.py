@@ -1,6 +1,7 @@
 # backend/geometry/common.py
 
 import numpy as np
+from scipy import sparse
 from typing import Tuple, Optional, List, Set, Dict
 from math import sqrt
 
@@ -27,55 +28,56 @@ def rotation_matrix(axis: np.ndarray, theta: float) -> np.ndarray:
 
 def subdivide_faces(
     vertices: np.ndarray,
-    faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    faces: np.ndarray,
+    project_to_sphere: bool = True,
+    sphere_radius: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
     """
     Effectue une subdivision simple topologique d'un maillage triangulaire.
     Chaque triangle est remplacé par 4 nouveaux triangles, créant des sommets au milieu des arêtes.
-    Les nouveaux sommets sont projetés sur une sphère (utile pour les formes sphériques comme l'icosaèdre).
+    Les arêtes partagées sont dédupliquées (tri + np.unique sur les paires de sommets) : un niveau
+    ajoute exactement un sommet par arête, en O(F log F) entièrement vectorisé.
 
     Args:
         vertices (np.ndarray): Tableau (N, 3) des sommets actuels.
         faces (np.ndarray): Tableau (M, 3) des faces (triangles) actuelles.
+        project_to_sphere (bool): Projette les nouveaux sommets sur la sphère centrée à l'origine
+            (utile pour les formes sphériques comme l'icosaèdre).
+        sphere_radius (float): Rayon de la sphère de projection.
 
     Returns:
-        Tuple[np.ndarray, np.ndarray]: Nouveaux sommets et nouvelles faces après subdivision.
+        Tuple[np.ndarray, np.ndarray]: Nouveaux sommets (N + E, 3) et nouvelles faces (4M, 3).
     """
-    midpoint_cache = {} # Cache pour stocker les nouveaux sommets d'arête déjà calculés
-    new_vertices_list = list(vertices) # Copie des sommets existants, les nouveaux seront ajoutés ici
-    new_faces_list = [] # Liste pour les nouvelles faces
-
-    def get_or_create_midpoint(i1: int, i2: int) -> int:
-        """
-        Calcule ou récupère l'indice d'un point médian sur une arête.
-        Projette le point médian sur la sphère unité.
-        """
-        key = tuple(sorted((i1, i2))) # Utilise un tuple trié pour la clé de cache (arête v1-v2 est la même que v2-v1)
-        if key not in midpoint_cache:
-            mid = (new_vertices_list[i1] + new_vertices_list[i2]) / 2.0
-            mid_norm = np.linalg.norm(mid)
-            # Projection sur sphère unité (si norme non nulle)
-            mid /= mid_norm if mid_norm != 0 else 1.0 
-            midpoint_cache[key] = len(new_vertices_list) # L'indice du nouveau sommet
-            new_vertices_list.append(mid)
-        return midpoint_cache[key]
-
-    # Parcourir chaque face (triangle)
-    for tri in faces:
-        v1, v2, v3 = tri # Indices des trois sommets du triangle
-
-        # Calculer ou créer les points médians des trois arêtes du triangle
-        m12 = get_or_create_midpoint(v1, v2)
-        m23 = get_or_create_midpoint(v2, v3)
-        m31 = get_or_create_midpoint(v3, v1)
-
-        # Créer les 4 nouveaux triangles à partir du triangle original
-        new_faces_list.append([v1, m12, m31]) # Coin supérieur
-        new_faces_list.append([v2, m23, m12]) # Coin gauche
-        new_faces_list.append([v3, m31, m23]) # Coin droit
-        new_faces_list.append([m12, m23, m31]) # Triangle central
-    
-    # Convertir les listes de sommets et de faces en tableaux NumPy pour la sortie
-    return np.array(new_vertices_list, dtype=np.float64), np.array(new_faces_list, dtype=np.int32)
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    num_vertices = len(vertices)
+
+    # Arêtes (v1,v2), (v2,v3), (v3,v1) de chaque face, orientation normalisée (min, max)
+    edges = np.stack([faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]], axis=1).reshape(-1, 2)
+    edges.sort(axis=1)
+    edge_keys = edges[:, 0] * num_vertices + edges[:, 1]
+    unique_keys, inverse = np.unique(edge_keys, return_inverse=True)
+    unique_edges = np.stack([unique_keys // num_vertices, unique_keys % num_vertices], axis=1)
+
+    # Points médians calculés en bloc, projetés sur la sphère si demandé (norme non nulle)
+    midpoints = (vertices[unique_edges[:, 0]] + vertices[unique_edges[:, 1]]) / 2.0
+    if project_to_sphere:
+        norms = np.linalg.norm(midpoints, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        midpoints *= sphere_radius / norms
+
+    midpoint_index = (inverse.reshape(-1, 3) + num_vertices)
+    v1, v2, v3 = faces[:, 0], faces[:, 1], faces[:, 2]
+    m12, m23, m31 = midpoint_index[:, 0], midpoint_index[:, 1], midpoint_index[:, 2]
+
+    # Les 4 nouveaux triangles de chaque face, consécutifs : coins puis triangle central
+    new_faces = np.stack([
+        np.stack([v1, m12, m31], axis=1),
+        np.stack([v2, m23, m12], axis=1),
+        np.stack([v3, m31, m23], axis=1),
+        np.stack([m12, m23, m31], axis=1)
+    ], axis=1).reshape(-1, 3)
+
+    return np.concatenate([vertices, midpoints]), new_faces.astype(np.int32)
 
 def compute_vertex_neighbors(faces: np.ndarray, num_vertices: int) -> List[Set[int]]:
     """
@@ -96,4 +98,25 @@ def compute_vertex_neighbors(faces: np.ndarray, num_vertices: int) -> List[Set[i
         neighbors[i].update([j, k])
         neighbors[j].update([i, k])
         neighbors[k].update([i, j])
-    return neighbors
\ No newline at end of file
+    return neighbors
+
+def build_adjacency_matrix(faces: np.ndarray, num_vertices: int) -> sparse.csr_matrix:
+    """
+    Construit la matrice d'adjacence creuse (CSR) d'un maillage triangulaire.
+    Équivalent matriciel de compute_vertex_neighbors : A[i, j] = 1 si i et j partagent une arête.
+
+    Args:
+        faces (np.ndarray): Tableau (M, 3) des indices des sommets formant les faces.
+        num_vertices (int): Nombre total de sommets dans le maillage.
+
+    Returns:
+        sparse.csr_matrix: Matrice (N, N) symétrique de 0/1.
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    rows = np.concatenate([faces[:, 0], faces[:, 1], faces[:, 1], faces[:, 2], faces[:, 2], faces[:, 0]])
+    cols = np.concatenate([faces[:, 1], faces[:, 0], faces[:, 2], faces[:, 1], faces[:, 0], faces[:, 2]])
+    adjacency = sparse.coo_matrix(
+        (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=(num_vertices, num_vertices)
+    ).tocsr()
+    adjacency.data[:] = 1.0  # Arêtes partagées par deux faces : on ne compte qu'une fois
+    return adjacency
@@ -1,8 +1,6 @@
-import time
-import random
 import numpy as np
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Les imports sont corrects si Docker est configuré avec PYTHONPATH=/usr/src/app
 # et que les modules sont dans /usr/src/app/backend/geometry/cubes/
@@ -16,6 +14,225 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Clés gérées par CubeSystem ; les autres clés des dicts d'entrée sont conservées telles quelles
+_CUBE_KEYS = {"id", "position", "size", "velocity", "angular_velocity", "rotation", "chaos_counter", "balls"}
+_BALL_KEYS = {"id", "position", "radius", "color", "velocity"}
+
+
+class CubeSystem:
+    """
+    Moteur physique cubes/billes en structure de tableaux (SoA).
+
+    Cubes : positions, velocities, rotations, angular_velocities (N, 3), sizes et chaos_counters (N,).
+    Billes : ball_positions, ball_velocities, ball_colors (N, B, 3), ball_radii (N, B).
+    Un cube peut avoir moins de B billes : ball_mask (N, B) indique les billes réelles.
+    step(n) avance n pas sans aucune conversion ; to_dicts() produit la vue JSON à la demande.
+    """
+    def __init__(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        angular_velocities: np.ndarray,
+        rotations: np.ndarray,
+        sizes: np.ndarray,
+        ball_positions: np.ndarray,
+        ball_velocities: np.ndarray,
+        ball_radii: np.ndarray,
+        ball_colors: Optional[np.ndarray] = None,
+        ball_mask: Optional[np.ndarray] = None,
+        chaos_counters: Optional[np.ndarray] = None,
+        rng: Optional[np.random.Generator] = None
+    ):
+        self.rng = rng or np.random.default_rng()
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        num_cubes = len(self.positions)
+        self.velocities = np.array(velocities, dtype=np.float64).reshape(num_cubes, 3)
+        self.angular_velocities = np.array(angular_velocities, dtype=np.float64).reshape(num_cubes, 3)
+        self.rotations = np.array(rotations, dtype=np.float64).reshape(num_cubes, 3)
+        self.sizes = np.array(sizes, dtype=np.float64).reshape(num_cubes)
+        self.ball_positions = np.array(ball_positions, dtype=np.float64).reshape(num_cubes, -1, 3)
+        num_balls = self.ball_positions.shape[1]
+        self.ball_velocities = np.array(ball_velocities, dtype=np.float64).reshape(num_cubes, num_balls, 3)
+        self.ball_radii = np.array(ball_radii, dtype=np.float64).reshape(num_cubes, num_balls)
+        self.ball_colors = (
+            np.array(ball_colors, dtype=np.float64).reshape(num_cubes, num_balls, 3)
+            if ball_colors is not None
+            else np.tile(np.array([1.0, 0.0, 0.0]), (num_cubes, num_balls, 1))
+        )
+        self.ball_mask = (
+            np.array(ball_mask, dtype=bool).reshape(num_cubes, num_balls)
+            if ball_mask is not None
+            else np.ones((num_cubes, num_balls), dtype=bool)
+        )
+        self.chaos_counters = (
+            np.array(chaos_counters, dtype=np.float64).reshape(num_cubes)
+            if chaos_counters is not None
+            else self.rng.uniform(0, 10, num_cubes)
+        )
+        self.cube_extras: List[Dict[str, Any]] = [{} for _ in range(num_cubes)]
+        self.ball_extras: List[List[Dict[str, Any]]] = [[{} for _ in range(num_balls)] for _ in range(num_cubes)]
+
+    @property
+    def num_cubes(self) -> int:
+        return len(self.positions)
+
+    @property
+    def num_balls(self) -> int:
+        return self.ball_positions.shape[1]
+
+    @classmethod
+    def generate(
+        cls,
+        num_cubes: int = 3,
+        cube_size: float = 8.0,
+        num_balls_per_cube: int = 3,
+        space_bounds: float = 30.0,
+        max_ball_velocity: float = 1.5,
+        rng: Optional[np.random.Generator] = None
+    ) -> "CubeSystem":
+        """Génère directement un système en tableaux (mêmes distributions que CubeGenerator)."""
+        rng = rng or np.random.default_rng()
+        spawn_limit = space_bounds / 2 - cube_size / 2
+        ball_radius = cube_size / 8.0
+        half_cube_limit = cube_size / 2.0 - ball_radius
+        ball_shape = (num_cubes, num_balls_per_cube, 3)
+        return cls(
+            positions=rng.uniform(-spawn_limit, spawn_limit, (num_cubes, 3)),
+            velocities=rng.uniform(-0.5, 0.5, (num_cubes, 3)),
+            angular_velocities=rng.uniform(-0.02, 0.02, (num_cubes, 3)),
+            rotations=np.zeros((num_cubes, 3)),
+            sizes=np.full(num_cubes, cube_size),
+            ball_positions=rng.uniform(-half_cube_limit, half_cube_limit, ball_shape),
+            ball_velocities=rng.uniform(-max_ball_velocity, max_ball_velocity, ball_shape),
+            ball_radii=np.full(ball_shape[:2], ball_radius),
+            rng=rng
+        )
+
+    @classmethod
+    def from_dicts(cls, cubes_system: List[Dict[str, Any]], rng: Optional[np.random.Generator] = None) -> "CubeSystem":
+        """Construit le système depuis la représentation dict (CubeGenerator / API)."""
+        num_cubes = len(cubes_system)
+        num_balls = max((len(cube.get("balls", [])) for cube in cubes_system), default=0)
+        ball_positions = np.zeros((num_cubes, num_balls, 3))
+        ball_velocities = np.zeros((num_cubes, num_balls, 3))
+        ball_colors = np.tile(np.array([1.0, 0.0, 0.0]), (num_cubes, num_balls, 1))
+        ball_radii = np.zeros((num_cubes, num_balls))
+        ball_mask = np.zeros((num_cubes, num_balls), dtype=bool)
+        for i, cube in enumerate(cubes_system):
+            for j, ball in enumerate(cube.get("balls", [])):
+                ball_positions[i, j] = ball["position"]
+                ball_velocities[i, j] = ball.get("velocity", [0.0, 0.0, 0.0])
+                ball_colors[i, j] = ball.get("color", [1.0, 0.0, 0.0])
+                ball_radii[i, j] = ball.get("radius", cube.get("size", 8.0) / 8.0)
+                ball_mask[i, j] = True
+
+        rng = rng or np.random.default_rng()
+        has_counters = all("chaos_counter" in cube for cube in cubes_system)
+        system = cls(
+            positions=[cube["position"] for cube in cubes_system],
+            velocities=[cube.get("velocity", [0.0, 0.0, 0.0]) for cube in cubes_system],
+            angular_velocities=[cube.get("angular_velocity", [0.0, 0.0, 0.0]) for cube in cubes_system],
+            rotations=[cube.get("rotation", [0.0, 0.0, 0.0]) for cube in cubes_system],
+            sizes=[cube.get("size", 8.0) for cube in cubes_system],
+            ball_positions=ball_positions,
+            ball_velocities=ball_velocities,
+            ball_radii=ball_radii,
+            ball_colors=ball_colors,
+            ball_mask=ball_mask,
+            chaos_counters=[cube["chaos_counter"] for cube in cubes_system] if has_counters else None,
+            rng=rng
+        )
+        system.cube_extras = [{k: v for k, v in cube.items() if k not in _CUBE_KEYS} for cube in cubes_system]
+        system.ball_extras = [
+            [{k: v for k, v in ball.items() if k not in _BALL_KEYS} for ball in cube.get("balls", [])]
+            for cube in cubes_system
+        ]
+        return system
+
+    def step(
+        self,
+        n: int = 1,
+        delta_time: float = 0.1,
+        gravity: float = -9.81 * 0.05,
+        bounce_factor: float = 0.85,
+        confinement_size: float = 30.0,
+        chaos: float = 0.3
+    ) -> "CubeSystem":
+        """Avance la simulation de n pas, entièrement vectorisé sur les cubes et les billes."""
+        half_confinement = confinement_size / 2.0
+        half_sizes = self.sizes / 2.0
+        cube_limits = (half_confinement - half_sizes)[:, None]
+        ball_limits = (half_sizes[:, None] - self.ball_radii)[..., None]
+
+        for _ in range(n):
+            chaos_factor = chaos * (1 + np.sin(self.chaos_counters))
+            self.chaos_counters += delta_time * 2
+
+            # Translation des cubes avec force aléatoire modulée par le chaos
+            rand_force = self.rng.uniform(-1.0, 1.0, self.positions.shape) * (delta_time * chaos_factor)[:, None]
+            self.velocities += rand_force
+            self.positions += self.velocities * delta_time
+
+            # Rebond sur les parois de la boîte de confinement
+            out = np.abs(self.positions) + half_sizes[:, None] > half_confinement
+            self.velocities[out] *= -bounce_factor
+            self.positions = np.where(out, np.where(self.positions > 0, cube_limits, -cube_limits), self.positions)
+
+            # Rotation des cubes et frottement angulaire
+            self.rotations += self.angular_velocities * delta_time
+            self.angular_velocities *= 0.995
+
+            # Billes : gravité modulée par le chaos, puis rebond sur les parois internes
+            if self.num_balls:
+                self.ball_velocities[..., 1] += gravity * delta_time * chaos_factor[:, None]
+                self.ball_positions += self.ball_velocities * delta_time
+                hit = np.abs(self.ball_positions) > ball_limits
+                noise = self.rng.uniform(-0.01, 0.01, self.ball_velocities.shape)
+                self.ball_velocities = np.where(hit, self.ball_velocities * -bounce_factor + noise, self.ball_velocities)
+                self.ball_positions = np.where(
+                    hit, np.where(self.ball_positions > 0, ball_limits, -ball_limits), self.ball_positions
+                )
+        return self
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Vue dict/JSON du système (format de CubeGenerator)."""
+        positions = self.positions.tolist()
+        velocities = self.velocities.tolist()
+        angular_velocities = self.angular_velocities.tolist()
+        rotations = self.rotations.tolist()
+        ball_positions = self.ball_positions.tolist()
+        ball_velocities = self.ball_velocities.tolist()
+        ball_colors = self.ball_colors.tolist()
+        ball_radii = self.ball_radii.tolist()
+        cubes = []
+        for i in range(self.num_cubes):
+            balls = []
+            for j in range(self.num_balls):
+                if not self.ball_mask[i, j]:
+                    continue
+                extras = self.ball_extras[i][j] if j < len(self.ball_extras[i]) else {}
+                balls.append({
+                    **extras,
+                    "id": j,
+                    "position": ball_positions[i][j],
+                    "radius": ball_radii[i][j],
+                    "color": ball_colors[i][j],
+                    "velocity": ball_velocities[i][j]
+                })
+            cubes.append({
+                **self.cube_extras[i],
+                "id": i,
+                "position": positions[i],
+                "size": float(self.sizes[i]),
+                "velocity": velocities[i],
+                "angular_velocity": angular_velocities[i],
+                "rotation": rotations[i],
+                "chaos_counter": float(self.chaos_counters[i]),
+                "balls": balls
+            })
+        return cubes
+
+
 def update_cubes_dynamics(
     cubes_system: List[Dict[str, Any]],
     delta_time: float = 0.1,
@@ -24,98 +241,28 @@ def update_cubes_dynamics(
     confinement_size: float = 30.0,
     chaos: float = 0.3 # Paramètre 'chaos' reçu de l'appelant
 ) -> List[Dict[str, Any]]:
-    updated_cubes_system = []
-    half_confinement = confinement_size / 2.0
-
-    for cube in cubes_system:
-        updated_cube = cube.copy()
-        updated_cube["position"] = np.array(updated_cube["position"]) # Convertir en np.array pour calculs
-        updated_cube["velocity"] = np.array(updated_cube["velocity"])
-        updated_cube["angular_velocity"] = np.array(updated_cube["angular_velocity"])
-        updated_cube["rotation"] = np.array(updated_cube["rotation"])
-        updated_cube["balls"] = [ball.copy() for ball in updated_cube["balls"]] # Copie des billes
-
-        # Assurez-vous que chaos_counter existe, l'initialiser si non
-        if "chaos_counter" not in updated_cube:
-            updated_cube["chaos_counter"] = random.uniform(0, 10)
-        
-        # Le chaos_factor doit utiliser le paramètre 'chaos' de la fonction.
-        current_chaos_factor = chaos * (1 + np.sin(updated_cube["chaos_counter"]))
-        updated_cube["chaos_counter"] += delta_time * 2
-
-        # Mise à jour de la translation du cube
-        rand_force = np.array([random.uniform(-1.0, 1.0) for _ in range(3)]) * delta_time * current_chaos_factor
-        updated_cube["velocity"] += rand_force
-        updated_cube["position"] += updated_cube["velocity"] * delta_time
-
-        # Rebond sur les parois de la boîte de confinement pour le cube
-        for i in range(3):
-            if abs(updated_cube["position"][i]) + updated_cube["size"] / 2.0 > half_confinement:
-                updated_cube["velocity"][i] *= -bounce_factor
-                updated_cube["position"][i] = (
-                    half_confinement - updated_cube["size"] / 2.0
-                    if updated_cube["position"][i] > 0
-                    else -half_confinement + updated_cube["size"] / 2.0
-                )
-
-        # Mise à jour de la rotation du cube
-        updated_cube["rotation"] += updated_cube["angular_velocity"] * delta_time
-        updated_cube["angular_velocity"] *= 0.995 # Frottement angulaire
-
-        # Mise à jour des billes à l'intérieur du cube
-        half_cube_size = updated_cube["size"] / 2.0
-        for ball in updated_cube["balls"]:
-            ball_pos = np.array(ball["position"])
-            ball_vel = np.array(ball["velocity"])
-            
-            # Application de la gravité avec un facteur de chaos
-            ball_vel[1] += gravity * delta_time * current_chaos_factor # Utilise current_chaos_factor
-            ball_pos += ball_vel * delta_time
-
-            # Rebond sur les parois internes du cube pour les billes
-            inner_limit = half_cube_size - ball["radius"]
-            for i in range(3):
-                if abs(ball_pos[i]) > inner_limit:
-                    ball_vel[i] *= -bounce_factor # Rebond
-                    ball_pos[i] = inner_limit if ball_pos[i] > 0 else -inner_limit # Ajustement position
-                    ball_vel[i] += random.uniform(-0.01, 0.01) # Petit bruit au rebond
-
-            ball["position"] = ball_pos.tolist()
-            ball["velocity"] = ball_vel.tolist()
-
-        # Reconvertir les np.array en listes pour le retour JSON
-        updated_cube["position"] = updated_cube["position"].tolist()
-        updated_cube["velocity"] = updated_cube["velocity"].tolist()
-        updated_cube["angular_velocity"] = updated_cube["angular_velocity"].tolist()
-        updated_cube["rotation"] = updated_cube["rotation"].tolist()
-
-        updated_cubes_system.append(updated_cube)
-
-    return updated_cubes_system
-
-def update_cubes_dynamics(cube):
-    new_cube = {**cube}
-    new_cube['position'] = [
-        cube['position'][0] + np.random.normal(0, 0.5),
-        cube['position'][1] + np.random.normal(0, 0.5),
-        cube['position'][2] + np.random.normal(0, 0.5)
-    ]
-    new_cube['rotation'] = cube.get('rotation', [0, 0, 0])
-    new_cube['size'] = cube.get('size', 8.0)
-    return new_cube
+    """Avance d'un pas un système au format dict (compatibilité) via CubeSystem."""
+    return CubeSystem.from_dicts(cubes_system).step(
+        1,
+        delta_time=delta_time,
+        gravity=gravity,
+        bounce_factor=bounce_factor,
+        confinement_size=confinement_size,
+        chaos=chaos
+    ).to_dicts()
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
     from backend.geometry.cubes.generator import CubeGenerator # Import pour le test
-    
+
     generator = CubeGenerator()
     initial_system = generator.generate_cubes_system(num_cubes=1, num_balls_per_cube=1, space_bounds=30.0, cube_size=8.0)
-    
+
     print("Initial Cube Pos:", initial_system[0]["position"])
     print("Initial Ball Pos:", initial_system[0]["balls"][0]["position"])
 
-    # Simuler plusieurs steps
-    for step in range(100):
-        initial_system = update_cubes_dynamics(initial_system, delta_time=0.05, chaos=0.5) # Passer chaos
-        if step % 20 == 0:
-            print(f"Step {step}: Cube Pos={initial_system[0]['position'][1]:.2f}, Ball Pos={initial_system[0]['balls'][0]['position'][1]:.2f}")
\ No newline at end of file
+    # Simuler plusieurs steps sans repasser par les dicts
+    system = CubeSystem.from_dicts(initial_system)
+    for step in range(0, 100, 20):
+        system.step(20, delta_time=0.05, chaos=0.5)
+        print(f"Step {step}: Cube Pos={system.positions[0, 1]:.2f}, Ball Pos={system.ball_positions[0, 0, 1]:.2f}")
@@ -1,28 +1,100 @@
 # backend/geometry/icosahedron/dynamics.py
 
+import threading
+import hashlib
+from collections import OrderedDict
 import numpy as np
-from typing import Tuple, Optional, List, Set, Dict, Any
+from scipy import sparse
+from typing import Tuple, Optional, List, Set, Dict, Any, Union
 from flask import jsonify
 
 # Importe les fonctions utilitaires nécessaires de common.py
-from ..common import compute_vertex_neighbors # compute_vertex_neighbors est dans common.py
+from ..common import build_adjacency_matrix
 
-def laplacian_phi(phi: np.ndarray, neighbors: List[Set[int]]) -> np.ndarray:
+# Nombre de topologies dont les opérateurs restent en cache
+MESH_OPERATOR_CACHE_SIZE = 32
+
+
+class MeshDynamicsOperator:
+    """
+    Opérateurs creux précalculés pour une topologie de maillage.
+    mean_operator = D⁻¹A (moyenne des voisins) : chaque étape RK4 se réduit à
+    quelques produits matrice creuse × vecteur au lieu de boucles Python par sommet.
+    """
+    def __init__(self, adjacency: sparse.csr_matrix):
+        degree = np.asarray(adjacency.sum(axis=1)).ravel()
+        self.num_vertices = adjacency.shape[0]
+        self.has_neighbors = degree > 0
+        inv_degree = np.zeros_like(degree)
+        inv_degree[self.has_neighbors] = 1.0 / degree[self.has_neighbors]
+        self.mean_operator = sparse.diags(inv_degree).dot(adjacency).tocsr()
+
+    @classmethod
+    def from_faces(cls, faces: np.ndarray, num_vertices: int) -> "MeshDynamicsOperator":
+        return cls(build_adjacency_matrix(faces, num_vertices))
+
+    @classmethod
+    def from_neighbors(cls, neighbors: List[Set[int]]) -> "MeshDynamicsOperator":
+        """Construit l'opérateur depuis la liste de voisins de compute_vertex_neighbors."""
+        rows = np.repeat(np.arange(len(neighbors)), [len(neigh) for neigh in neighbors])
+        cols = np.fromiter((j for neigh in neighbors for j in neigh), dtype=np.int64, count=len(rows))
+        adjacency = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(neighbors), len(neighbors))
+        )
+        return cls(adjacency)
+
+    def neighbor_mean(self, values: np.ndarray) -> np.ndarray:
+        """Moyenne des valeurs des voisins de chaque sommet (0 pour un sommet isolé)."""
+        return self.mean_operator.dot(values)
+
+    def laplacian(self, phi: np.ndarray) -> np.ndarray:
+        """Laplacien discret normalisé : moyenne des (phi_j - phi_i) sur les voisins."""
+        lap_phi = self.neighbor_mean(phi) - phi
+        lap_phi[~self.has_neighbors] = 0.0
+        return lap_phi
+
+
+_operator_cache: "OrderedDict[Tuple, MeshDynamicsOperator]" = OrderedDict()
+_operator_cache_lock = threading.Lock()
+
+
+def get_mesh_operator(faces: np.ndarray, num_vertices: int) -> MeshDynamicsOperator:
+    """
+    Retourne l'opérateur de la topologie (faces, num_vertices), construit une seule fois.
+    Cache LRU indexé par une empreinte des faces.
+    """
+    faces = np.ascontiguousarray(faces, dtype=np.int32)
+    key = (num_vertices, faces.shape, hashlib.blake2b(faces.tobytes(), digest_size=16).digest())
+    with _operator_cache_lock:
+        operator = _operator_cache.get(key)
+        if operator is not None:
+            _operator_cache.move_to_end(key)
+            return operator
+    operator = MeshDynamicsOperator.from_faces(faces, num_vertices)
+    with _operator_cache_lock:
+        _operator_cache[key] = operator
+        while len(_operator_cache) > MESH_OPERATOR_CACHE_SIZE:
+            _operator_cache.popitem(last=False)
+    return operator
+
+
+def _as_operator(neighbors: Union[MeshDynamicsOperator, List[Set[int]]]) -> MeshDynamicsOperator:
+    if isinstance(neighbors, MeshDynamicsOperator):
+        return neighbors
+    return MeshDynamicsOperator.from_neighbors(neighbors)
+
+
+def laplacian_phi(phi: np.ndarray, neighbors: Union[MeshDynamicsOperator, List[Set[int]]]) -> np.ndarray:
     """
     Calcule le laplacien discret de phi sur le maillage.
     """
-    lap_phi = np.zeros_like(phi)
-    for i, neigh in enumerate(neighbors):
-        if not neigh:
-            continue
-        lap_phi[i] = sum(phi[j] - phi[i] for j in neigh) / len(neigh)
-    return lap_phi
+    return _as_operator(neighbors).laplacian(phi)
 
 
 def rk4_step(
     psi_local: np.ndarray,
     phi_local: np.ndarray,
-    neighbors_local: List[Set[int]],
+    neighbors_local: Union[MeshDynamicsOperator, List[Set[int]]],
     dt_local: float,
     params_local: Dict[str, float]
 ) -> Tuple[np.ndarray, np.ndarray]:
@@ -31,37 +103,39 @@ def rk4_step(
         dΨ/dt = σ(Ψ_j - Ψ_i) + ε|Φ|^2
         dΦ/dt = ρΨ_i - Φ - Ψ_iΦ + ζ∇²Φ
     Ici Ψ est un tableau (N,3) des positions, Φ un tableau (N,) des scalaires.
+    neighbors_local est un MeshDynamicsOperator (ou, pour compatibilité, une liste de voisins).
     """
+    operator = _as_operator(neighbors_local)
+    sigma = params_local['sigma']
+    epsilon = params_local['epsilon']
+    rho = params_local['rho']
+    zeta = params_local['zeta']
 
     def dpsi_dt(psi_inner: np.ndarray, phi_inner: np.ndarray) -> np.ndarray:
         """Calcule le taux de changement de la position (dΨ/dt)."""
-        dpsi = np.zeros_like(psi_inner)
-        for i, neigh in enumerate(neighbors_local):
-            if not neigh: continue
-            avg_neighbor = np.mean(psi_inner[list(neigh)], axis=0)
-            dpsi[i] = params_local['sigma'] * (avg_neighbor - psi_inner[i]) + \
-                      params_local['epsilon'] * (phi_inner[i]**2) * np.ones(3)
+        dpsi = sigma * (operator.neighbor_mean(psi_inner) - psi_inner) + epsilon * (phi_inner ** 2)[:, None]
+        dpsi[~operator.has_neighbors] = 0.0
         return dpsi
 
     def dphi_dt(psi_inner: np.ndarray, phi_inner: np.ndarray) -> np.ndarray:
         """Calcule le taux de changement de la valeur scalaire (dΦ/dt)."""
-        lap_phi_val = laplacian_phi(phi_inner, neighbors_local) 
-        return params_local['rho'] * np.linalg.norm(psi_inner, axis=1) - \
-               phi_inner - \
-               np.linalg.norm(psi_inner, axis=1) * phi_inner + \
-               params_local['zeta'] * lap_phi_val
+        psi_norm = np.linalg.norm(psi_inner, axis=1)
+        return rho * psi_norm - phi_inner - psi_norm * phi_inner + zeta * operator.laplacian(phi_inner)
 
     k1_psi = dpsi_dt(psi_local, phi_local)
     k1_phi = dphi_dt(psi_local, phi_local)
 
-    k2_psi = dpsi_dt(psi_local + 0.5 * dt_local * k1_psi, phi_local + 0.5 * dt_local * k1_phi)
-    k2_phi = dphi_dt(psi_local + 0.5 * dt_local * k1_psi, phi_local + 0.5 * dt_local * k1_phi)
+    psi_2, phi_2 = psi_local + 0.5 * dt_local * k1_psi, phi_local + 0.5 * dt_local * k1_phi
+    k2_psi = dpsi_dt(psi_2, phi_2)
+    k2_phi = dphi_dt(psi_2, phi_2)
 
-    k3_psi = dpsi_dt(psi_local + 0.5 * dt_local * k2_psi, phi_local + 0.5 * dt_local * k2_phi)
-    k3_phi = dphi_dt(psi_local + 0.5 * dt_local * k2_psi, phi_local + 0.5 * dt_local * k2_phi)
+    psi_3, phi_3 = psi_local + 0.5 * dt_local * k2_psi, phi_local + 0.5 * dt_local * k2_phi
+    k3_psi = dpsi_dt(psi_3, phi_3)
+    k3_phi = dphi_dt(psi_3, phi_3)
 
-    k4_psi = dpsi_dt(psi_local + dt_local * k3_psi, phi_local + dt_local * k3_phi)
-    k4_phi = dphi_dt(psi_local + dt_local * k3_psi, phi_local + dt_local * k3_phi)
+    psi_4, phi_4 = psi_local + dt_local * k3_psi, phi_local + dt_local * k3_phi
+    k4_psi = dpsi_dt(psi_4, phi_4)
+    k4_phi = dphi_dt(psi_4, phi_4)
 
     psi_new = psi_local + (dt_local / 6) * (k1_psi + 2*k2_psi + 2*k3_psi + k4_psi)
     phi_new = phi_local + (dt_local / 6) * (k1_phi + 2*k2_phi + 2*k3_phi + k4_phi)
@@ -73,13 +147,14 @@ def update_icosahedron_dynamics(
     faces: np.ndarray,
     phi: np.ndarray,
     dt: float,
-    params: Dict[str, float]
+    params: Dict[str, float],
+    operator: Optional[MeshDynamicsOperator] = None
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Met à jour les positions des sommets de l'icosaèdre et les valeurs phi selon la dynamique chaotique.
+    L'opérateur de la topologie est précalculé une fois (cache) si non fourni.
     """
-    neighbors = compute_vertex_neighbors(faces, len(vertices)) 
-    psi_new, phi_new = rk4_step(vertices, phi, neighbors, dt, params)
+    if operator is None:
+        operator = get_mesh_operator(faces, len(vertices))
+    psi_new, phi_new = rk4_step(np.asarray(vertices, dtype=np.float64), phi, operator, dt, params)
     return psi_new, phi_new
-
-
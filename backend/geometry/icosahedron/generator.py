@@ -1,7 +1,8 @@
 import numpy as np
 from typing import Tuple, Optional, List, Set, Dict
 from math import sqrt
-from ..common import rotation_matrix  # Importe les utilitaires partagés depuis common.py
+from ..common import rotation_matrix, subdivide_faces  # Importe les utilitaires partagés depuis common.py
+from .mesh_store import MeshStore, SubdividedMesh
 import logging
 
 logger = logging.getLogger(__name__)
@@ -49,16 +50,43 @@ def loop_subdivision(
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Applique une subdivision topologique itérative d'un maillage triangulaire.
-    Utilise subdivide_faces de common.py.
+    Utilise subdivide_faces de common.py (sans projection sur la sphère).
     """
     current_vertices = np.array(vertices, dtype=np.float64)
     current_faces = np.array(faces, dtype=np.int32)
 
     for _ in range(iterations):
-        current_vertices, current_faces = subdivide_faces(current_vertices, current_faces)
+        current_vertices, current_faces = subdivide_faces(current_vertices, current_faces, project_to_sphere=False)
 
     return current_vertices, current_faces
 
+def _build_unit_klee_penrose_mesh(level: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Subdivise l'icosaèdre unité (rayon 1, centré, sans rotation) au niveau demandé."""
+    ico_vertices, ico_faces = generate_icosahedron()
+    return loop_subdivision(ico_vertices, ico_faces, level)
+
+# Maillages subdivisés mémoïsés par niveau : seules les transformations rigides sont refaites par requête
+klee_penrose_mesh_store = MeshStore(_build_unit_klee_penrose_mesh)
+
+def get_klee_penrose_mesh(subdivisions: int) -> SubdividedMesh:
+    """Maillage unité immuable (sommets, faces, opérateur des voisins) du niveau demandé."""
+    return klee_penrose_mesh_store.get(subdivisions)
+
+def transform_vertices(
+    vertices: np.ndarray,
+    radius: float = 1.0,
+    position: Optional[np.ndarray] = None,
+    rotation_axis: Optional[np.ndarray] = None,
+    rotation_angle: float = 0.0
+) -> np.ndarray:
+    """Applique échelle, rotation puis translation à des sommets (retourne une copie)."""
+    transformed = vertices * radius
+    if rotation_axis is not None and rotation_angle != 0.0:
+        transformed = transformed @ rotation_matrix(rotation_axis, rotation_angle).T
+    if position is not None:
+        transformed += np.asarray(position, dtype=np.float64)
+    return transformed
+
 def generate_klee_penrose_polyhedron(
     subdivisions: int = 3,
     radius: float = 1.0,
@@ -68,43 +96,19 @@ def generate_klee_penrose_polyhedron(
 ) -> dict:
     """
     Génère une approximation du Polyèdre de Klee-Penrose par subdivision d'un icosaèdre.
+    La topologie vient du cache par niveau ; seules les transformations rigides sont calculées.
     """
     try:
-        ico_vertices, ico_faces = generate_icosahedron(radius, position, rotation_axis, rotation_angle)
-        subdivided_vertices, subdivided_faces = loop_subdivision(ico_vertices, ico_faces, subdivisions)
-
-        if position is not None:
-            subdivided_vertices = subdivided_vertices + np.array(position)
+        mesh = get_klee_penrose_mesh(subdivisions)
+        subdivided_vertices = transform_vertices(mesh.vertices, radius, position, rotation_axis, rotation_angle)
         return {
             'vertices': subdivided_vertices.tolist(),
-            'faces': subdivided_faces.tolist()
+            'faces': mesh.faces.tolist()
         }
     except Exception as e:
         logger.error(f"Erreur dans generate_klee_penrose_polyhedron : {e}")
         raise
 
-def subdivide_faces(vertices, faces):
-    try:
-        new_vertices = vertices.tolist() if isinstance(vertices, np.ndarray) else list(vertices)
-        new_faces = []
-        for face in faces:
-            v1, v2, v3 = [new_vertices[i] for i in face]
-            mid1 = [(v1[i] + v2[i]) / 2 for i in range(3)]
-            mid2 = [(v2[i] + v3[i]) / 2 for i in range(3)]
-            mid3 = [(v3[i] + v1[i]) / 2 for i in range(3)]
-            new_vertices.extend([mid1, mid2, mid3])
-            idx = len(new_vertices)
-            new_faces.extend([
-                [face[0], idx-3, idx-1],
-                [face[1], idx-2, idx-3],
-                [face[2], idx-1, idx-2],
-                [idx-3, idx-2, idx-1]
-            ])
-        return np.array(new_vertices, dtype=np.float64), np.array(new_faces, dtype=np.int32)
-    except Exception as e:
-        logger.error(f"Erreur dans subdivide_faces : {e}")
-        raise
-
 # --- ALIAS POUR COMPATIBILITÉ AVEC L'ANCIEN CODE ---
 def generate_icosahedron_data(*args, **kwargs):
     """Alias pour compatibilité avec l'ancien code."""
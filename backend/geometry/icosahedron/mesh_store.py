@@ -0,0 +1,86 @@
+import threading
+import logging
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+
+from .dynamics import MeshDynamicsOperator
+
+logger = logging.getLogger(__name__)
+
+# Nombre de niveaux de subdivision conservés en mémoire
+MESH_STORE_MAX_LEVELS = 8
+
+
+class SubdividedMesh:
+    """
+    Maillage immuable d'un niveau de subdivision, construit sur la forme unité
+    (rayon 1, centrée, sans rotation). Les tableaux sont en lecture seule :
+    les transformations rigides doivent produire des copies.
+    """
+    def __init__(self, level: int, vertices: np.ndarray, faces: np.ndarray):
+        self.level = level
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float64)
+        self.faces = np.ascontiguousarray(faces, dtype=np.int32)
+        self.vertices.flags.writeable = False
+        self.faces.flags.writeable = False
+        self._operator: Optional[MeshDynamicsOperator] = None
+        self._lock = threading.Lock()
+
+    @property
+    def operator(self) -> MeshDynamicsOperator:
+        """Opérateur creux (CSR) des voisins, construit au premier accès."""
+        with self._lock:
+            if self._operator is None:
+                self._operator = MeshDynamicsOperator.from_faces(self.faces, len(self.vertices))
+            return self._operator
+
+
+class MeshStore:
+    """
+    Cache mémoïsé (LRU) des maillages subdivisés, indexé par niveau de subdivision.
+
+    Args:
+        builder (Callable): Construit (vertices, faces) du maillage unité pour un niveau.
+        max_levels (int): Nombre maximal de niveaux conservés.
+    """
+    def __init__(self, builder: Callable[[int], Tuple[np.ndarray, np.ndarray]], max_levels: int = MESH_STORE_MAX_LEVELS):
+        self.builder = builder
+        self.max_levels = max_levels
+        self._meshes: "OrderedDict[int, SubdividedMesh]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: dict = {}
+
+    def get(self, level: int) -> SubdividedMesh:
+        """Retourne le maillage du niveau demandé, construit une seule fois."""
+        with self._lock:
+            mesh = self._meshes.get(level)
+            if mesh is not None:
+                self._meshes.move_to_end(level)
+                return mesh
+            build_lock = self._build_locks.setdefault(level, threading.Lock())
+
+        # Un seul thread construit un niveau donné ; les autres attendent le résultat
+        with build_lock:
+            with self._lock:
+                mesh = self._meshes.get(level)
+                if mesh is not None:
+                    return mesh
+            vertices, faces = self.builder(level)
+            mesh = SubdividedMesh(level, vertices, faces)
+            logger.info(f"Maillage de niveau {level} construit : {len(mesh.vertices)} sommets, {len(mesh.faces)} faces")
+            with self._lock:
+                self._meshes[level] = mesh
+                self._build_locks.pop(level, None)
+                while len(self._meshes) > self.max_levels:
+                    self._meshes.popitem(last=False)
+            return mesh
+
+    def levels(self) -> List[int]:
+        """Niveaux actuellement en cache."""
+        with self._lock:
+            return list(self._meshes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._meshes.clear()
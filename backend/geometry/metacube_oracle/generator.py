@@ -1,11 +1,33 @@
+import os
 import numpy as np
 import secrets
 import time
 import logging
-from typing import Dict, List, Any
+import threading
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from entropy.collector import EntropySource, get_default_collector
+from entropy.estimator import EntropyTelemetry, HistogramEntropy
 
 logger = logging.getLogger(__name__)
 
+# Cadence de rafraîchissement par défaut d'une source (secondes) ; entre deux
+# rafraîchissements, sa dernière valeur est réutilisée par toutes les frames
+METACUBE_SOURCE_REFRESH = float(os.getenv("METACUBE_SOURCE_REFRESH", "1.0"))
+# Délai maximal accordé à une source lors d'une collecte (secondes)
+METACUBE_SOURCE_TIMEOUT = float(os.getenv("METACUBE_SOURCE_TIMEOUT", "2.0"))
+# Échecs consécutifs après lesquels une source est déclarée indisponible
+METACUBE_SOURCE_MAX_FAILURES = int(os.getenv("METACUBE_SOURCE_MAX_FAILURES", "3"))
+# Durée (secondes) pendant laquelle une source indisponible n'est plus appelée
+METACUBE_SOURCE_RETRY_AFTER = float(os.getenv("METACUBE_SOURCE_RETRY_AFTER", "300"))
+# Cadences propres à certaines sources (géométries statiques rafraîchies rarement)
+METACUBE_SOURCE_REFRESH_INTERVALS = {
+    'icosahedron': 30.0,
+    'spiral_simple': 5.0,
+    'centrifuge_laser_v2': 0.25,
+    'crypto_token_river': 0.5
+}
+
 def safe_import_generator(module_path, function_name):
     """Import sécurisé des générateurs avec fallback."""
     try:
@@ -26,10 +48,214 @@ generate_torus_spring_data = safe_import_generator('geometry.torus_spring.genera
 generate_crypto_token_river_data = safe_import_generator('geometry.crypto_token_river.generator', 'generate_crypto_token_river_data')
 generate_stream_data = safe_import_generator('geometry.stream.generator', 'generate_stream_data')
 
+
+def generate_icosahedron_source() -> Dict[str, Any]:
+    """Source icosaèdre sous forme sérialisable (generate_icosahedron_data renvoie des tableaux)."""
+    vertices, faces = generate_icosahedron_data()
+    return {"vertices": np.asarray(vertices).tolist(), "faces": np.asarray(faces).tolist()}
+
+
+def kaleidoscope_triangle_layout() -> List[Dict[str, Any]]:
+    """Disposition des 6 triangles d'un hexagone kaléidoscopique (identique pour toutes les faces)."""
+    triangles = []
+    for i in range(6):
+        angle = (i / 6) * 2 * np.pi
+        mirror_rotation = np.pi if i % 2 == 1 else 0
+        triangles.append({
+            "id": i,
+            "position": [float(np.cos(angle) * 2), float(np.sin(angle) * 2), 0],
+            "rotation": [mirror_rotation, 0, angle],
+            "scale": [1.0, 1.0, 1.0],
+            "mirror": i % 2 == 1
+        })
+    return triangles
+
+
+KALEIDOSCOPE_TRIANGLES = kaleidoscope_triangle_layout()
+
+
+def source_coordinates(source_data: Any) -> np.ndarray:
+    """
+    Coordonnées d'une source (sommets, ou positions des sphères et des cubes) en un tableau
+    plat. Les corps dont la position n'est pas un triplet numérique sont ignorés.
+    """
+    if not isinstance(source_data, dict):
+        return np.empty(0)
+    if 'vertices' in source_data:
+        try:
+            return np.asarray(source_data['vertices'], dtype=np.float64).reshape(-1)
+        except (TypeError, ValueError):
+            return np.empty(0)
+    positions = [
+        body['position']
+        for key in ('spheres', 'cubes')
+        for body in source_data.get(key) or ()
+        if isinstance(body, dict) and isinstance(body.get('position'), (list, tuple)) and len(body['position']) == 3
+    ]
+    try:
+        return np.asarray(positions, dtype=np.float64).reshape(-1)
+    except (TypeError, ValueError):
+        return np.empty(0)
+
+
+class CachedSource:
+    """État d'une source du MetaCube : dernière valeur, révision et historique d'échecs."""
+    def __init__(self, name: str, func: Optional[Callable[[], Any]], refresh_interval: float):
+        self.name = name
+        self.func = func
+        self.refresh_interval = refresh_interval
+        self.value: Any = None
+        self.revision = 0
+        self.fetched_at = float("-inf")
+        self.failures = 0
+        # Générateur non importable : indisponible définitivement
+        self.unavailable_until = float("inf") if func is None else 0.0
+
+    @property
+    def source_id(self) -> str:
+        return f"{self.name}:{self.revision}"
+
+    def is_stale(self, now: float) -> bool:
+        return self.value is None or now - self.fetched_at >= self.refresh_interval
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.unavailable_until
+
+    def store(self, value: Any, now: float) -> None:
+        self.value = value
+        self.revision += 1
+        self.fetched_at = now
+
+
+class MetaCubeSourceCache:
+    """
+    Sources du MetaCube collectées en parallèle (EntropyCollector), chacune avec sa
+    cadence de rafraîchissement et sa dernière valeur en cache. Une source en échec
+    METACUBE_SOURCE_MAX_FAILURES fois de suite est déclarée indisponible et n'est plus
+    appelée pendant METACUBE_SOURCE_RETRY_AFTER secondes ; ses données de repli restent
+    alors en cache comme une valeur ordinaire.
+
+    Chaque nouvelle valeur alimente la télémétrie d'entropie (telemetry) de sa source :
+    l'histogramme n'est calculé qu'une fois par révision, pas à chaque frame.
+    """
+    def __init__(
+        self,
+        generators: Dict[str, Optional[Callable[[], Any]]],
+        refresh_intervals: Optional[Dict[str, float]] = None,
+        timeout: float = METACUBE_SOURCE_TIMEOUT,
+        max_failures: int = METACUBE_SOURCE_MAX_FAILURES,
+        retry_after: float = METACUBE_SOURCE_RETRY_AFTER,
+        collector=None,
+        telemetry: Optional[EntropyTelemetry] = None
+    ):
+        intervals = refresh_intervals or {}
+        self.sources = {
+            name: CachedSource(name, func, intervals.get(name, METACUBE_SOURCE_REFRESH))
+            for name, func in generators.items()
+        }
+        self.timeout = timeout
+        self.max_failures = max_failures
+        self.retry_after = retry_after
+        self.collector = collector
+        self.telemetry = telemetry or EntropyTelemetry()
+        self._lock = threading.Lock()
+
+    def _store(self, source: CachedSource, value: Any, now: float) -> None:
+        source.store(value, now)
+        # La télémétrie ne doit jamais interrompre la collecte des autres sources
+        try:
+            self.telemetry.observe(source.name, source_coordinates(value))
+        except Exception as e:
+            logger.warning(f"Télémétrie d'entropie ignorée pour la source {source.name}: {e}")
+
+    def collect(self, fallback: Callable[[str], Any]) -> Dict[str, Tuple[str, Any]]:
+        """
+        Rafraîchit en parallèle les sources dont la cadence est échue, puis renvoie
+        {nom: (identifiant "nom:révision", données)} pour toutes les sources.
+        """
+        with self._lock:
+            now = time.monotonic()
+            due = [
+                source for source in self.sources.values()
+                if source.is_stale(now) and source.is_available(now)
+            ]
+            if due:
+                collector = self.collector or get_default_collector()
+                results = collector.collect([
+                    EntropySource(source.name, source.func, timeout=self.timeout) for source in due
+                ])
+                now = time.monotonic()
+                for source in due:
+                    if source.name in results:
+                        source.failures = 0
+                        self._store(source, results[source.name], now)
+                        continue
+                    source.failures += 1
+                    source.fetched_at = now
+                    if source.failures >= self.max_failures:
+                        source.unavailable_until = now + self.retry_after
+                        logger.warning(
+                            f"Source MetaCube {source.name} indisponible après {source.failures} échecs : "
+                            f"données de repli pendant {self.retry_after:.0f}s"
+                        )
+                    if source.value is None or source.failures >= self.max_failures:
+                        self._store(source, fallback(source.name), now)
+
+            # Sources jamais collectées et indisponibles (générateur absent)
+            for source in self.sources.values():
+                if source.value is None:
+                    self._store(source, fallback(source.name), now)
+            return {name: (source.source_id, source.value) for name, source in self.sources.items()}
+
+    def shannon_entropy(self, names=None) -> float:
+        """Entropie (bits) des valeurs courantes des sources names, fusionnées sans recalcul."""
+        return self.telemetry.combined(names).entropy()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "revision": source.revision,
+                    "failures": source.failures,
+                    "available": source.is_available(now),
+                    "refresh_interval": source.refresh_interval
+                }
+                for name, source in self.sources.items()
+            }
+
+
+def default_source_generators() -> Dict[str, Optional[Callable[[], Any]]]:
+    """Générateurs des visualiseurs alimentant le MetaCube (None si non importables)."""
+    return {
+        'icosahedron': generate_icosahedron_source if generate_icosahedron_data is not None else None,
+        'cubes': generate_cubes_data,
+        'spiral_simple': generate_spiral_simple_data,
+        'spiral_torus': generate_spiral_torus_data,
+        'centrifuge_laser': generate_centrifuge_laser_data,
+        'centrifuge_laser_v2': generate_centrifuge_laser_v2_data,
+        'torus_spring': generate_torus_spring_data,
+        'crypto_token_river': generate_crypto_token_river_data,
+        'stream': generate_stream_data
+    }
+
+
+_source_cache: Optional[MetaCubeSourceCache] = None
+_source_cache_lock = threading.Lock()
+
+
+def get_source_cache() -> MetaCubeSourceCache:
+    """Cache des sources partagé par les générateurs MetaCube du processus."""
+    global _source_cache
+    with _source_cache_lock:
+        if _source_cache is None:
+            _source_cache = MetaCubeSourceCache(default_source_generators(), METACUBE_SOURCE_REFRESH_INTERVALS)
+        return _source_cache
+
 class MetaCubeOracleGenerator:
     """Générateur révolutionnaire MetaCube Oracle avec fusion kaléidoscopique."""
     
-    def __init__(self):
+    def __init__(self, source_cache: Optional[MetaCubeSourceCache] = None):
         self.system_random = secrets.SystemRandom()
         self.entropy_accumulator = 0.0
         self.kaleidoscope_rotation = 0.0
@@ -37,40 +263,15 @@ class MetaCubeOracleGenerator:
             'icosahedron', 'cubes', 'spiral_simple', 
             'spiral_torus', 'centrifuge_laser', 'centrifuge_laser_v2'
         ]
-        
+        self.source_cache = source_cache or get_source_cache()
+
+    def collect_sources(self) -> Dict[str, Tuple[str, Any]]:
+        """Sources du MetaCube par nom : (identifiant "nom:révision", données)."""
+        return self.source_cache.collect(self.generate_fallback_data)
+
     def collect_entropy_from_all_sources(self) -> Dict[str, Any]:
         """Collecte l'entropie de tous les visualiseurs disponibles."""
-        entropy_sources = {}
-        
-        # Mapping des générateurs
-        generators = {
-            'icosahedron': generate_icosahedron_data,
-            'cubes': generate_cubes_data,
-            'spiral_simple': generate_spiral_simple_data,
-            'spiral_torus': generate_spiral_torus_data,
-            'centrifuge_laser': generate_centrifuge_laser_data,
-            'centrifuge_laser_v2': generate_centrifuge_laser_v2_data,
-            'torus_spring': generate_torus_spring_data,
-            'crypto_token_river': generate_crypto_token_river_data,
-            'stream': generate_stream_data
-        }
-        
-        # Collecte sécurisée
-        for name, generator_func in generators.items():
-            if generator_func is not None:
-                try:
-                    entropy_sources[name] = generator_func()
-                    logger.info(f"Entropie collectée de {name}")
-                except Exception as e:
-                    logger.error(f"Erreur collecte {name}: {e}")
-                    # Générer des données de fallback
-                    entropy_sources[name] = self.generate_fallback_data(name)
-            else:
-                logger.warning(f"Générateur {name} non disponible, utilisation fallback")
-                entropy_sources[name] = self.generate_fallback_data(name)
-        
-        logger.info(f"Entropie collectée de {len(entropy_sources)} sources")
-        return entropy_sources
+        return {name: data for name, (_, data) in self.collect_sources().items()}
     
     def generate_fallback_data(self, source_name: str) -> Dict[str, Any]:
         """Génère des données de fallback en cas d'erreur."""
@@ -110,101 +311,98 @@ class MetaCubeOracleGenerator:
         }
     
     def calculate_shannon_entropy(self, data: Dict[str, Any]) -> float:
-        """Calcule l'entropie de Shannon pour fusion optimale."""
+        """Calcule l'entropie de Shannon pour fusion optimale (histogramme à classes fixes)."""
         try:
-            all_positions = []
-            for source_name, source_data in data.items():
-                if isinstance(source_data, dict):
-                    if 'vertices' in source_data:
-                        all_positions.extend(np.array(source_data['vertices']).flatten())
-                    elif 'spheres' in source_data:
-                        for sphere in source_data['spheres']:
-                            if 'position' in sphere:
-                                all_positions.extend(sphere['position'])
-                    elif 'cubes' in source_data:
-                        for cube in source_data['cubes']:
-                            if 'position' in cube:
-                                all_positions.extend(cube['position'])
-            if not all_positions:
-                return 0.0
-            positions_array = np.array(all_positions)
-            hist, _ = np.histogram(positions_array, bins=50)
-            hist = hist[hist > 0]
-            probabilities = hist / np.sum(hist)
-            shannon_entropy = -np.sum(probabilities * np.log2(probabilities))
-            return float(shannon_entropy)
+            histogram = HistogramEntropy()
+            for source_data in data.values():
+                histogram.update(source_coordinates(source_data))
+            return histogram.entropy()
         except Exception as e:
             logger.error(f"Erreur calcul entropie Shannon: {e}")
             return 0.0
     
-    def generate_kaleidoscope_triangles(self, face_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Génère les triangles kaléidoscopiques pour une face du cube."""
-        triangles = []
-        for i in range(6):
-            angle = (i / 6) * 2 * np.pi
-            triangle_x = np.cos(angle) * 2
-            triangle_y = np.sin(angle) * 2
-            mirror_rotation = np.pi if i % 2 == 1 else 0
-            triangle = {
-                "id": i,
-                "position": [triangle_x, triangle_y, 0],
-                "rotation": [mirror_rotation, 0, angle],
-                "scale": [1.0, 1.0, 1.0],
-                "mirror": i % 2 == 1,
-                "source_data": face_data
+    def generate_kaleidoscope_triangles(self, source_id: str) -> Dict[str, Any]:
+        """
+        Hexagone kaléidoscopique d'une face : référence la source par identifiant ; la
+        géométrie des triangles (kaleidoscope.triangles) est commune à toutes les faces.
+        """
+        return {"source": source_id, "triangles": [triangle["id"] for triangle in KALEIDOSCOPE_TRIANGLES]}
+
+    def register_sources(self, collected: Dict[str, Tuple[str, Any]], sources: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Ajoute les sources collectées à la table sources ; renvoie {nom: identifiant}.
+        Une valeur en cache garde son identifiant : elle n'apparaît qu'une fois dans la table.
+        """
+        refs = {}
+        for name, (source_id, data) in collected.items():
+            sources.setdefault(source_id, data)
+            refs[name] = source_id
+        return refs
+
+    def generate_frame(self, sources: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Génère une frame normalisée : chaque source est ajoutée une seule fois à la table
+        sources (partagée entre les frames) et la frame n'y fait référence que par identifiant.
+        """
+        current_time = time.time()
+        collected = self.collect_sources()
+        # Histogrammes par source tenus à jour par le cache : simple fusion ici
+        shannon_entropy = self.source_cache.shannon_entropy(collected)
+        self.entropy_accumulator += shannon_entropy
+        self.kaleidoscope_rotation += shannon_entropy * 0.01
+        refs = self.register_sources(collected, sources)
+
+        faces = {face_name: refs[face_name] for face_name in self.cube_faces if face_name in refs}
+        metacube_config = {
+            "position": [0, 0, 0],
+            "rotation": [
+                self.kaleidoscope_rotation * 0.3,
+                self.kaleidoscope_rotation * 0.5,
+                self.kaleidoscope_rotation * 0.7
+            ],
+            "scale": [1.0 + np.sin(current_time) * 0.1] * 3,
+            "faces": faces
+        }
+        kaleidoscope_effect = {
+            "hexagon_count": 7,
+            "rotation_speed": shannon_entropy * 0.02,
+            "mirror_intensity": 0.8,
+            "fractal_depth": 3,
+            "color_shift": (current_time * 0.1) % 1.0
+        }
+        return {
+            "type": "metacube_oracle_kaleidoscope",
+            "timestamp": current_time,
+            "shannon_entropy": shannon_entropy,
+            "entropy_accumulator": self.entropy_accumulator,
+            "metacube": metacube_config,
+            "kaleidoscope": {
+                "hexagons": {face_name: self.generate_kaleidoscope_triangles(source_id) for face_name, source_id in faces.items()},
+                "effect": kaleidoscope_effect
+            },
+            "entropy_sources": refs,
+            "quantum_signature": {
+                "entanglement_factor": shannon_entropy,
+                "coherence_level": min(1.0, self.entropy_accumulator / 100),
+                "uncertainty_principle": self.system_random.random() * shannon_entropy
             }
-            triangles.append(triangle)
-        return triangles
-    
+        }
+
+    def generate_frames(self, num_frames: int) -> Dict[str, Any]:
+        """
+        Animation normalisée : {"frames": [...], "sources": {identifiant: données},
+        "triangles": disposition kaléidoscopique}. Chaque source n'apparaît qu'une fois.
+        """
+        sources: Dict[str, Any] = {}
+        frames = [self.generate_frame(sources) for _ in range(num_frames)]
+        return {"frames": frames, "sources": sources, "triangles": KALEIDOSCOPE_TRIANGLES}
+
     def generate_metacube_oracle_data(self) -> Dict[str, Any]:
-        """Génère les données complètes du MetaCube Oracle."""
+        """Génère les données complètes du MetaCube Oracle (une frame et sa table de sources)."""
         try:
-            current_time = time.time()
-            entropy_sources = self.collect_entropy_from_all_sources()
-            shannon_entropy = self.calculate_shannon_entropy(entropy_sources)
-            self.entropy_accumulator += shannon_entropy
-            self.kaleidoscope_rotation += shannon_entropy * 0.01
-            cube_faces_data = {}
-            kaleidoscope_hexagons = {}
-            for i, face_name in enumerate(self.cube_faces):
-                if face_name in entropy_sources:
-                    face_data = entropy_sources[face_name]
-                    cube_faces_data[face_name] = face_data
-                    kaleidoscope_hexagons[face_name] = self.generate_kaleidoscope_triangles(face_data)
-            metacube_config = {
-                "position": [0, 0, 0],
-                "rotation": [
-                    self.kaleidoscope_rotation * 0.3,
-                    self.kaleidoscope_rotation * 0.5,
-                    self.kaleidoscope_rotation * 0.7
-                ],
-                "scale": [1.0 + np.sin(current_time) * 0.1] * 3,
-                "faces": cube_faces_data
-            }
-            kaleidoscope_effect = {
-                "hexagon_count": 7,
-                "rotation_speed": shannon_entropy * 0.02,
-                "mirror_intensity": 0.8,
-                "fractal_depth": 3,
-                "color_shift": (current_time * 0.1) % 1.0
-            }
-            return {
-                "type": "metacube_oracle_kaleidoscope",
-                "timestamp": current_time,
-                "shannon_entropy": shannon_entropy,
-                "entropy_accumulator": self.entropy_accumulator,
-                "metacube": metacube_config,
-                "kaleidoscope": {
-                    "hexagons": kaleidoscope_hexagons,
-                    "effect": kaleidoscope_effect
-                },
-                "entropy_sources": entropy_sources,
-                "quantum_signature": {
-                    "entanglement_factor": shannon_entropy,
-                    "coherence_level": min(1.0, self.entropy_accumulator / 100),
-                    "uncertainty_principle": self.system_random.random() * shannon_entropy
-                }
-            }
+            sources: Dict[str, Any] = {}
+            frame = self.generate_frame(sources)
+            return {**frame, "sources": sources, "triangles": KALEIDOSCOPE_TRIANGLES}
         except Exception as e:
             logger.error(f"Erreur génération MetaCube Oracle: {e}")
             return {"error": str(e)}
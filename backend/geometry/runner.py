@@ -0,0 +1,165 @@
+import json
+import struct
+import logging
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger("simulation_runner")
+
+# Formats de sérialisation des animations (paramètre ?format= des routes /animate)
+FRAME_FORMATS = ("legacy", "packed", "delta")
+# Décimales conservées dans le format packed
+DEFAULT_PRECISION = 4
+# Pas de quantification du format delta (unités de scène)
+DEFAULT_QUANTUM = 1e-4
+
+# Transport binaire des frames (négocié par l'en-tête Accept des routes /animate)
+FRAMES_MIMETYPE = "application/octet-stream"
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack")
+FRAMES_MAGIC = b"OEFR"
+FRAMES_VERSION = 1
+# magic, version, 3 octets réservés, steps, N, longueur des métadonnées JSON (little-endian)
+FRAMES_HEADER = struct.Struct("<4sB3xIII")
+
+StepFunction = Callable[[np.ndarray], Optional[Dict[str, Any]]]
+
+
+class SimulationFrames:
+    """
+    Résultat d'une simulation : positions (steps, N, 3) remplies frame par frame,
+    canaux par frame optionnels (scalaires ou petits vecteurs, ex. rotation d'un bras)
+    et segments nommés de l'axe N (ex. {"cubes": [0, 10], "balls": [10, 40]}).
+    """
+    def __init__(self, positions: np.ndarray, channels: Optional[Dict[str, np.ndarray]] = None,
+                 segments: Optional[Dict[str, List[int]]] = None):
+        self.positions = positions
+        self.channels = channels or {}
+        self.segments = segments or {"points": [0, positions.shape[1]]}
+
+    @property
+    def steps(self) -> int:
+        return self.positions.shape[0]
+
+    @property
+    def num_points(self) -> int:
+        return self.positions.shape[1]
+
+    def segment(self, name: str) -> np.ndarray:
+        """Vue (steps, n, 3) des positions d'un segment."""
+        start, stop = self.segments[name]
+        return self.positions[:, start:stop]
+
+    def _header(self, fmt: str, topology: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "format": fmt,
+            "shape": list(self.positions.shape),
+            "segments": self.segments,
+            "topology": topology or {},
+            "channels": {name: values.tolist() for name, values in self.channels.items()}
+        }
+
+    def packed(self, topology: Optional[Dict[str, Any]] = None, precision: int = DEFAULT_PRECISION) -> Dict[str, Any]:
+        """
+        Topologie envoyée une fois, frames en un seul tableau plat (ordre C) :
+        positions[s][n][k] = frames[(s * N + n) * 3 + k].
+        """
+        payload = self._header("packed", topology)
+        payload["precision"] = precision
+        payload["frames"] = np.round(self.positions, precision).ravel().tolist()
+        return payload
+
+    def delta(self, topology: Optional[Dict[str, Any]] = None, quantum: float = DEFAULT_QUANTUM) -> Dict[str, Any]:
+        """
+        Positions quantifiées (entiers de pas quantum) : première frame complète, puis
+        différences entières d'une frame à la suivante. Reconstruction exacte côté client :
+        positions = cumsum([base] + deltas) * quantum.
+        """
+        quantized = np.rint(self.positions / quantum).astype(np.int64)
+        payload = self._header("delta", topology)
+        payload["quantum"] = quantum
+        payload["base"] = quantized[0].ravel().tolist() if self.steps else []
+        payload["deltas"] = np.diff(quantized, axis=0).ravel().tolist()
+        return payload
+
+    def to_binary(self, topology: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Format binaire brut : en-tête FRAMES_HEADER (20 octets), métadonnées JSON
+        (format, shape, segments, topologie, canaux) complétées par des espaces jusqu'à
+        un multiple de 4 octets, puis les positions en float32 little-endian (ordre C).
+        Côté navigateur : new Float32Array(buffer, 20 + metaLength, steps * N * 3).
+        """
+        meta = json.dumps(self._header("float32", topology), separators=(",", ":")).encode("utf-8")
+        meta += b" " * (-(FRAMES_HEADER.size + len(meta)) % 4)
+        header = FRAMES_HEADER.pack(FRAMES_MAGIC, FRAMES_VERSION, self.steps, self.num_points, len(meta))
+        return header + meta + self.positions.astype("<f4", copy=False).tobytes(order="C")
+
+    def to_msgpack(self, topology: Optional[Dict[str, Any]] = None) -> bytes:
+        """MessagePack : métadonnées en clair, positions en bin float32 little-endian (dtype "<f4")."""
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack n'est pas installé")
+        payload = self._header("float32", topology)
+        payload["dtype"] = "<f4"
+        payload["frames"] = self.positions.astype("<f4", copy=False).tobytes(order="C")
+        return msgpack.packb(payload, use_bin_type=True)
+
+    def to_payload(self, fmt: str, topology: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if fmt == "packed":
+            return self.packed(topology)
+        if fmt == "delta":
+            return self.delta(topology)
+        raise ValueError(f"Format d'animation inconnu : {fmt} (attendu : {', '.join(FRAME_FORMATS)})")
+
+
+def read_binary_frames(data: bytes) -> Dict[str, Any]:
+    """Décode une réponse to_binary() : métadonnées et positions (steps, N, 3) en float32."""
+    magic, version, steps, num_points, meta_length = FRAMES_HEADER.unpack_from(data)
+    if magic != FRAMES_MAGIC or version != FRAMES_VERSION:
+        raise ValueError("En-tête de frames binaire invalide")
+    offset = FRAMES_HEADER.size
+    meta = json.loads(data[offset:offset + meta_length].decode("utf-8"))
+    meta["positions"] = np.frombuffer(data, dtype="<f4", count=steps * num_points * 3,
+                                      offset=offset + meta_length).reshape(steps, num_points, 3)
+    return meta
+
+
+def run_simulation(
+    step: StepFunction,
+    steps: int,
+    num_points: int,
+    segments: Optional[Dict[str, List[int]]] = None,
+    dtype: Any = np.float64
+) -> SimulationFrames:
+    """
+    Avance un système de steps pas dans un tableau (steps, num_points, 3) préalloué.
+
+    step(out) fait avancer le système d'un pas et écrit les positions courantes dans
+    la vue out (num_points, 3) ; il peut renvoyer un dict de valeurs par frame
+    (rotations, intensités...) enregistrées comme canaux.
+    """
+    if steps < 0:
+        raise ValueError("steps doit être positif ou nul")
+    positions = np.empty((steps, num_points, 3), dtype=dtype)
+    recorded: Dict[str, List[Any]] = {}
+    for i in range(steps):
+        values = step(positions[i])
+        if values:
+            for name, value in values.items():
+                recorded.setdefault(name, []).append(value)
+    channels = {name: np.asarray(values) for name, values in recorded.items()}
+    return SimulationFrames(positions, channels, segments)
+
+
+def segments_from_sizes(**sizes: int) -> Dict[str, List[int]]:
+    """segments_from_sizes(spheres=8, cubes=6) -> {"spheres": [0, 8], "cubes": [8, 14]}."""
+    segments = {}
+    start = 0
+    for name, size in sizes.items():
+        segments[name] = [start, start + size]
+        start += size
+    return segments
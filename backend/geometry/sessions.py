@@ -0,0 +1,181 @@
+import os
+import re
+import time
+import pickle
+import secrets
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("simulation_sessions")
+
+# Nombre maximal de simulations conservées par worker (éviction LRU au-delà)
+SIMULATION_SESSION_MAX = int(os.getenv("SIMULATION_SESSION_MAX", "256"))
+# Durée d'inactivité (secondes) après laquelle une simulation est abandonnée
+SIMULATION_SESSION_TTL = float(os.getenv("SIMULATION_SESSION_TTL", "300"))
+# Répertoire partagé par les workers d'un même hôte où l'état des sessions est enregistré
+# après chaque requête ; vide : sessions propres à chaque worker
+SIMULATION_SESSION_DIR = os.getenv(
+    "SIMULATION_SESSION_DIR", os.path.join(tempfile.gettempdir(), "oracle_simulation_sessions")
+)
+
+_SESSION_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class SimulationSessionRegistry:
+    """
+    Simulations vivantes du worker, indexées par identifiant de session. Chaque session
+    garde son instance (état physique compris) entre deux requêtes ; les sessions
+    inactives depuis ttl secondes ou les moins récemment utilisées au-delà de
+    max_sessions sont évincées. Les identifiants sont attribués par le serveur.
+
+    La mémoire du registre est propre au processus : gunicorn répartit les requêtes
+    entre plusieurs workers, et un worker qui ne connaît pas la session en crée une
+    nouvelle. Pour que la simulation survive à ce changement de worker, son état est
+    enregistré (pickle) dans store_dir après chaque requête et rechargé par le worker
+    suivant lorsqu'il est plus récent que sa copie en mémoire. Ce répertoire n'est
+    partagé qu'entre les workers d'un même hôte : derrière plusieurs hôtes, il faut un
+    routage collant sur ?session= ou un store_dir commun. Deux requêtes simultanées
+    sur la même session dans deux workers différents ne sont pas sérialisées : la
+    dernière écriture l'emporte. Sans store_dir, les sessions restent locales au worker.
+    """
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_sessions: int = SIMULATION_SESSION_MAX,
+        ttl: float = SIMULATION_SESSION_TTL,
+        store_dir: Optional[str] = SIMULATION_SESSION_DIR
+    ):
+        self.factory = factory
+        self.max_sessions = max(1, max_sessions)
+        self.ttl = ttl
+        self.store_dir = store_dir or None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._sessions: "OrderedDict[str, Tuple[float, Any, threading.Lock]]" = OrderedDict()
+        # Version (inode, mtime) du fichier de chaque session telle que chargée ou écrite ici
+        self._versions: Dict[str, Tuple[int, int]] = {}
+        self._last_purge = 0.0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self, now: float) -> None:
+        while self._sessions:
+            session_id, (last_used, _, _) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - last_used <= self.ttl:
+                break
+            del self._sessions[session_id]
+            self._versions.pop(session_id, None)
+            logger.debug(f"Session de simulation {session_id} évincée")
+
+    def _path(self, session_id: str) -> Optional[str]:
+        if self.store_dir is None or not _SESSION_ID.fullmatch(session_id):
+            return None
+        return os.path.join(self.store_dir, f"{session_id}.pickle")
+
+    def _load(self, session_id: str) -> Optional[Tuple[Any, Tuple[int, int]]]:
+        """Simulation enregistrée par un autre worker, si elle est récente et plus neuve que la nôtre."""
+        path = self._path(session_id)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+            version = (stat.st_ino, stat.st_mtime_ns)
+            if time.time() - stat.st_mtime > self.ttl or self._versions.get(session_id) == version:
+                return None
+            with open(path, "rb") as handle:
+                return pickle.load(handle), version
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Session de simulation {session_id} illisible : {e}")
+            return None
+
+    def _save(self, session_id: str, simulation: Any) -> None:
+        path = self._path(session_id)
+        if path is None:
+            return
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as handle:
+                pickle.dump(simulation, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+            stat = os.stat(path)
+            with self._lock:
+                self._versions[session_id] = (stat.st_ino, stat.st_mtime_ns)
+        except Exception as e:
+            logger.warning(f"Enregistrement de la session de simulation {session_id} impossible : {e}")
+
+    def _purge_store(self) -> None:
+        """Supprime les fichiers de session inactifs depuis ttl secondes (au plus une fois par ttl)."""
+        now = time.time()
+        if self.store_dir is None or now - self._last_purge < self.ttl:
+            return
+        self._last_purge = now
+        try:
+            with os.scandir(self.store_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".pickle") and now - entry.stat().st_mtime > self.ttl:
+                        os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Purge des sessions de simulation impossible : {e}")
+
+    def acquire(self, session_id: Optional[str] = None) -> Tuple[str, Any, threading.Lock]:
+        """
+        Renvoie (identifiant, simulation, verrou) de la session, ou d'une nouvelle session
+        si l'identifiant est absent, inconnu ou expiré. Le verrou sérialise l'avancement
+        d'une même simulation par des requêtes concurrentes du worker.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._pid != os.getpid():
+                # Un worker forké ne partage pas les simulations du maître
+                self._pid = os.getpid()
+                self._sessions.clear()
+                self._versions.clear()
+            entry = self._sessions.get(session_id) if session_id else None
+            if entry is not None and now - entry[0] > self.ttl:
+                entry = None
+            stored = self._load(session_id) if session_id else None
+            if stored is not None:
+                # Avancée entre-temps par un autre worker : son état fait foi
+                simulation, self._versions[session_id] = stored
+                entry = (now, simulation, entry[2] if entry is not None else threading.Lock())
+            elif entry is None:
+                session_id = secrets.token_hex(16)
+                entry = (now, self.factory(), threading.Lock())
+            else:
+                entry = (now, entry[1], entry[2])
+            self._sessions[session_id] = entry
+            self._sessions.move_to_end(session_id)
+            self._evict(now)
+        self._purge_store()
+        return session_id, entry[1], entry[2]
+
+    def run(self, session_id: Optional[str], action: Callable[[Any], Any]) -> Tuple[str, Any]:
+        """
+        Applique action à la simulation de la session sous son verrou, puis enregistre son
+        état pour les autres workers : (identifiant, résultat).
+        """
+        session_id, simulation, lock = self.acquire(session_id)
+        with lock:
+            result = action(simulation)
+            self._save(session_id, simulation)
+        return session_id, result
+
+    def discard(self, session_id: str) -> bool:
+        with self._lock:
+            self._versions.pop(session_id, None)
+            path = self._path(session_id)
+            if path is not None:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            return self._sessions.pop(session_id, None) is not None
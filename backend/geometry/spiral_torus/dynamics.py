@@ -1,8 +1,135 @@
 # backend/geometry/spiral_torus/dynamics.py
 
 import numpy as np
-from scipy.spatial.transform import Rotation
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from .generator import toroidal_parametrization
+
+# Codes des types de points (tableau types) et noms exposés dans les dicts
+POINT_TYPES = ("sphere", "cube")
+
+
+def rotation_matrix(axis: np.ndarray, angle: float) -> np.ndarray:
+    """Matrice de rotation 3x3 d'angle angle autour de l'axe unitaire axis (formule de Rodrigues)."""
+    x, y, z = axis
+    k = np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]])
+    return np.eye(3) + np.sin(angle) * k + (1.0 - np.cos(angle)) * (k @ k)
+
+
+class ToroidalSpiralSystem:
+    """
+    Moteur de la spirale toroïdale en structure de tableaux (SoA).
+
+    Points : positions et colors (P, 3), sizes (P,), types (P,) (indices dans POINT_TYPES).
+    advance(k) applique k pas (rotation globale en un produit matriciel, champ de Lorenz
+    et bruit calculés pour tous les points à la fois) ; to_dict() produit la vue JSON.
+    """
+    def __init__(
+        self,
+        positions: np.ndarray,
+        sizes: np.ndarray,
+        types: np.ndarray,
+        colors: np.ndarray,
+        metadata: Optional[Dict[str, Any]] = None,
+        rng: Optional[np.random.Generator] = None
+    ):
+        self.rng = rng or np.random.default_rng()
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        self.sizes = np.array(sizes, dtype=np.float64).reshape(-1)
+        self.types = np.array(types, dtype=np.int8).reshape(-1)
+        self.colors = np.array(colors, dtype=np.float64).reshape(-1, 3)
+        self.metadata = metadata or {}
+
+    @property
+    def num_points(self) -> int:
+        return self.positions.shape[0]
+
+    @classmethod
+    def generate(
+        cls,
+        R: float = 8.0,
+        r: float = 2.0,
+        n_turns: int = 3,
+        n_points: int = 24,
+        seed: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> "ToroidalSpiralSystem":
+        """
+        Même disposition que generate_toroidal_spiral_system : une bille à chaque point
+        de la spirale, suivie d'un cube sur les points d'indice pair.
+        """
+        rng = rng or np.random.default_rng(seed)
+        table = toroidal_parametrization(float(R), float(r), int(n_turns), int(n_points))
+        per_point = np.where(np.arange(n_points) % 2 == 0, 2, 1)
+        index = np.repeat(np.arange(n_points), per_point)
+        # Rang dans le groupe du point : 0 pour la bille, 1 pour le cube
+        types = np.arange(len(index)) - np.repeat(np.cumsum(per_point) - per_point, per_point)
+        return cls(
+            positions=table[index],
+            sizes=np.full(len(index), r * 0.5),
+            types=types,
+            colors=rng.random((len(index), 3)),
+            metadata={"R": R, "r": r, "n_turns": n_turns, "n_points": n_points, "seed": seed},
+            rng=rng
+        )
+
+    @classmethod
+    def from_dict(cls, system: Dict[str, Any], rng: Optional[np.random.Generator] = None) -> "ToroidalSpiralSystem":
+        points = system["spiral"]["points"]
+        return cls(
+            positions=[point["position"] for point in points],
+            sizes=[point.get("size", 1.0) for point in points],
+            types=[POINT_TYPES.index(point.get("type", "sphere")) for point in points],
+            colors=[point.get("color", [1.0, 1.0, 1.0]) for point in points],
+            metadata=dict(system.get("metadata", {})),
+            rng=rng
+        )
+
+    def advance(
+        self,
+        k: int = 1,
+        delta_time: float = 0.1,
+        chaos_factor: float = 0.05,
+        noise_level: float = 0.1
+    ) -> np.ndarray:
+        """
+        Avance de k pas. À chaque pas : rotation globale autour d'un axe aléatoire
+        (centre de la spirale à l'origine), puis déplacement par le champ de Lorenz
+        simplifié et un bruit gaussien. Renvoie les positions (P, 3).
+        """
+        positions = self.positions
+        for _ in range(k):
+            axis = self.rng.standard_normal(3)
+            norm = np.linalg.norm(axis)
+            axis /= norm if norm != 0 else 1.0
+            angle = delta_time * (1.0 + chaos_factor * self.rng.random())
+            positions = positions @ rotation_matrix(axis, angle).T
+
+            x, y, z = positions[:, 0], positions[:, 1], positions[:, 2]
+            field = np.column_stack((
+                y - x,
+                x * (28 - z) - y,
+                x * y - (8 / 3) * z
+            ))
+            positions += (delta_time * chaos_factor) * field
+            positions += noise_level * self.rng.standard_normal(positions.shape)
+        self.positions = positions
+        return positions
+
+    def point_attributes(self) -> List[Dict[str, Any]]:
+        """Attributs constants de chaque point (type, taille, couleur)."""
+        return [
+            {"type": POINT_TYPES[t], "size": size, "color": color}
+            for t, size, color in zip(self.types.tolist(), self.sizes.tolist(), self.colors.tolist())
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        points = [
+            {"position": position, **attributes}
+            for position, attributes in zip(self.positions.tolist(), self.point_attributes())
+        ]
+        return {"spiral": {"points": points}, "metadata": dict(self.metadata)}
+
 
 def update_toroidal_spiral_dynamics(
     system: Dict[str, Any],
@@ -13,6 +140,9 @@ def update_toroidal_spiral_dynamics(
     """
     Met à jour la dynamique du système de spirale toroïdale (rotation, déplacement des billes/cubes).
 
+    Enveloppe de compatibilité autour de ToroidalSpiralSystem ; pour plusieurs pas,
+    utiliser directement ToroidalSpiralSystem.advance(k).
+
     Args:
         system (Dict): Système généré par generate_toroidal_spiral_system().
         delta_time (float): Pas de temps pour l'animation.
@@ -20,39 +150,17 @@ def update_toroidal_spiral_dynamics(
         noise_level (float): Niveau de bruit aléatoire ajouté aux positions.
 
     Returns:
-        Dict: Système mis à jour avec les nouvelles positions des billes/cubes.
+        Dict: Nouveau système avec les positions des billes/cubes mises à jour
+              (le système d'entrée n'est pas modifié).
     """
-    updated_system = system.copy()
-
-    # Rotation globale et dynamique chaotique pour les points
-    points = updated_system["spiral"]["points"]
-    axis = np.random.randn(3)
-    axis /= np.linalg.norm(axis) if np.linalg.norm(axis) != 0 else 1.0
-    angle = delta_time * (1.0 + chaos_factor * np.random.rand())
-    rot = Rotation.from_rotvec(angle * axis)
-    rotation_center = np.array([0.0, 0.0, 0.0])  # Centre de la spirale
-
-    for point in points:
-        pos = np.array(point["position"])
-        # Appliquer la rotation globale
-        rotated_pos = rot.apply(pos - rotation_center) + rotation_center
-        x, y, z = rotated_pos
-
-        # Appliquer une dynamique chaotique (Lorenz simplifié)
-        dx = chaos_factor * (y - x)
-        dy = chaos_factor * (x * (28 - z) - y)
-        dz = chaos_factor * (x * y - (8/3) * z)
-
-        # Calculer les déplacements avec bruit
-        point_dx = delta_time * dx + noise_level * np.random.randn()
-        point_dy = delta_time * dy + noise_level * np.random.randn()
-        point_dz = delta_time * dz + noise_level * np.random.randn()
-
-        # Mettre à jour la position
-        point["position"] = [
-            float(x + point_dx),
-            float(y + point_dy),
-            float(z + point_dz)
+    engine = ToroidalSpiralSystem.from_dict(system)
+    engine.advance(1, delta_time=delta_time, chaos_factor=chaos_factor, noise_level=noise_level)
+    updated_system = dict(system)
+    updated_system["spiral"] = {
+        **system["spiral"],
+        "points": [
+            {**point, "position": position}
+            for point, position in zip(system["spiral"]["points"], engine.positions.tolist())
         ]
-
-    return updated_system
\ No newline at end of file
+    }
+    return updated_system
@@ -1,6 +1,24 @@
+import functools
 import numpy as np
 from typing import Dict, List, Any
 
+@functools.lru_cache(maxsize=32)
+def toroidal_parametrization(R: float, r: float, n_turns: int, n_points: int) -> np.ndarray:
+    """
+    Table (n_points, 3) des positions de la spirale toroïdale, calculée une fois par
+    jeu de paramètres. Le tableau est en lecture seule (partagé entre requêtes et workers).
+    """
+    t = np.linspace(0, 2 * np.pi * n_turns, n_points)
+    theta = t
+    phi = t
+    positions = np.column_stack((
+        (R + r * np.cos(phi)) * np.cos(theta),
+        (R + r * np.cos(phi)) * np.sin(theta),
+        r * np.sin(phi)
+    ))
+    positions.flags.writeable = False
+    return positions
+
 def generate_toroidal_spiral_system(
     R: float = 8.0,
     r: float = 2.0,
@@ -38,16 +56,11 @@ def generate_toroidal_spiral_system(
         }
     }
 
-    # Générer les points de la spirale toroïdale
-    t = np.linspace(0, 2 * np.pi * n_turns, n_points)
-    theta = t
-    phi = t
-    x = (R + r * np.cos(phi)) * np.cos(theta)
-    y = (R + r * np.cos(phi)) * np.sin(theta)
-    z = r * np.sin(phi)
+    # Points de la spirale toroïdale (table précalculée)
+    positions = toroidal_parametrization(float(R), float(r), int(n_turns), int(n_points))
 
     # Placer billes (tous les points) et cubes (un point sur deux)
-    for i, (xi, yi, zi) in enumerate(zip(x, y, z)):
+    for i, (xi, yi, zi) in enumerate(positions.tolist()):
         # Bille à chaque point
         system["spiral"]["points"].append({
             "position": [xi, yi, zi],
@@ -1,80 +1,133 @@
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class SpringNetwork:
+    """
+    Solveur masses-ressorts en structure de tableaux (SoA).
+
+    Sphères : positions, velocities (N, 3), masses (N,).
+    Ressorts : indices sphere1 / sphere2 (M,), stiffness, damping, natural_length (M,).
+    Les forces des ressorts sont assemblées par sommation indexée (np.bincount sur les
+    extrémités, équivalent à np.add.at mais sans boucle Python) ; l'intégration est
+    symplectique (Euler semi-implicite) avec sous-pas.
+    """
+    def __init__(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        masses: np.ndarray,
+        sphere1: np.ndarray,
+        sphere2: np.ndarray,
+        stiffness: np.ndarray,
+        damping: np.ndarray,
+        natural_length: np.ndarray,
+        gravity: Optional[np.ndarray] = None,
+        air_resistance: float = 0.02
+    ):
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        num_spheres = self.positions.shape[0]
+        self.velocities = np.array(velocities, dtype=np.float64).reshape(num_spheres, 3)
+        self.masses = np.array(masses, dtype=np.float64).reshape(num_spheres)
+        self.sphere1 = np.array(sphere1, dtype=np.intp).reshape(-1)
+        self.sphere2 = np.array(sphere2, dtype=np.intp).reshape(-1)
+        self.stiffness = np.array(stiffness, dtype=np.float64).reshape(-1)
+        self.damping = np.array(damping, dtype=np.float64).reshape(-1)
+        self.natural_length = np.array(natural_length, dtype=np.float64).reshape(-1)
+        self.gravity = np.array([0.0, 0.0, -0.1] if gravity is None else gravity, dtype=np.float64)
+        self.air_resistance = float(air_resistance)
+
+        # Oscillation toroïdale (décalage cinématique par frame, fonction de l'indice de la sphère)
+        index = np.arange(num_spheres)
+        self._oscillation_phase = index * 0.1
+        self._oscillation_direction = np.column_stack((np.cos(index * 0.2), np.sin(index * 0.2), np.cos(index * 0.3)))
+
+    @property
+    def num_spheres(self) -> int:
+        return self.positions.shape[0]
+
+    @property
+    def num_springs(self) -> int:
+        return self.sphere1.shape[0]
+
+    @classmethod
+    def from_dict(cls, system_data: Dict[str, Any]) -> "SpringNetwork":
+        spheres = system_data.get("spheres", [])
+        springs = system_data.get("springs", [])
+        physics = system_data.get("physics", {})
+        return cls(
+            positions=[sphere["position"] for sphere in spheres],
+            velocities=[sphere["velocity"] for sphere in spheres],
+            masses=[sphere["mass"] for sphere in spheres],
+            sphere1=[spring["sphere1"] for spring in springs],
+            sphere2=[spring["sphere2"] for spring in springs],
+            stiffness=[spring["stiffness"] for spring in springs],
+            damping=[spring["damping"] for spring in springs],
+            natural_length=[spring["natural_length"] for spring in springs],
+            gravity=physics.get("gravity", [0, 0, -0.1]),
+            air_resistance=physics.get("air_resistance", 0.02)
+        )
+
+    def forces(self, positions: np.ndarray, velocities: np.ndarray) -> np.ndarray:
+        """Forces totales (N, 3) : ressorts (Hooke + amortissement), gravité, résistance de l'air."""
+        i, j = self.sphere1, self.sphere2
+        connection = positions[j] - positions[i]
+        distance = np.linalg.norm(connection, axis=1)
+        safe_distance = np.where(distance > 0, distance, 1.0)
+        direction = np.where((distance > 0)[:, None], connection / safe_distance[:, None], 0.0)
+
+        relative_velocity = np.einsum("ij,ij->i", velocities[j] - velocities[i], direction)
+        magnitude = self.stiffness * (distance - self.natural_length) + self.damping * relative_velocity
+        spring_forces = magnitude[:, None] * direction
+
+        n = self.num_spheres
+        total = np.empty((n, 3))
+        for axis in range(3):
+            total[:, axis] = (
+                np.bincount(i, weights=spring_forces[:, axis], minlength=n)
+                - np.bincount(j, weights=spring_forces[:, axis], minlength=n)
+            )
+        total += (self.gravity[None, :] - self.air_resistance * velocities) * self.masses[:, None]
+        return total
+
+    def step(self, delta_time: float = 0.016, substeps: int = 1, oscillation_factor: float = 0.1) -> np.ndarray:
+        """
+        Avance d'une frame de durée delta_time en substeps sous-pas symplectiques
+        (vitesse puis position), puis applique l'oscillation toroïdale. Renvoie les positions.
+        """
+        h = delta_time / max(1, substeps)
+        inverse_mass = 1.0 / self.masses[:, None]
+        for _ in range(max(1, substeps)):
+            self.velocities += self.forces(self.positions, self.velocities) * inverse_mass * h
+            self.positions += self.velocities * h
+        self.positions += 0.1 * np.sin(self._oscillation_phase + oscillation_factor)[:, None] * self._oscillation_direction
+        return self.positions
+
+    def write_back(self, system_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reporte positions et vitesses dans les dicts de sphères de system_data."""
+        for sphere, position, velocity in zip(system_data["spheres"], self.positions.tolist(), self.velocities.tolist()):
+            sphere["position"] = position
+            sphere["velocity"] = velocity
+        return system_data
+
+
 def update_torus_spring_dynamics(
     system_data: Dict[str, Any],
     delta_time: float = 0.016,
-    oscillation_factor: float = 0.1
+    oscillation_factor: float = 0.1,
+    substeps: int = 1
 ) -> Dict[str, Any]:
     """Met à jour la physique du système tore-ressorts-sphères."""
     try:
-        spheres = system_data.get("spheres", [])
-        springs = system_data.get("springs", [])
-        physics = system_data.get("physics", {})
-        
-        gravity = np.array(physics.get("gravity", [0, 0, -0.1]))
-        air_resistance = physics.get("air_resistance", 0.02)
-        
-        # Calcul des forces sur chaque sphère
-        forces = {i: np.zeros(3) for i in range(len(spheres))}
-        
-        # Forces des ressorts
-        for spring in springs:
-            i, j = spring["sphere1"], spring["sphere2"]
-            pos1 = np.array(spheres[i]["position"])
-            pos2 = np.array(spheres[j]["position"])
-            vel1 = np.array(spheres[i]["velocity"])
-            vel2 = np.array(spheres[j]["velocity"])
-            
-            # Vecteur de connexion
-            connection = pos2 - pos1
-            distance = np.linalg.norm(connection)
-            
-            if distance > 0:
-                direction = connection / distance
-                
-                # Force élastique (loi de Hooke)
-                spring_force = spring["stiffness"] * (distance - spring["natural_length"])
-                
-                # Force d'amortissement
-                relative_velocity = np.dot(vel2 - vel1, direction)
-                damping_force = spring["damping"] * relative_velocity
-                
-                # Force totale du ressort
-                total_force = (spring_force + damping_force) * direction
-                
-                forces[i] += total_force
-                forces[j] -= total_force
-        
-        # Mise à jour des positions et vitesses
-        for i, sphere in enumerate(spheres):
-            mass = sphere["mass"]
-            
-            # Force totale = ressorts + gravité + résistance de l'air
-            total_force = forces[i] + gravity * mass
-            velocity = np.array(sphere["velocity"])
-            total_force -= air_resistance * velocity * mass
-            
-            # Intégration de Verlet
-            acceleration = total_force / mass
-            new_velocity = velocity + acceleration * delta_time
-            new_position = np.array(sphere["position"]) + new_velocity * delta_time
-            
-            # Oscillation toroïdale pour plus de dynamisme
-            time_factor = np.sin(i * 0.1 + oscillation_factor)
-            new_position += 0.1 * time_factor * np.array([
-                np.cos(i * 0.2), np.sin(i * 0.2), np.cos(i * 0.3)
-            ])
-            
-            # Mise à jour
-            sphere["position"] = new_position.tolist()
-            sphere["velocity"] = new_velocity.tolist()
-        
-        return system_data
-        
+        network = SpringNetwork.from_dict(system_data)
+        if network.num_spheres == 0:
+            return system_data
+        network.step(delta_time, substeps=substeps, oscillation_factor=oscillation_factor)
+        return network.write_back(system_data)
+
     except Exception as e:
         logger.error(f"Erreur dynamique torus-spring: {e}")
         return system_data
@@ -1,3 +1,29 @@
+import os
+
 bind = '0.0.0.0:5000'
 workers = 3
-timeout = 120
\ No newline at end of file
+timeout = 120
+# Mode asynchrone : GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+# L'application suit la classe de worker : l'application ASGI pour les workers uvicorn,
+# l'application Flask (WSGI) sinon. GUNICORN_APP force une autre cible.
+wsgi_app = os.getenv(
+    'GUNICORN_APP',
+    'core.asgi:application' if worker_class.startswith('uvicorn.') else 'core.app:app'
+)
+
+# L'application est chargée dans le maître, qui préchauffe les caches géométriques avant
+# le fork : les workers partagent ces pages en copie-sur-écriture
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from core.warmup import warm_up_before_fork
+        warm_up_before_fork()
+
+
+def post_fork(server, worker):
+    # Sans preload (ou si le préchauffage du maître a échoué) : préchauffage dans le worker
+    from core.warmup import start_background_warmup
+    start_background_warmup()
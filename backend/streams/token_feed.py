@@ -0,0 +1,175 @@
+import os
+import re
+import json
+import time
+import secrets
+import logging
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from streams.token_stream import TokenStreamGenerator
+
+logger = logging.getLogger("token_feed")
+
+# Bornes de la taille des blocs (en tokens) et latence visée par bloc
+TOKEN_STREAM_MIN_CHUNK = int(os.getenv("TOKEN_STREAM_MIN_CHUNK", "64"))
+TOKEN_STREAM_MAX_CHUNK = int(os.getenv("TOKEN_STREAM_MAX_CHUNK", "8192"))
+TOKEN_STREAM_TARGET_LATENCY = float(os.getenv("TOKEN_STREAM_TARGET_LATENCY", "0.05"))
+# Nombre maximal de tokens par flux (reprises comprises)
+TOKEN_STREAM_MAX_TOKENS = int(os.getenv("TOKEN_STREAM_MAX_TOKENS", "10000000"))
+# Durée de vie d'un générateur partagé avant réensemencement depuis le pool
+TOKEN_STREAM_GENERATOR_MAX_AGE = float(os.getenv("TOKEN_STREAM_GENERATOR_MAX_AGE", "300"))
+
+CHAR_OPTION_KEYS = ("lowercase", "uppercase", "numbers", "symbols")
+_EVENT_ID_PATTERN = re.compile(r"^([0-9a-f]{16}):(\d+):(\d+)$")
+
+
+def normalize_char_options(char_options: Optional[Dict[str, bool]]) -> Tuple[bool, ...]:
+    """Clé canonique des options de caractères (toutes activées si aucune n'est fournie)."""
+    if not char_options:
+        return (True,) * len(CHAR_OPTION_KEYS)
+    return tuple(bool(char_options.get(key)) for key in CHAR_OPTION_KEYS)
+
+
+class TokenGeneratorRegistry:
+    """
+    Générateurs TokenStreamGenerator partagés du worker, un par combinaison d'options.
+    Ensemencés une fois via seed_func (pool d'entropie), ils sont recréés après max_age
+    secondes ou après un fork, pour que deux workers ne partagent jamais un état DRBG.
+    """
+    def __init__(self, seed_func: Callable[[], Optional[bytes]], max_age: float = TOKEN_STREAM_GENERATOR_MAX_AGE):
+        self.seed_func = seed_func
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._generators: Dict[Tuple[bool, ...], Tuple[float, TokenStreamGenerator, threading.Lock]] = {}
+
+    def _get(self, key: Tuple[bool, ...]) -> Tuple[TokenStreamGenerator, threading.Lock]:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._generators.clear()
+            entry = self._generators.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.max_age:
+                seed = self.seed_func()
+                if not seed:
+                    raise RuntimeError("Échec de la récupération de l'entropie pour le flux de tokens.")
+                generator = TokenStreamGenerator(seed=seed, char_options=dict(zip(CHAR_OPTION_KEYS, key)))
+                entry = (time.monotonic(), generator, threading.Lock())
+                self._generators[key] = entry
+            return entry[1], entry[2]
+
+    def generate(self, char_options: Optional[Dict[str, bool]], n: int, length: int) -> List[str]:
+        """Génère n tokens avec le générateur partagé correspondant aux options."""
+        key = normalize_char_options(char_options)
+        if not any(key):
+            raise ValueError("Aucun type de caractère sélectionné.")
+        generator, lock = self._get(key)
+        with lock:
+            return generator.generate_tokens(n, length)
+
+
+class AdaptiveChunkSizer:
+    """
+    Taille de bloc pilotée par la contre-pression : le temps écoulé entre deux blocs
+    inclut l'écriture vers le client (bloquante en WSGI). Un client rapide fait doubler
+    la taille des blocs, un client lent la fait diminuer de moitié.
+    """
+    def __init__(
+        self,
+        min_size: int = TOKEN_STREAM_MIN_CHUNK,
+        max_size: int = TOKEN_STREAM_MAX_CHUNK,
+        target_latency: float = TOKEN_STREAM_TARGET_LATENCY
+    ):
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.target_latency = target_latency
+        self.size = min_size
+
+    def update(self, elapsed: float) -> int:
+        if elapsed < self.target_latency / 2:
+            self.size = min(self.size * 2, self.max_size)
+        elif elapsed > self.target_latency:
+            self.size = max(self.size // 2, self.min_size)
+        return self.size
+
+
+class StreamCursor:
+    """
+    Position d'un flux : identifiant, numéro du dernier bloc et nombre de tokens émis.
+    Sérialisée comme identifiant d'événement SSE "<stream_id>:<seq>:<emitted>".
+    """
+    def __init__(self, stream_id: Optional[str] = None, seq: int = 0, emitted: int = 0):
+        self.stream_id = stream_id or secrets.token_hex(8)
+        self.seq = seq
+        self.emitted = emitted
+
+    @classmethod
+    def resume(cls, event_id: Optional[str]) -> "StreamCursor":
+        """Reprend un flux depuis Last-Event-ID ; un nouveau flux est créé si absent."""
+        if not event_id:
+            return cls()
+        match = _EVENT_ID_PATTERN.match(event_id.strip())
+        if not match:
+            raise ValueError(f"Identifiant de reprise invalide : {event_id}")
+        return cls(match.group(1), int(match.group(2)), int(match.group(3)))
+
+    @property
+    def event_id(self) -> str:
+        return f"{self.stream_id}:{self.seq}:{self.emitted}"
+
+
+def iter_token_chunks(
+    registry: TokenGeneratorRegistry,
+    char_options: Optional[Dict[str, bool]],
+    length: int,
+    total: int,
+    cursor: StreamCursor,
+    sizer: Optional[AdaptiveChunkSizer] = None
+) -> Iterator[List[str]]:
+    """
+    Produit les blocs de tokens jusqu'à total tokens émis sur l'ensemble du flux.
+    Le curseur avance à chaque bloc ; la mémoire reste bornée par la taille de bloc.
+    """
+    sizer = sizer or AdaptiveChunkSizer()
+    while cursor.emitted < total:
+        started = time.monotonic()
+        tokens = registry.generate(char_options, min(sizer.size, total - cursor.emitted), length)
+        cursor.seq += 1
+        cursor.emitted += len(tokens)
+        yield tokens
+        sizer.update(time.monotonic() - started)
+
+
+def format_sse(cursor: StreamCursor, tokens: List[str]) -> str:
+    data = json.dumps({"seq": cursor.seq, "emitted": cursor.emitted, "tokens": tokens})
+    return f"id: {cursor.event_id}\nevent: tokens\ndata: {data}\n\n"
+
+
+def format_ndjson(cursor: StreamCursor, tokens: List[str]) -> str:
+    return json.dumps({"id": cursor.event_id, "seq": cursor.seq, "emitted": cursor.emitted, "tokens": tokens}) + "\n"
+
+
+def stream_tokens_body(
+    registry: TokenGeneratorRegistry,
+    char_options: Optional[Dict[str, bool]],
+    length: int,
+    total: int,
+    cursor: StreamCursor,
+    fmt: str = "sse",
+    sizer: Optional[AdaptiveChunkSizer] = None
+) -> Iterator[str]:
+    """Corps de réponse HTTP (SSE ou NDJSON) d'un flux de tokens."""
+    formatter = format_sse if fmt == "sse" else format_ndjson
+    try:
+        for tokens in iter_token_chunks(registry, char_options, length, total, cursor, sizer):
+            yield formatter(cursor, tokens)
+        if fmt == "sse":
+            yield f"id: {cursor.event_id}\nevent: end\ndata: {json.dumps({'emitted': cursor.emitted})}\n\n"
+    except GeneratorExit:
+        logger.info(f"Flux {cursor.stream_id} interrompu par le client après {cursor.emitted} tokens.")
+        raise
+    except Exception as e:
+        logger.error(f"Erreur dans le flux de tokens {cursor.stream_id} : {e}", exc_info=True)
+        if fmt == "sse":
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
@@ -5,12 +5,20 @@ import hashlib
 import os
 import random
 from typing import Optional, Dict, List, Any
+import numpy as np
 from blake3 import blake3
 import sentry_sdk
 from entropy.quantum.entropy_oracle import get_final_entropy
+from entropy.health import get_health_monitor
 
 logger = logging.getLogger("token_stream")
 
+# Granularité de la sortie du DRBG (octets) ; le compteur avance d'un bloc à la fois
+DRBG_BLOCK_SIZE = 64
+
+# Tests de santé continus sur toute la sortie du DRBG du worker (exécutés par lots)
+DRBG_HEALTH = get_health_monitor("drbg")
+
 SENTRY_DSN = os.environ.get("SENTRY_DSN")
 if SENTRY_DSN:
     sentry_sdk.init(
@@ -46,6 +54,12 @@ class TokenStreamGenerator:
             self.alphabet = self._build_alphabet()
             if not self.alphabet:
                 raise ValueError("Aucun type de caractère sélectionné.")
+            # Tables précalculées pour la génération en lot : codes ASCII de l'alphabet
+            # et, pour chaque index, le jeu de caractères auquel il appartient
+            charsets = self._selected_charsets()
+            self._alphabet_codes = np.frombuffer(self.alphabet.encode("ascii"), dtype=np.uint8)
+            self._index_charset = np.repeat(np.arange(len(charsets)), [len(c) for c in charsets])
+            self._num_charsets = len(charsets)
 
             self.seed = seed
             if self.seed is None:
@@ -70,89 +84,126 @@ class TokenStreamGenerator:
             
             self.counter = 0
             self.buffer = bytearray()
+            self._xof = blake3(self.seed) if hash_algo == "blake3" else None
             logger.info("TokenStreamGenerator initialisé avec succès")
         except Exception as e:
             sentry_sdk.capture_exception(e)
             logger.error(f"Erreur lors de l'initialisation de TokenStreamGenerator: {e}", exc_info=True)
             raise
 
-    def _build_alphabet(self) -> str:
-        """Construit l'alphabet complet basé sur les options de caractères sélectionnées."""
-        alphabet = ""
+    def _selected_charsets(self) -> List[str]:
+        """Jeux de caractères sélectionnés, dans l'ordre de l'alphabet."""
+        charsets = []
         if self.char_options.get("lowercase"):
-            alphabet += string.ascii_lowercase
+            charsets.append(string.ascii_lowercase)
         if self.char_options.get("uppercase"):
-            alphabet += string.ascii_uppercase
+            charsets.append(string.ascii_uppercase)
         if self.char_options.get("numbers"):
-            alphabet += string.digits
+            charsets.append(string.digits)
         if self.char_options.get("symbols"):
-            alphabet += string.punctuation
-        return alphabet
+            charsets.append(string.punctuation)
+        return charsets
 
-    def _generate_bytes(self, num_bytes: int) -> bytes:
+    def _build_alphabet(self) -> str:
+        """Construit l'alphabet complet basé sur les options de caractères sélectionnées."""
+        return "".join(self._selected_charsets())
+
+    def _squeeze(self, num_bytes: int) -> bytes:
         """
-        Génère au moins num_bytes octets pseudo-aléatoires en concaténant plusieurs blocs si nécessaire.
+        Produit num_bytes (multiple de DRBG_BLOCK_SIZE) en un seul appel natif :
+        - blake3 : sortie extensible (XOF) de BLAKE3(seed), lue à partir de counter × bloc ;
+        - sha3_512 : SHAKE256(seed || counter), la famille Keccak en mode XOF.
+        counter avance du nombre de blocs produits : aucun bloc n'est jamais réémis.
         """
-        output = bytearray()
-        while len(output) < num_bytes:
-            data_to_hash = self.seed + self.counter.to_bytes(8, "big")
-            if self.hash_algo == "blake3":
-                hash_output = blake3(data_to_hash).digest()
-            elif self.hash_algo == "sha3_512":
-                hash_output = hashlib.sha3_512(data_to_hash).digest()
-            else:
-                raise ValueError("Algorithme de hachage Hash_DRBG non supporté.")
-            self.counter += 1
-            output.extend(hash_output)
-        return bytes(output[:num_bytes])
+        if self.hash_algo == "blake3":
+            output = self._xof.digest(length=num_bytes, seek=self.counter * DRBG_BLOCK_SIZE)
+        elif self.hash_algo == "sha3_512":
+            output = hashlib.shake_256(self.seed + self.counter.to_bytes(8, "big")).digest(num_bytes)
+        else:
+            raise ValueError("Algorithme de hachage Hash_DRBG non supporté.")
+        self.counter += num_bytes // DRBG_BLOCK_SIZE
+        DRBG_HEALTH.observe(output)
+        return output
 
-    def generate_token(self, length: int) -> Optional[str]:
+    def _fill_bytes(self, target: memoryview) -> None:
+        """Remplit target en place : d'abord le reliquat de self.buffer, puis la sortie du DRBG."""
+        num_bytes = len(target)
+        taken = min(len(self.buffer), num_bytes)
+        if taken:
+            target[:taken] = self.buffer[:taken]
+            del self.buffer[:taken]
+        missing = num_bytes - taken
+        if missing:
+            blocks = -(-missing // DRBG_BLOCK_SIZE)
+            output = self._squeeze(blocks * DRBG_BLOCK_SIZE)
+            target[taken:] = memoryview(output)[:missing]
+            # Le reliquat du dernier bloc est conservé pour l'appel suivant
+            self.buffer += memoryview(output)[missing:]
+
+    def _generate_bytes(self, num_bytes: int) -> bytearray:
         """
-        Génère un token de longueur donnée, en garantissant la composition des caractères
-        si les types sont sélectionnés.
+        Génère exactement num_bytes octets pseudo-aléatoires, sans perte entre deux appels.
         """
-        try:
-            if not 8 <= length <= 128:
-                raise ValueError("Longueur doit être entre 8 et 128.")
-            
-            token_chars = []
-            charsets_to_guarantee = []
+        output = bytearray(num_bytes)
+        self._fill_bytes(memoryview(output))
+        return output
 
-            if self.char_options.get("lowercase"):
-                charsets_to_guarantee.append(string.ascii_lowercase)
-            if self.char_options.get("uppercase"):
-                charsets_to_guarantee.append(string.ascii_uppercase)
-            if self.char_options.get("numbers"):
-                charsets_to_guarantee.append(string.digits)
-            if self.char_options.get("symbols"):
-                charsets_to_guarantee.append(string.punctuation)
-            
-            required_chars_count = len(charsets_to_guarantee)
+    def _sample_indices(self, count: int) -> np.ndarray:
+        """
+        Tire count index uniformes dans l'alphabet par échantillonnage par rejet :
+        les octets >= 256 - (256 % taille) sont écartés, ce qui supprime le biais du modulo.
+        """
+        alphabet_size = len(self._alphabet_codes)
+        limit = 256 - 256 % alphabet_size
+        indices = np.empty(count, dtype=np.uint8)
+        filled = 0
+        while filled < count:
+            missing = count - filled
+            raw = np.frombuffer(self._generate_bytes(int(missing * 256 / limit * 1.05) + 16), dtype=np.uint8)
+            accepted = raw[raw < limit][:missing]
+            indices[filled:filled + len(accepted)] = accepted % alphabet_size
+            filled += len(accepted)
+        return indices
 
-            if length < required_chars_count:
-                raise ValueError(f"Longueur {length} trop courte pour inclure {required_chars_count} types de caractères.")
+    def generate_tokens(self, n: int, length: int) -> List[str]:
+        """
+        Génère n tokens de longueur donnée en lot, à partir d'un seul tampon DRBG.
+        Chaque token contient au moins un caractère de chaque jeu sélectionné :
+        les lignes qui ne respectent pas la composition sont retirées en bloc, ce qui
+        donne une distribution uniforme sur les tokens valides.
 
-            system_random = secrets.SystemRandom()
-            for charset_pool in charsets_to_guarantee:
-                token_chars.append(system_random.choice(charset_pool))
-            
-            full_alphabet_list = list(self.alphabet)
-            remaining_length = length - len(token_chars)
-            
-            if remaining_length > 0:
-                num_bytes_needed = remaining_length
-                raw_bytes = self._generate_bytes(num_bytes_needed)
+        Raises:
+            ValueError: Longueur hors de [8, 128], n négatif ou longueur trop courte.
+        """
+        if not 8 <= length <= 128:
+            raise ValueError("Longueur doit être entre 8 et 128.")
+        if n < 0:
+            raise ValueError("Le nombre de tokens doit être positif.")
+        if length < self._num_charsets:
+            raise ValueError(f"Longueur {length} trop courte pour inclure {self._num_charsets} types de caractères.")
 
-                for byte_val in raw_bytes:
-                    index = byte_val % len(full_alphabet_list)
-                    token_chars.append(full_alphabet_list[index])
+        indices = np.empty((n, length), dtype=np.uint8)
+        pending = np.arange(n)
+        while len(pending):
+            draw = self._sample_indices(len(pending) * length).reshape(len(pending), length)
+            charsets = self._index_charset[draw]
+            valid = np.ones(len(pending), dtype=bool)
+            for charset_id in range(self._num_charsets):
+                valid &= (charsets == charset_id).any(axis=1)
+            indices[pending[valid]] = draw[valid]
+            pending = pending[~valid]
 
-            system_random.shuffle(token_chars)
-            
-            token = ''.join(token_chars)
-            
-            logger.info(f"Token généré: {token[:10]}... (longueur: {length})")
-            return token
+        flat = self._alphabet_codes[indices].tobytes().decode("ascii")
+        logger.debug(f"{n} tokens générés (longueur: {length})")
+        return [flat[i:i + length] for i in range(0, n * length, length)]
+
+    def generate_token(self, length: int) -> Optional[str]:
+        """
+        Génère un token de longueur donnée, en garantissant la composition des caractères
+        si les types sont sélectionnés.
+        """
+        try:
+            return self.generate_tokens(1, length)[0]
         except Exception as e:
             sentry_sdk.capture_exception(e)
             logger.error(f"Erreur dans generate_token (CSPRNG): {e}", exc_info=True)
@@ -163,14 +214,7 @@ class TokenStreamGenerator:
         Génère un flux de tokens.
         """
         try:
-            tokens = []
-            for _ in range(num_tokens):
-                token = self.generate_token(length)
-                if token:
-                    tokens.append(token)
-                else:
-                    logger.warning("Échec de génération d'un token dans le flux.")
-            return tokens
+            return self.generate_tokens(num_tokens, length)
         except Exception as e:
             sentry_sdk.capture_exception(e)
             logger.error(f"Erreur dans generate_token_stream: {e}", exc_info=True)
@@ -6,6 +6,14 @@ import pytest
 from core.app import app
 from core.utils.utils import SentryTestTransport
 from sentry_sdk.integrations.flask import FlaskIntegration
+from entropy.weather.client import reset_weather_client
+
+@pytest.fixture(autouse=True)
+def fresh_weather_client():
+    """Isole le cache et le disjoncteur météo entre les tests."""
+    reset_weather_client()
+    yield
+    reset_weather_client()
 
 @pytest.fixture
 def test_client():
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import runpy
+import socket
+import asyncio
+import threading
+import urllib.request
+import pytest
+import core.asgi
+from core.asgi import OracleASGIApp
+from core.app import app
+from entropy.weather.client import WeatherClient
+
+
+async def _request(application, path, query=b"", method="GET", body=b"", headers=()):
+    sent = []
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": query,
+        "headers": list(headers), "http_version": "1.1", "scheme": "http",
+    }
+    await application(scope, receive, send)
+    status = sent[0]["status"]
+    payload = b"".join(m.get("body", b"") for m in sent[1:])
+    return status, dict(sent[0]["headers"]), payload
+
+
+@pytest.fixture
+def asgi_app():
+    application = OracleASGIApp(app, max_threads=8)
+    yield application
+    application.executor.shutdown(wait=False)
+
+
+def test_blueprint_routes_are_served_through_wsgi(asgi_app):
+    status, headers, body = asyncio.run(_request(asgi_app, "/api/geometry/cubes/initial", b"num_cubes=2"))
+    assert status == 200
+    assert len(json.loads(body)["cubes"]) == 2
+
+def test_post_and_streaming_routes(asgi_app):
+    status, _, body = asyncio.run(_request(
+        asgi_app, "/stream_tokens", method="POST",
+        body=json.dumps({"num_tokens": 3, "length": 16}).encode(),
+        headers=[(b"content-type", b"application/json")]
+    ))
+    assert status == 200 and len(json.loads(body)["tokens"]) == 3
+    status, headers, body = asyncio.run(_request(asgi_app, "/api/token/stream", b"format=ndjson&count=100"))
+    assert headers[b"content-type"].startswith(b"application/x-ndjson")
+    assert sum(len(json.loads(line)["tokens"]) for line in body.splitlines()) == 100
+
+def test_entropy_route_serves_concurrent_requests(asgi_app, monkeypatch):
+    client = WeatherClient(ttl=60)
+    calls = []
+
+    def slow_fetch(lat, lon):
+        calls.append((lat, lon))
+        time.sleep(0.3)
+        data = {"temperature": lat, "humidity": 60, "pressure": 1013.0, "wind_speed": 3.0,
+                "wind_gust": 5.0, "clouds": 10, "precipitation": 0.0}
+        client._store(lat, lon, data)
+        return data
+
+    monkeypatch.setattr(client, "_fetch", slow_fetch)
+    monkeypatch.setattr(core.asgi, "get_weather_client", lambda: client)
+
+    async def burst():
+        return await asyncio.gather(*(_request(asgi_app, "/entropy") for _ in range(200)))
+
+    start = time.monotonic()
+    responses = asyncio.run(burst())
+    assert time.monotonic() - start < 2.0
+    assert all(status == 200 for status, _, _ in responses)
+    # Une requête amont par coordonnée malgré 200 requêtes concurrentes
+    assert len(calls) == 4
+    client.close()
+
+def test_native_entropy_route_matches_flask_headers(asgi_app, monkeypatch):
+    client = WeatherClient(ttl=60)
+    for lat, lon in core.asgi.config['coordinates']:
+        client._store(lat, lon, {"temperature": 20.0, "humidity": 60})
+    monkeypatch.setattr(core.asgi, "get_weather_client", lambda: client)
+    origin = [(b"origin", b"https://example.org")]
+    status, headers, body = asyncio.run(_request(asgi_app, "/entropy", headers=origin))
+    _, flask_headers, _ = asyncio.run(_request(asgi_app, "/health", headers=origin))
+    assert status == 200 and json.loads(body)["avg_temperature"] == 20.0
+    assert headers[b"access-control-allow-origin"] == flask_headers[b"access-control-allow-origin"]
+    assert headers[b"vary"] == flask_headers[b"vary"]
+    assert headers[b"content-length"] == str(len(body)).encode()
+
+    captured = []
+    monkeypatch.setattr(core.asgi, "get_weather_client", lambda: None)
+    monkeypatch.setattr(core.asgi.sentry_sdk, "capture_exception", captured.append)
+    status, headers, _ = asyncio.run(_request(asgi_app, "/entropy", headers=origin))
+    assert status == 500 and b"access-control-allow-origin" in headers
+    assert len(captured) == 1
+    client.close()
+
+
+def test_gunicorn_app_follows_worker_class(monkeypatch):
+    conf = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gunicorn.conf.py")
+    monkeypatch.delenv("GUNICORN_APP", raising=False)
+    monkeypatch.delenv("GUNICORN_WORKER_CLASS", raising=False)
+    assert runpy.run_path(conf)["wsgi_app"] == "core.app:app"
+    monkeypatch.setenv("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+    assert runpy.run_path(conf)["wsgi_app"] == "core.asgi:application"
+
+
+def test_uvicorn_boots_asgi_application():
+    uvicorn = pytest.importorskip("uvicorn")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config("core.asgi:application", host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 15
+        while not server.started and thread.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert server.started
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=5) as response:
+            assert response.status == 200
+            assert json.loads(response.read()) == {"status": "ok"}
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/geometry/cubes/initial?num_cubes=2", timeout=10) as response:
+            assert response.status == 200
+    finally:
+        server.should_exit = True
+        thread.join(10)
@@ -0,0 +1,50 @@
+import time
+import numpy as np
+import pytest
+from core.app import app
+from geometry.centrifuge_laser.dynamics import CentrifugeLaserSystem, update_centrifuge_laser_dynamics
+from geometry.centrifuge_laser.generator import generate_centrifuge_laser_system
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_timeline_matches_single_instant_updates(monkeypatch):
+    system = generate_centrifuge_laser_system(num_spheres=6, num_cubes=4)
+    engine = CentrifugeLaserSystem.from_dict(system)
+    times = 1.7e9 + np.arange(5) * 0.5
+    timeline = engine.evaluate(times)
+    assert timeline["positions"].shape == (5, 10, 3)
+
+    monkeypatch.setattr(time, "time", lambda: float(times[3]))
+    update_centrifuge_laser_dynamics(system)
+    positions = [body["position"] for body in system["spheres"] + system["cubes"]]
+    assert np.allclose(timeline["positions"][3], positions)
+    assert system["arm_bottom"]["rotation"] == pytest.approx(timeline["arm_bottom_rotation"][3])
+    assert system["laser_center"]["color"] == pytest.approx(timeline["laser_color"][3].tolist())
+
+def test_generator_keeps_body_layout():
+    system = generate_centrifuge_laser_system(num_spheres=12, num_cubes=8)
+    assert len(system["spheres"]) == 12 and len(system["cubes"]) == 8
+    sphere = system["spheres"][3]
+    assert sphere["initial_angle"] == pytest.approx(3 / 12 * 2 * np.pi)
+    assert 0.3 <= sphere["inertia_delay"] <= 0.8
+    assert sphere["position"] == pytest.approx([np.cos(sphere["initial_angle"] * 1.5) * 2, 5.0 - 1.5, 0.0], abs=1e-9)
+
+def test_animate_any_frame_count(client):
+    response = client.get('/api/geometry/centrifuge_laser/animate?steps=500&dt=0.5&format=packed')
+    data = response.get_json()
+    assert data['shape'] == [500, 20, 3]
+    assert len(data['channels']['arm_top_rotation']) == 500
+    frames = np.reshape(data['frames'], data['shape'])
+    assert not np.allclose(frames[0], frames[-1])
+
+def test_animate_parameters_are_bounded(client):
+    data = client.get('/api/geometry/centrifuge_laser/animate?steps=100000&num_spheres=100000&num_cubes=100000&format=packed').get_json()
+    assert data['shape'][1] == 2000 and data['shape'][0] * data['shape'][1] <= 200_000
+    for query in ('steps=dix', 'num_cubes=-', 'dt=inf'):
+        response = client.get(f'/api/geometry/centrifuge_laser/animate?{query}')
+        assert response.status_code == 400 and 'error' in response.get_json()
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from geometry.cubes.generator import CubeGenerator
+from geometry.cubes.dynamics import CubeSystem, update_cubes_dynamics
+from entropy.quantum.entropy_oracle import get_cubes_entropy
+
+
+def test_round_trip_preserves_dict_layout():
+    cubes = CubeGenerator().generate_cubes_system(num_cubes=4, num_balls_per_cube=3)
+    cubes[0]["color"] = "#ff0000"
+    out = CubeSystem.from_dicts(cubes).to_dicts()
+    assert len(out) == 4 and len(out[0]["balls"]) == 3
+    assert out[0]["color"] == "#ff0000"
+    np.testing.assert_allclose(out[2]["balls"][1]["position"], cubes[2]["balls"][1]["position"])
+
+def test_step_keeps_everything_confined():
+    system = CubeSystem.generate(num_cubes=2000, num_balls_per_cube=4, rng=np.random.default_rng(1))
+    system.step(200, delta_time=0.1, chaos=2.0)
+    assert system.positions.shape == (2000, 3)
+    assert np.all(np.abs(system.positions) + system.sizes[:, None] / 2 <= 15.0 + 1e-9)
+    limits = (system.sizes[:, None] / 2 - system.ball_radii)[..., None]
+    assert np.all(np.abs(system.ball_positions) <= limits + 1e-9)
+
+def test_ragged_balls_are_masked():
+    cubes = CubeGenerator().generate_cubes_system(num_cubes=2, num_balls_per_cube=2)
+    cubes[1]["balls"] = cubes[1]["balls"][:1]
+    system = CubeSystem.from_dicts(cubes).step(5)
+    assert [len(cube["balls"]) for cube in system.to_dicts()] == [2, 1]
+
+def test_dict_wrapper_advances_one_step():
+    cubes = CubeGenerator().generate_cubes_system(num_cubes=1)
+    updated = update_cubes_dynamics(cubes, delta_time=0.1)
+    assert updated[0]["position"] != cubes[0]["position"]
+    assert "chaos_counter" in updated[0]
+
+def test_cubes_entropy_is_produced():
+    digest = get_cubes_entropy(simulation_steps=5)
+    assert isinstance(digest, bytes) and len(digest) == 32
@@ -0,0 +1,64 @@
+import time
+import pytest
+from entropy.collector import EntropyCollector, EntropySource
+from entropy.quantum.entropy_oracle import generate_quantum_geometric_entropy
+
+
+def _slow_source(delay, value):
+    time.sleep(delay)
+    return value
+
+def _failing_source():
+    raise RuntimeError("source en panne")
+
+def test_collector_runs_sources_in_parallel():
+    collector = EntropyCollector(max_threads=4)
+    sources = [EntropySource(f"s{i}", _slow_source, args=(0.2, i), timeout=2.0) for i in range(4)]
+    start = time.monotonic()
+    results = collector.collect(sources)
+    elapsed = time.monotonic() - start
+    assert results == {"s0": 0, "s1": 1, "s2": 2, "s3": 3}
+    # Latence bornée par la source la plus lente, pas par la somme (0.8s)
+    assert elapsed < 0.6
+
+def test_collector_drops_late_and_failing_sources():
+    collector = EntropyCollector(max_threads=4)
+    seen = []
+    results = collector.collect([
+        EntropySource("rapide", _slow_source, args=(0.0, "ok"), timeout=1.0),
+        EntropySource("lente", _slow_source, args=(1.0, "trop tard"), timeout=0.1),
+        EntropySource("panne", _failing_source, timeout=1.0),
+        EntropySource("vide", _slow_source, args=(0.0, None), timeout=1.0),
+    ], on_result=lambda name, value: seen.append(name))
+    assert results == {"rapide": "ok"}
+    assert seen == ["rapide"]
+
+def test_seed_assembled_from_sources_finishing_in_time():
+    slow_weather = lambda coordinates: _slow_source(2.0, [{"temperature": 20.0}])
+    seed = generate_quantum_geometric_entropy(
+        use_weather=True,
+        use_icosahedron=False,
+        use_quantum=False,
+        use_cubes=False,
+        use_spiral_simple=False,
+        use_spiral_torus=False,
+        get_area_weather_data=slow_weather,
+        combine_weather_data=lambda data: data[0],
+        config={"coordinates": [[48.85, 2.35]]},
+        source_timeouts={"weather": 0.1}
+    )
+    assert isinstance(seed, bytes)
+    assert len(seed) == 32
+
+def test_seed_none_when_no_source_enabled():
+    seed = generate_quantum_geometric_entropy(
+        use_weather=False,
+        use_icosahedron=False,
+        use_quantum=False,
+        use_timestamps=False,
+        use_local_noise=False,
+        use_cubes=False,
+        use_spiral_simple=False,
+        use_spiral_torus=False
+    )
+    assert seed is None
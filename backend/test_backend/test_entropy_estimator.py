@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from core.app import app
+from entropy.estimator import EntropyTelemetry, HistogramEntropy, SlidingWindowEntropy
+from geometry.metacube_oracle.generator import MetaCubeOracleGenerator, MetaCubeSourceCache
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_histogram_matches_reference_entropy():
+    values = np.random.default_rng(1).uniform(-8, 8, size=(1000, 3))
+    histogram = HistogramEntropy(bins=32, value_range=(-8, 8)).update(values)
+    reference, _ = np.histogram(values, bins=32, range=(-8, 8))
+    p = reference[reference > 0] / reference.sum()
+    assert histogram.entropy() == pytest.approx(-np.sum(p * np.log2(p)))
+    assert HistogramEntropy().update([]).entropy() == 0.0
+
+def test_merge_across_workers_equals_single_pass():
+    rng = np.random.default_rng(2)
+    a, b = rng.normal(size=1000), rng.normal(scale=4, size=1000)
+    worker = HistogramEntropy().update(a)
+    merged = HistogramEntropy.from_dict(HistogramEntropy().update(b).to_dict()).merge(worker)
+    assert np.array_equal(merged.counts, HistogramEntropy().update(np.concatenate((a, b))).counts)
+    with pytest.raises(ValueError):
+        merged.merge(HistogramEntropy(bins=8))
+
+def test_sliding_window_forgets_old_observations():
+    window = SlidingWindowEntropy(window=2)
+    window.update(np.linspace(-10, 10, 500))
+    assert window.entropy() > 5
+    window.update(np.zeros(10)).update(np.zeros(10))
+    assert window.entropy() == 0.0 and window.histogram.total == 20
+
+def test_telemetry_tracks_each_source():
+    telemetry = EntropyTelemetry(window=4)
+    telemetry.observe("constant", np.ones(30))
+    telemetry.observe("spread", np.linspace(-5, 5, 300))
+    report = telemetry.snapshot(include_counts=True)
+    assert report["constant"]["window_bits"] == 0.0 and report["spread"]["window_bits"] > 3
+    assert report["spread"]["histogram"]["counts"] and report["spread"]["samples"] == 300
+    assert telemetry.combined(["constant"]).total == 30
+
+def test_frames_reuse_source_histograms():
+    cache = MetaCubeSourceCache({"cubes": lambda: {"cubes": [{"position": [1, 2, 3]}, {"position": [-4, 0, 6]}]}}, {"cubes": 60.0})
+    data = MetaCubeOracleGenerator(source_cache=cache).generate_frames(4)
+    assert cache.telemetry.snapshot()["cubes"]["observations"] == 1
+    assert data["frames"][0]["shannon_entropy"] == pytest.approx(np.log2(6))
+
+def test_malformed_source_does_not_abort_collection():
+    cache = MetaCubeSourceCache({
+        "malformed": lambda: {"spheres": [{"position": [1, 2]}, {"position": "x"}], "cubes": [{"position": [1, 2, 3]}]},
+        "broken_vertices": lambda: {"vertices": [[0, 1], [0, 1, 2]]},
+        "cubes": lambda: {"cubes": [{"position": [1, 2, 3]}, {"position": [-4, 0, 6]}]}
+    })
+    collected = cache.collect(lambda name: {"fallback": True})
+    assert [source_id for source_id, _ in collected.values()] == ["malformed:1", "broken_vertices:1", "cubes:1"]
+    report = cache.telemetry.snapshot()
+    assert report["malformed"]["samples"] == 3 and report["broken_vertices"]["samples"] == 0
+    assert cache.shannon_entropy() > 0
+
+def test_entropy_route(client):
+    client.get('/api/geometry/metacube_oracle/animate?frames=1')
+    data = client.get('/api/geometry/metacube_oracle/entropy?counts=1').get_json()
+    assert 'icosahedron' in data['sources']
+    assert 'histogram' in data['sources']['icosahedron']
+    assert 'icosahedron' in data['status']
@@ -0,0 +1,95 @@
+import os
+import time
+import numpy as np
+import pytest
+from core.app import app
+from entropy.health import (
+    AdaptiveProportionTest, HealthMonitor, RepetitionCountTest, SeedSourceMonitor,
+    adaptive_proportion_cutoff, repetition_count_cutoff
+)
+from streams.token_stream import DRBG_HEALTH, TokenStreamGenerator
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_cutoffs_follow_sp800_90b():
+    assert repetition_count_cutoff(8, alpha_exponent=20) == 4
+    assert adaptive_proportion_cutoff(512, 8, alpha_exponent=20) == 13  # Table 2 de SP 800-90B (H = 8)
+
+def test_repetition_runs_span_batches():
+    test = RepetitionCountTest(cutoff=5)
+    for chunk in (b"\x01\x02\x07\x07", b"\x07\x07", b"\x07\x07\x03"):
+        test.update(np.frombuffer(chunk, dtype=np.uint8))
+    assert test.failures == 1 and test.longest_run == 6
+
+def test_adaptive_proportion_windows_span_batches():
+    test = AdaptiveProportionTest(window=8, cutoff=5)
+    data = np.frombuffer(b"\x09\x01\x09\x02\x09\x03\x09\x09" + bytes(range(8)), dtype=np.uint8)
+    test.update(data[:3])
+    test.update(data[3:])
+    assert test.windows == 2 and test.failures == 1 and test.max_count == 5
+
+def test_random_output_passes_and_stuck_output_fails():
+    healthy = HealthMonitor("aleatoire", batch_size=4096)
+    for _ in range(40):
+        healthy.observe(os.urandom(4096))
+    assert healthy.healthy and healthy.stats()["byte_frequency"]["windows"] == 2
+
+    stuck = HealthMonitor("bloque", batch_size=4096)
+    stuck.observe(os.urandom(2048) + b"\x00" * 2048)
+    stats = stuck.stats()
+    assert not stuck.healthy
+    assert stats["repetition_count"]["failures"] == 1 and stats["adaptive_proportion"]["failures"] >= 1
+
+def test_constant_seed_is_detected():
+    monitor = HealthMonitor("graines", batch_size=32)
+    fallback = bytes(range(32))
+    monitor.observe_sample(os.urandom(32))
+    monitor.observe_sample(fallback)
+    assert monitor.healthy
+    monitor.observe_sample(fallback)
+    assert monitor.repeated_samples == 1 and not monitor.healthy
+
+def test_cached_weather_repeats_do_not_trip_stuck_check(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    monitor = SeedSourceMonitor(stuck_after=7200)
+    cached = '{"avg_temperature": 20.5}'
+    # Une collecte toutes les secondes pendant le TTL du cache météo : même JSON à chaque fois
+    for _ in range(600):
+        monitor.observe("weather", cached)
+        now[0] += 1.0
+    monitor.observe("icosahedron", b"constante")
+    stats = monitor.stats()
+    assert stats["weather"]["identical_run"] == 600 and not stats["weather"]["stuck"]
+    assert "icosahedron" not in stats
+    # Rafraîchissement : de nouvelles données réarment le compteur
+    monitor.observe("weather", '{"avg_temperature": 21.0}')
+    assert monitor.stats()["weather"]["identical_run"] == 1
+
+def test_frozen_upstream_is_reported_stuck(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    monitor = SeedSourceMonitor(stuck_after=7200)
+    frozen = '{"avg_temperature": 20.5}'
+    # Open-Meteo renvoie la même valeur à chaque rafraîchissement pendant plus de deux heures
+    for _ in range(13):
+        monitor.observe("weather", frozen)
+        now[0] += 600.0
+    stats = monitor.stats()
+    assert stats["weather"]["stuck"] and stats["weather"]["stuck_events"] == 1
+    monitor.observe("weather", '{"avg_temperature": 19.0}')
+    assert not monitor.stats()["weather"]["stuck"]
+
+def test_drbg_output_is_monitored(client):
+    before = DRBG_HEALTH.stats()
+    TokenStreamGenerator(seed=os.urandom(32)).generate_tokens(500, 64)
+    after = DRBG_HEALTH.stats()
+    assert after["bytes_tested"] + after["bytes_pending"] > before["bytes_tested"] + before["bytes_pending"]
+    report = client.get('/entropy/health').get_json()
+    assert report["monitors"]["drbg"]["healthy"]
+    assert report["monitors"]["drbg"]["failures"] == 0
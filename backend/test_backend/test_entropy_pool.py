@@ -0,0 +1,63 @@
+import time
+import pytest
+import core.app
+import entropy.pool
+from core.app import app
+from entropy.pool import EntropyPool
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_pool_draws_are_unique_and_ratcheted():
+    pool = EntropyPool(lambda: b"\x01" * 32)
+    first = pool.draw(32)
+    key_after_first = pool._key
+    second = pool.draw(32)
+    assert len(first) == 32 and len(second) == 32
+    assert first != second
+    # Chaque tirage remplace la clé interne (secret avant)
+    assert pool._key != key_after_first
+
+def test_pool_reseed_failure_returns_none():
+    pool = EntropyPool(lambda: None)
+    assert pool.draw(32) is None
+    assert pool.stats()["reseed_failures"] == 1
+
+def test_pool_scheduler_reseeds_in_background():
+    calls = []
+    pool = EntropyPool(lambda: calls.append(1) or b"\x02" * 32, reseed_interval=0.05)
+    pool.start()
+    try:
+        time.sleep(0.3)
+    finally:
+        pool.stop()
+    stats = pool.stats()
+    assert stats["reseed_count"] >= 2
+    assert stats["pool_age"] is not None
+    assert stats["last_reseed_duration"] is not None
+
+def test_pool_stats_route(client):
+    client.get('/final_entropy')
+    response = client.get('/entropy_pool/stats')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["enabled"] is True
+    assert data["seeded"] is True
+    assert data["draws"] >= 1
+
+def test_generate_token_honors_selected_sources(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(entropy.pool, "_pools", {})
+    monkeypatch.setattr(core.app, "generate_quantum_geometric_entropy", lambda **kwargs: calls.append(kwargs) or b"\x03" * 32)
+    response = client.post('/api/generate_token', json={"geometries": ["cubes", "pyramids"], "weather_enabled": False})
+    assert response.status_code == 200 and response.get_json()["token"]
+    assert len(calls) == 1
+    assert calls[0]["use_cubes"] and not calls[0]["use_icosahedron"] and not calls[0]["use_weather"]
+    # Même jeu de sources : le pool dédié est réutilisé, sans nouvelle collecte
+    client.post('/api/generate_token', json={"geometries": ["cubes"], "weather_enabled": False})
+    assert len(calls) == 1
+    assert len(entropy.pool._pools) == 1
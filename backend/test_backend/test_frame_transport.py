@@ -0,0 +1,71 @@
+import msgpack
+import numpy as np
+import pytest
+from core.app import app
+from geometry.runner import (
+    FRAMES_HEADER, FRAMES_MIMETYPE, read_binary_frames, run_simulation, segments_from_sizes
+)
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def _frames():
+    positions = np.random.default_rng(1).normal(size=(4, 5, 3))
+    state = {'i': 0}
+
+    def step(out):
+        out[:] = positions[state['i']]
+        state['i'] += 1
+        return {'angle': 0.1 * state['i']}
+    return positions, run_simulation(step, 4, 5, segments_from_sizes(spheres=2, cubes=3))
+
+def test_binary_frames_roundtrip():
+    positions, frames = _frames()
+    data = frames.to_binary({'faces': [[0, 1, 2]]})
+    meta_length = FRAMES_HEADER.unpack_from(data)[-1]
+    assert (FRAMES_HEADER.size + meta_length) % 4 == 0
+    assert len(data) == FRAMES_HEADER.size + meta_length + positions.size * 4
+
+    decoded = read_binary_frames(data)
+    assert decoded['shape'] == [4, 5, 3]
+    assert decoded['segments'] == {'spheres': [0, 2], 'cubes': [2, 5]}
+    assert decoded['topology'] == {'faces': [[0, 1, 2]]}
+    assert len(decoded['channels']['angle']) == 4
+    assert np.allclose(decoded['positions'], positions, atol=1e-6)
+
+def test_msgpack_frames_roundtrip():
+    positions, frames = _frames()
+    decoded = msgpack.unpackb(frames.to_msgpack(), raw=False)
+    assert decoded['dtype'] == '<f4'
+    assert np.allclose(np.frombuffer(decoded['frames'], dtype='<f4').reshape(decoded['shape']), positions, atol=1e-6)
+
+def test_animate_route_negotiates_msgpack(client):
+    response = client.get('/api/geometry/cubes/animate?steps=3&num_cubes=2', headers={'Accept': 'application/msgpack'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/msgpack'
+    decoded = msgpack.unpackb(response.data, raw=False)
+    assert decoded['shape'][0] == 3
+    assert np.frombuffer(decoded['frames'], dtype='<f4').size == np.prod(decoded['shape'])
+
+@pytest.mark.parametrize('route', [
+    '/api/geometry/icosahedron/animate?steps=4',
+    '/api/geometry/toroidal_spiral/animate?steps=4',
+    '/api/geometry/cubes/animate?steps=4&num_cubes=2',
+    '/api/geometry/torus_spring/animate?steps=4',
+    '/api/geometry/centrifuge_laser/animate?steps=4',
+])
+def test_animate_routes_negotiate_binary(client, route):
+    response = client.get(route, headers={'Accept': FRAMES_MIMETYPE})
+    assert response.status_code == 200
+    assert response.mimetype == FRAMES_MIMETYPE
+    assert 'Accept' in response.headers['Vary']
+    decoded = read_binary_frames(response.data)
+    assert decoded['positions'].shape[0] == 4
+
+    default = client.get(route, headers={'Accept': '*/*'})
+    assert default.mimetype == 'application/json'
+    assert len(default.get_json()['frames']) == 4
@@ -0,0 +1,61 @@
+import numpy as np
+from geometry.common import subdivide_faces, compute_vertex_neighbors
+from geometry.icosahedron.generator import generate_icosahedron
+from geometry.icosahedron.dynamics import (
+    rk4_step, laplacian_phi, update_icosahedron_dynamics, get_mesh_operator
+)
+
+PARAMS = {'sigma': 10.0, 'epsilon': 0.3, 'rho': 28.0, 'zeta': 2.1}
+
+
+def reference_rk4_step(psi, phi, neighbors, dt, params):
+    """Implémentation de référence par boucles sur les voisins."""
+    def dpsi_dt(p, f):
+        out = np.zeros_like(p)
+        for i, neigh in enumerate(neighbors):
+            if neigh:
+                out[i] = params['sigma'] * (np.mean(p[list(neigh)], axis=0) - p[i]) + params['epsilon'] * f[i] ** 2
+        return out
+
+    def dphi_dt(p, f):
+        lap = np.zeros_like(f)
+        for i, neigh in enumerate(neighbors):
+            if neigh:
+                lap[i] = sum(f[j] - f[i] for j in neigh) / len(neigh)
+        norm = np.linalg.norm(p, axis=1)
+        return params['rho'] * norm - f - norm * f + params['zeta'] * lap
+
+    k1p, k1f = dpsi_dt(psi, phi), dphi_dt(psi, phi)
+    k2p, k2f = dpsi_dt(psi + dt / 2 * k1p, phi + dt / 2 * k1f), dphi_dt(psi + dt / 2 * k1p, phi + dt / 2 * k1f)
+    k3p, k3f = dpsi_dt(psi + dt / 2 * k2p, phi + dt / 2 * k2f), dphi_dt(psi + dt / 2 * k2p, phi + dt / 2 * k2f)
+    k4p, k4f = dpsi_dt(psi + dt * k3p, phi + dt * k3f), dphi_dt(psi + dt * k3p, phi + dt * k3f)
+    return psi + dt / 6 * (k1p + 2 * k2p + 2 * k3p + k4p), phi + dt / 6 * (k1f + 2 * k2f + 2 * k3f + k4f)
+
+
+def _mesh():
+    vertices, faces = generate_icosahedron(radius=1.0)
+    return subdivide_faces(vertices, faces)
+
+def test_sparse_rk4_matches_reference():
+    vertices, faces = _mesh()
+    phi = np.random.default_rng(0).normal(scale=0.01, size=len(vertices))
+    neighbors = compute_vertex_neighbors(faces, len(vertices))
+    expected_psi, expected_phi = reference_rk4_step(vertices, phi, neighbors, 0.01, PARAMS)
+    psi, new_phi = update_icosahedron_dynamics(vertices, faces, phi, 0.01, PARAMS)
+    np.testing.assert_allclose(psi, expected_psi, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(new_phi, expected_phi, rtol=1e-10, atol=1e-12)
+    # Compatibilité : liste de voisins acceptée
+    psi_compat, _ = rk4_step(vertices, phi, neighbors, 0.01, PARAMS)
+    np.testing.assert_allclose(psi_compat, expected_psi, rtol=1e-10, atol=1e-12)
+
+def test_isolated_vertex_is_static():
+    vertices = np.vstack([_mesh()[0], [[5.0, 5.0, 5.0]]])
+    faces = _mesh()[1]
+    phi = np.ones(len(vertices))
+    assert laplacian_phi(phi * 3, get_mesh_operator(faces, len(vertices)))[-1] == 0.0
+    psi, _ = update_icosahedron_dynamics(vertices, faces, phi, 0.01, PARAMS)
+    np.testing.assert_allclose(psi[-1], vertices[-1])
+
+def test_operator_is_cached_per_topology():
+    vertices, faces = _mesh()
+    assert get_mesh_operator(faces, len(vertices)) is get_mesh_operator(faces.copy(), len(vertices))
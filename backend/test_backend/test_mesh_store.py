@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from geometry.icosahedron.generator import generate_klee_penrose_polyhedron, get_klee_penrose_mesh, generate_icosahedron
+from geometry.icosahedron.mesh_store import MeshStore
+
+
+def test_mesh_is_built_once_and_immutable():
+    mesh = get_klee_penrose_mesh(2)
+    assert get_klee_penrose_mesh(2) is mesh
+    with pytest.raises(ValueError):
+        mesh.vertices[0, 0] = 42.0
+    assert mesh.operator is mesh.operator
+
+def test_rigid_transform_applied_per_request():
+    unit = np.array(generate_klee_penrose_polyhedron(subdivisions=1)['vertices'])
+    moved = np.array(generate_klee_penrose_polyhedron(subdivisions=1, radius=2.0, position=[1.0, 0.0, -1.0])['vertices'])
+    np.testing.assert_allclose(moved, unit * 2.0 + np.array([1.0, 0.0, -1.0]))
+    # Le maillage mis en cache n'est pas modifié
+    np.testing.assert_allclose(get_klee_penrose_mesh(1).vertices, unit)
+
+def test_level_zero_matches_icosahedron():
+    vertices, faces = generate_icosahedron(radius=1.0)
+    mesh = get_klee_penrose_mesh(0)
+    np.testing.assert_allclose(mesh.vertices, vertices)
+    np.testing.assert_array_equal(mesh.faces, faces)
+
+def test_lru_eviction():
+    built = []
+    store = MeshStore(lambda level: built.append(level) or generate_icosahedron(), max_levels=2)
+    store.get(0)
+    store.get(1)
+    store.get(0)
+    store.get(2)
+    assert store.levels() == [0, 2]
+    store.get(1)
+    assert built == [0, 1, 2, 1]
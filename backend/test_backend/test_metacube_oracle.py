@@ -0,0 +1,85 @@
+import json
+import time
+import pytest
+from core.app import app
+from geometry.metacube_oracle.generator import MetaCubeOracleGenerator, MetaCubeSourceCache
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_sources_appear_once_and_are_referenced_by_id():
+    data = MetaCubeOracleGenerator().generate_frames(2)
+    assert len(data["triangles"]) == 6
+    for frame in data["frames"]:
+        assert "source_data" not in json.dumps(frame)
+        for face_name, source_id in frame["metacube"]["faces"].items():
+            assert source_id in data["sources"]
+            assert frame["kaleidoscope"]["hexagons"][face_name]["source"] == source_id
+        assert set(frame["entropy_sources"].values()) <= set(data["sources"])
+    assert frame["entropy_accumulator"] >= data["frames"][0]["entropy_accumulator"]
+
+def test_single_frame_is_serializable():
+    data = MetaCubeOracleGenerator().generate_metacube_oracle_data()
+    assert "error" not in data
+    assert data["entropy_sources"]["icosahedron"] in data["sources"]
+    json.dumps(data)
+
+def test_animate_route(client):
+    response = client.get('/api/geometry/metacube_oracle/animate?frames=3')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert len(data['frames']) == 3
+    assert 'rotation' in data['frames'][0]['metacube']
+
+def _fallback(name):
+    return {"source": name, "fallback": True}
+
+def test_source_cache_refreshes_on_its_own_cadence():
+    calls = {"fast": 0, "slow": 0}
+
+    def source(name):
+        def run():
+            calls[name] += 1
+            return {"value": calls[name]}
+        return run
+
+    cache = MetaCubeSourceCache({"fast": source("fast"), "slow": source("slow")}, {"fast": 0.0, "slow": 60.0})
+    first = cache.collect(_fallback)
+    second = cache.collect(_fallback)
+    assert calls == {"fast": 2, "slow": 1}
+    assert second["slow"] == first["slow"]
+    assert second["fast"][0] != first["fast"][0]
+
+def test_failing_source_is_marked_unavailable():
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise NotImplementedError("non implémenté")
+
+    cache = MetaCubeSourceCache({"broken": broken, "missing": None}, {"broken": 0.0}, max_failures=2, retry_after=60)
+    for _ in range(5):
+        collected = cache.collect(_fallback)
+    assert len(calls) == 2
+    assert collected["broken"][1]["fallback"] and collected["missing"][1]["fallback"]
+    assert cache.status()["broken"]["available"] is False
+
+def test_sources_are_collected_concurrently():
+    def slow():
+        time.sleep(0.3)
+        return {"spheres": []}
+
+    cache = MetaCubeSourceCache({f"slow{i}": slow for i in range(4)})
+    start = time.monotonic()
+    cache.collect(_fallback)
+    assert time.monotonic() - start < 0.9
+
+def test_animation_frames_share_one_collection():
+    cache = MetaCubeSourceCache({"cubes": lambda: {"cubes": [{"position": [1, 2, 3]}]}}, {"cubes": 60.0})
+    data = MetaCubeOracleGenerator(source_cache=cache).generate_frames(5)
+    assert list(data["sources"]) == ["cubes:1"]
+    assert all(frame["entropy_sources"] == {"cubes": "cubes:1"} for frame in data["frames"])
@@ -0,0 +1,60 @@
+import struct
+import hashlib
+import numpy as np
+import pytest
+from entropy.signature import SignatureHasher, SeedAccumulator, array_signature
+from entropy.quantum.entropy_oracle import get_spiral_torus_entropy, get_spiral_entropy
+
+
+def test_layout_is_documented_format():
+    values = np.array([[1.0, 2.0], [3.0, 4.0]])
+    expected = hashlib.blake2b(digest_size=32)
+    expected.update(b"OESG" + bytes([1]) + struct.pack("<H", 4) + b"test")
+    expected.update(struct.pack("<H", 1) + b"v" + b"d" + struct.pack("<B2I", 2, 2, 2))
+    expected.update(struct.pack("<4d", 1.0, 2.0, 3.0, 4.0))
+    assert array_signature("test", [("v", values)]) == expected.digest()
+
+def test_memory_layout_and_input_type_do_not_matter():
+    values = np.arange(12, dtype=np.float32).reshape(3, 4)
+    fortran = np.asfortranarray(values.astype(">f8"))
+    reference = array_signature("test", [("v", values)])
+    assert array_signature("test", [("v", fortran)]) == reference
+    assert array_signature("test", [("v", values.tolist())]) == reference
+
+def test_shape_label_and_domain_are_bound():
+    values = np.arange(6.0)
+    reference = array_signature("test", [("v", values)])
+    assert array_signature("test", [("v", values.reshape(2, 3))]) != reference
+    assert array_signature("test", [("w", values)]) != reference
+    assert array_signature("other", [("v", values)]) != reference
+
+def test_scalars_bytes_and_blake3():
+    hasher = SignatureHasher("test", digest_size=48, algorithm="blake3")
+    digest = hasher.update_scalar("s", 1.5).update_bytes("b", b"xyz").digest()
+    assert len(digest) == 48
+    with pytest.raises(ValueError):
+        SignatureHasher("test").update_array("v", [1, 2], dtype="<u2")
+
+def test_geometric_sources_produce_signatures():
+    assert len(get_spiral_torus_entropy(simulation_steps=3)) == 32
+    frames = get_spiral_entropy(config={}, steps=50, use_weather=False, get_entropy_data=lambda: 0.5)
+    assert len(frames[0]["entropy_hash"]) == 128
+    assert len(frames[0]["spiral_positions"]) == 50
+
+def test_seed_accumulator_frames_are_length_prefixed():
+    def seed(parts):
+        accumulator = SeedAccumulator()
+        for label, value in parts:
+            accumulator.add(label, value)
+        return accumulator.digest(32)
+    # Même concaténation, découpage différent : graines différentes
+    assert seed([("a", b"xy"), ("b", b"z")]) != seed([("a", b"x"), ("b", b"yz")])
+    assert seed([("a", b"xy")]) != seed([("b", b"xy")])
+    assert seed([("a", "xy")]) == seed([("a", b"xy")])
+    assert seed([("a", np.arange(3.0))]) == seed([("a", np.arange(3.0).tobytes())])
+
+def test_seed_accumulator_sha3_fallback():
+    accumulator = SeedAccumulator(algorithm="sha3")
+    accumulator.add("a", b"data")
+    assert len(accumulator.digest(32)) == 32
+    assert accumulator.labels == ["a"]
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from core.app import app
+from geometry.runner import run_simulation, segments_from_sizes
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def _drift_step():
+    state = {'positions': np.zeros((4, 3))}
+
+    def step(out):
+        state['positions'] = state['positions'] + np.arange(12).reshape(4, 3) * 0.001
+        out[:] = state['positions']
+        return {'energy': float(state['positions'].sum())}
+    return step
+
+def test_run_simulation_fills_preallocated_frames():
+    frames = run_simulation(_drift_step(), 5, 4, segments_from_sizes(a=1, b=3))
+    assert frames.positions.shape == (5, 4, 3)
+    assert np.allclose(frames.positions[-1], np.arange(12).reshape(4, 3) * 0.005)
+    assert frames.channels['energy'].shape == (5,)
+    assert frames.segment('b').shape == (5, 3, 3)
+
+def test_packed_and_delta_reconstruct_positions():
+    frames = run_simulation(_drift_step(), 6, 4)
+    packed = frames.packed({'faces': [[0, 1, 2]]})
+    assert packed['topology'] == {'faces': [[0, 1, 2]]}
+    assert np.allclose(np.reshape(packed['frames'], packed['shape']), frames.positions)
+
+    delta = frames.delta()
+    quantized = np.concatenate([[delta['base']], np.reshape(delta['deltas'], (5, 12))])
+    rebuilt = np.cumsum(quantized, axis=0).reshape(delta['shape']) * delta['quantum']
+    assert np.allclose(rebuilt, frames.positions, atol=delta['quantum'])
+
+@pytest.mark.parametrize('route', [
+    '/api/geometry/icosahedron/animate?steps=5',
+    '/api/geometry/toroidal_spiral/animate?steps=5',
+    '/api/geometry/cubes/animate?steps=5&num_cubes=3',
+    '/api/geometry/torus_spring/animate?steps=5',
+    '/api/geometry/centrifuge_laser/animate?steps=5',
+])
+def test_animate_routes_compact_formats(client, route):
+    legacy = client.get(route)
+    assert legacy.status_code == 200
+    assert len(legacy.get_json()['frames']) == 5
+
+    packed = client.get(route + '&format=packed')
+    assert packed.status_code == 200
+    data = packed.get_json()
+    assert data['shape'][0] == 5 and data['shape'][2] == 3
+    assert len(data['frames']) == np.prod(data['shape'])
+    assert len(packed.data) < len(legacy.data)
+
+    assert client.get(route + '&format=delta').status_code == 200
+    assert client.get(route + '&format=xml').status_code == 400
+
+def test_legacy_frames_follow_the_simulation(client):
+    frames = client.get('/api/geometry/torus_spring/animate?steps=3').get_json()['frames']
+    first = [sphere['position'] for sphere in frames[0]['spheres']]
+    last = [sphere['position'] for sphere in frames[-1]['spheres']]
+    assert first != last
+    assert frames[0]['springs'] and 'velocity' in frames[0]['spheres'][0]
@@ -0,0 +1,69 @@
+import time
+import pytest
+from core.app import app
+from geometry.sessions import SimulationSessionRegistry
+from geometry.centrifuge_laser_v2.generator import CentrifugeLaserV2Generator
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def advance(self):
+        self.value += 1
+        return self.value
+
+def test_session_keeps_simulation_alive():
+    registry = SimulationSessionRegistry(Counter, store_dir=None)
+    session, first = registry.run(None, Counter.advance)
+    again, second = registry.run(session, Counter.advance)
+    assert again == session and (first, second) == (1, 2)
+    other, value = registry.run("inconnue", Counter.advance)
+    assert other not in (session, "inconnue") and value == 1
+
+def test_lru_and_ttl_eviction(monkeypatch):
+    registry = SimulationSessionRegistry(Counter, max_sessions=2, ttl=10, store_dir=None)
+    first, _ = registry.run(None, Counter.advance)
+    second, _ = registry.run(None, Counter.advance)
+    registry.run(first, Counter.advance)
+    third, _ = registry.run(None, Counter.advance)
+    assert len(registry) == 2
+    assert registry.run(second, Counter.advance)[0] != second  # évincée (LRU)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 60)
+    assert registry.run(third, Counter.advance)[0] != third  # expirée (TTL)
+    assert len(registry) == 1
+
+def test_generator_state_persists_between_frames():
+    generator = CentrifugeLaserV2Generator()
+    frames = generator.advance(3)
+    assert [frame["frame"] for frame in frames] == [1, 2, 3]
+    assert len(frames[0]["spheres"]) == 8 and len(frames[0]["cubes"]) == 6
+    assert frames[-1]["satellite_centrifuge"]["oscillation_phase"] > frames[0]["satellite_centrifuge"]["oscillation_phase"]
+
+def test_animate_continues_the_session(client):
+    data = client.get('/api/geometry/centrifuge_laser_v2/animate?frames=2').get_json()
+    assert len(data['frames']) == 2 and data['session']
+    following = client.get(f"/api/geometry/centrifuge_laser_v2/animate?frames=1&session={data['session']}").get_json()
+    assert following['session'] == data['session']
+    assert following['frames'][0]['frame'] == 3 and not following['restarted']
+    lost = client.get('/api/geometry/centrifuge_laser_v2/animate?frames=1&session=' + '0' * 32).get_json()
+    assert lost['restarted'] and lost['session'] != '0' * 32
+
+def test_session_survives_a_change_of_worker(tmp_path):
+    # Deux registres sur le même répertoire : deux workers gunicorn du même hôte
+    first = SimulationSessionRegistry(CentrifugeLaserV2Generator, store_dir=str(tmp_path))
+    second = SimulationSessionRegistry(CentrifugeLaserV2Generator, store_dir=str(tmp_path))
+    session, frames = first.run(None, lambda generator: generator.advance(2))
+    same, frames = second.run(session, lambda generator: generator.advance(1))
+    assert same == session and frames[0]["frame"] == 3
+    same, frames = first.run(session, lambda generator: generator.advance(1))
+    assert same == session and frames[0]["frame"] == 4  # l'état avancé par l'autre worker fait foi
+    assert first.discard(session) and not (tmp_path / f"{session}.pickle").exists()
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from core.app import app
+from geometry.torus_spring.dynamics import SpringNetwork, update_torus_spring_dynamics
+from geometry.torus_spring.generator import generate_torus_spring_system
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def _reference_spring_forces(system):
+    """Assemblage ressort par ressort (ancienne implémentation) pour comparaison."""
+    spheres = system["spheres"]
+    forces = np.zeros((len(spheres), 3))
+    for spring in system["springs"]:
+        i, j = spring["sphere1"], spring["sphere2"]
+        connection = np.array(spheres[j]["position"]) - np.array(spheres[i]["position"])
+        distance = np.linalg.norm(connection)
+        direction = connection / distance
+        relative_velocity = np.dot(np.array(spheres[j]["velocity"]) - np.array(spheres[i]["velocity"]), direction)
+        force = (spring["stiffness"] * (distance - spring["natural_length"]) + spring["damping"] * relative_velocity) * direction
+        forces[i] += force
+        forces[j] -= force
+    return forces
+
+def test_sparse_assembly_matches_per_spring_loop():
+    system = generate_torus_spring_system(num_spheres=40)
+    for sphere in system["spheres"]:
+        sphere["position"] = (np.array(sphere["position"]) * 1.1).tolist()
+    network = SpringNetwork.from_dict(system)
+    network.gravity[:] = 0.0
+    network.air_resistance = 0.0
+    assert np.allclose(network.forces(network.positions, network.velocities), _reference_spring_forces(system))
+
+def test_spring_forces_cancel_out():
+    network = SpringNetwork.from_dict(generate_torus_spring_system(num_spheres=200))
+    network.positions += np.random.default_rng(0).normal(scale=0.3, size=network.positions.shape)
+    network.gravity[:] = 0.0
+    network.air_resistance = 0.0
+    assert np.allclose(network.forces(network.positions, network.velocities).sum(axis=0), 0.0)
+
+def test_dict_api_is_unchanged():
+    system = generate_torus_spring_system(num_spheres=12)
+    before = [sphere["position"] for sphere in system["spheres"]]
+    updated = update_torus_spring_dynamics(system, substeps=4)
+    assert updated is system
+    assert all(len(sphere["position"]) == 3 and len(sphere["velocity"]) == 3 for sphere in updated["spheres"])
+    assert [sphere["position"] for sphere in updated["spheres"]] != before
+
+def test_animate_configurable_size_and_frames(client):
+    response = client.get('/api/geometry/torus_spring/animate?num_spheres=300&steps=25&substeps=2&format=packed')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['shape'] == [25, 300, 3]
+    assert np.all(np.isfinite(data['frames']))
+
+def test_animate_parameters_are_bounded(client):
+    data = client.get('/api/geometry/torus_spring/animate?num_spheres=100000&steps=100000&substeps=1000&format=packed').get_json()
+    num_spheres = data['shape'][1]
+    assert num_spheres == 2000 and data['shape'][0] * num_spheres <= 200_000
+    for query in ('steps=abc', 'num_spheres=1.5', 'dt=nan', 'substeps='):
+        response = client.get(f'/api/geometry/torus_spring/animate?{query}')
+        assert response.status_code == 400 and 'error' in response.get_json()
@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+from core.startup import lazy_import, startup_report
+from core.utils.utils import get_config
+from core.app import app
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _run(code, **env):
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": BACKEND_DIR, **env}, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_app_import_defers_heavy_modules():
+    loaded = _run(
+        "import sys, json, core.app; "
+        "print(json.dumps([m for m in ('scipy', 'requests', 'pytz', 'geometry.common', 'geometry.cubes.dynamics') if m in sys.modules]))"
+    )
+    assert loaded == []
+
+def test_lazy_attribute_imports_on_first_use():
+    sys.modules.pop("colorsys", None)
+    rgb_to_hsv = lazy_import("colorsys", "rgb_to_hsv")
+    assert "colorsys" not in sys.modules
+    assert rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in startup_report()["lazy_loads_ms"]
+
+def test_import_profiler_reports_modules():
+    report = _run(
+        "import json, core.app; from core.startup import startup_report; print(json.dumps(startup_report(50)))",
+        STARTUP_PROFILE_IMPORTS="true"
+    )
+    modules = [entry["module"] for entry in report["imports"]]
+    assert "api.geometry_api" in modules and "flask" in modules
+    assert report["ready_seconds"] > 0
+
+def test_config_loaded_once():
+    assert get_config() is get_config()
+    with app.test_client() as client:
+        data = client.get('/startup/profile').get_json()
+    assert "lazy_loads_ms" in data
+
+def test_startup_profile_rejects_bad_top():
+    with app.test_client() as client:
+        assert client.get('/startup/profile?top=abc').status_code == 200
+        assert client.get('/startup/profile?top=-3').status_code == 200
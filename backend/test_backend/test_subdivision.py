@@ -0,0 +1,26 @@
+import numpy as np
+from geometry.common import subdivide_faces
+from geometry.icosahedron.generator import generate_icosahedron, loop_subdivision
+
+
+def test_vertex_and_face_counts_per_level():
+    vertices, faces = generate_icosahedron()
+    for level in range(1, 6):
+        sub_vertices, sub_faces = loop_subdivision(vertices, faces, level)
+        assert len(sub_vertices) == 10 * 4 ** level + 2
+        assert len(sub_faces) == 20 * 4 ** level
+
+def test_subdivided_mesh_is_closed_manifold():
+    vertices, faces = loop_subdivision(*generate_icosahedron(), 3)
+    edges = np.sort(np.concatenate([faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]]), axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    assert np.all(counts == 2)
+    # Aucun sommet dupliqué
+    assert len(np.unique(np.round(vertices, 12), axis=0)) == len(vertices)
+
+def test_sphere_projection():
+    vertices, faces = generate_icosahedron(radius=1.0)
+    projected, _ = subdivide_faces(vertices, faces, project_to_sphere=True, sphere_radius=2.5)
+    np.testing.assert_allclose(np.linalg.norm(projected[len(vertices):], axis=1), 2.5)
+    flat, _ = subdivide_faces(vertices, faces, project_to_sphere=False)
+    assert np.all(np.linalg.norm(flat[len(vertices):], axis=1) < 1.0)
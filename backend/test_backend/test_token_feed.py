@@ -0,0 +1,64 @@
+import os
+import json
+import pytest
+from core.app import app
+from streams.token_feed import AdaptiveChunkSizer, StreamCursor, TokenGeneratorRegistry, iter_token_chunks
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def _events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append(fields)
+    return events
+
+def test_registry_seeds_once():
+    seeds = []
+    registry = TokenGeneratorRegistry(lambda: seeds.append(1) or os.urandom(32))
+    first = registry.generate(None, 10, 16)
+    second = registry.generate({}, 10, 16)
+    assert len(seeds) == 1
+    assert not set(first) & set(second)
+
+def test_chunk_sizer_follows_backpressure():
+    sizer = AdaptiveChunkSizer(min_size=8, max_size=64, target_latency=0.1)
+    assert [sizer.update(0.0) for _ in range(4)] == [16, 32, 64, 64]
+    assert sizer.update(1.0) == 32
+
+def test_chunks_respect_total_and_advance_cursor():
+    registry = TokenGeneratorRegistry(lambda: os.urandom(32))
+    cursor = StreamCursor()
+    chunks = list(iter_token_chunks(registry, None, 16, 1000, cursor, AdaptiveChunkSizer(8, 128, 10.0)))
+    assert sum(len(c) for c in chunks) == 1000
+    assert max(len(c) for c in chunks) == 128
+    assert cursor.emitted == 1000 and cursor.seq == len(chunks)
+
+def test_sse_stream_and_resume(client):
+    response = client.get('/api/token/stream?format=sse&count=300&length=12')
+    assert response.mimetype == 'text/event-stream'
+    events = _events(response.get_data(as_text=True))
+    assert events[-1]["event"] == "end"
+    tokens = [t for e in events[:-1] for t in json.loads(e["data"])["tokens"]]
+    assert len(tokens) == 300 and all(len(t) == 12 for t in tokens)
+
+    # Reprise après le premier bloc : les compteurs continuent
+    first_id = events[0]["id"]
+    resumed = client.get('/api/token/stream?format=sse&count=300&length=12', headers={'Last-Event-ID': first_id})
+    resumed_events = _events(resumed.get_data(as_text=True))
+    stream_id, seq, emitted = first_id.split(":")
+    assert resumed_events[0]["id"].startswith(f"{stream_id}:{int(seq) + 1}:")
+    assert json.loads(resumed_events[-1]["data"])["emitted"] == 300
+
+def test_ndjson_stream_and_errors(client):
+    response = client.get('/api/token/stream?format=ndjson&count=50&symbols=false')
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sum(len(line["tokens"]) for line in lines) == 50
+    assert all(t.isalnum() for line in lines for t in line["tokens"])
+    assert client.get('/api/token/stream?format=sse&length=4').status_code == 400
+    assert client.get('/api/token/stream?format=sse', headers={'Last-Event-ID': 'bad'}).status_code == 400
@@ -55,3 +55,41 @@ def test_generate_token_stream():
     for t in tokens:
         assert t is not None
         assert len(t) == 16
+
+def test_generate_tokens_bulk_composition():
+    gen = TokenStreamGenerator(seed=os.urandom(32))
+    tokens = gen.generate_tokens(5000, 8)
+    assert len(tokens) == 5000 and len(set(tokens)) == 5000
+    for t in tokens:
+        assert len(t) == 8
+        assert any(c.islower() for c in t) and any(c.isupper() for c in t)
+        assert any(c.isdigit() for c in t) and any(not c.isalnum() for c in t)
+
+def test_generate_tokens_is_unbiased():
+    # 36 caractères : un modulo naïf favoriserait les 4 premiers (256 % 36 = 4)
+    gen = TokenStreamGenerator(seed=os.urandom(32), char_options={"lowercase": True, "numbers": True})
+    counts = {}
+    for c in "".join(gen.generate_tokens(20000, 32)):
+        counts[c] = counts.get(c, 0) + 1
+    expected = 20000 * 32 / 36
+    assert len(counts) == 36
+    assert all(abs(v - expected) < 0.05 * expected for v in counts.values())
+
+def test_generate_tokens_rejects_invalid_input():
+    gen = TokenStreamGenerator(seed=os.urandom(32))
+    with pytest.raises(ValueError):
+        gen.generate_tokens(10, 4)
+    assert gen.generate_tokens(0, 16) == []
+
+@pytest.mark.parametrize("hash_algo", ["blake3", "sha3_512"])
+def test_generate_bytes_keeps_leftover(hash_algo):
+    seed = os.urandom(32)
+    split = TokenStreamGenerator(hash_algo=hash_algo, seed=seed)
+    whole = TokenStreamGenerator(hash_algo=hash_algo, seed=seed)
+    parts = bytes(split._generate_bytes(10) + split._generate_bytes(100) + split._generate_bytes(18))
+    block = bytes(whole._generate_bytes(128))
+    if hash_algo == "blake3":
+        # La sortie XOF ne dépend pas du découpage des appels
+        assert parts == block
+    assert len(parts) == 128 and len(split.buffer) == 0 and split.counter == whole.counter == 2
+    assert len(whole._generate_bytes(1_000_003)) == 1_000_003
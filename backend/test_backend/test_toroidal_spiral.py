@@ -1,5 +1,8 @@
+import numpy as np
 import pytest
 from core.app import app
+from geometry.spiral_torus.dynamics import ToroidalSpiralSystem, update_toroidal_spiral_dynamics
+from geometry.spiral_torus.generator import generate_toroidal_spiral_system
 
 app.config['TESTING'] = True
 client = app.test_client()
@@ -32,4 +35,28 @@ def test_toroidal_spiral_structure():
         assert "size" in point
         assert "color" in point
         assert isinstance(point["color"], list)
-        assert len(point["color"]) == 3  # Couleur RGB
\ No newline at end of file
+        assert len(point["color"]) == 3  # Couleur RGB
+
+
+def test_spiral_system_layout_matches_dict_generator():
+    points = generate_toroidal_spiral_system(8.0, 2.0, 3, 24)["spiral"]["points"]
+    system = ToroidalSpiralSystem.generate(8.0, 2.0, 3, 24, seed=1)
+    assert system.num_points == len(points)
+    assert [p["type"] for p in system.to_dict()["spiral"]["points"]] == [p["type"] for p in points]
+    assert np.allclose(system.positions, [p["position"] for p in points])
+
+
+def test_spiral_advance_is_rigid_rotation_without_chaos():
+    system = ToroidalSpiralSystem.generate(n_points=1000, seed=2)
+    radii = np.linalg.norm(system.positions, axis=1)
+    positions = system.advance(5, chaos_factor=0.0, noise_level=0.0)
+    assert positions.shape == (1500, 3)
+    assert np.allclose(np.linalg.norm(positions, axis=1), radii)
+
+
+def test_spiral_update_does_not_mutate_input():
+    system = generate_toroidal_spiral_system()
+    before = [p["position"] for p in system["spiral"]["points"]]
+    updated = update_toroidal_spiral_dynamics(system)
+    assert [p["position"] for p in system["spiral"]["points"]] == before
+    assert [p["position"] for p in updated["spiral"]["points"]] != before
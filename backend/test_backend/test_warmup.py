@@ -0,0 +1,31 @@
+import pytest
+from core.app import app
+from core.warmup import warm_up, wait_until_ready, warmup_status
+from geometry.icosahedron.generator import klee_penrose_mesh_store
+from geometry.spiral_torus.generator import toroidal_parametrization
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+def test_ready_gate_opens_after_warmup(client):
+    response = client.get('/health/ready')
+    if response.status_code == 503:
+        assert response.get_json()["status"] == "warming_up"
+        assert wait_until_ready(timeout=60)
+        response = client.get('/health/ready')
+    assert response.status_code == 200
+    assert response.get_json()["ready"] is True
+    assert client.get('/health').status_code == 200
+
+def test_warmup_populates_shared_caches():
+    assert warm_up()
+    assert set(warmup_status()["icosa_levels"]) <= set(klee_penrose_mesh_store.levels())
+    mesh = klee_penrose_mesh_store.get(warmup_status()["icosa_levels"][-1])
+    assert mesh._operator is not None
+    before = toroidal_parametrization.cache_info().hits
+    toroidal_parametrization(8.0, 2.0, 3, 24)
+    assert toroidal_parametrization.cache_info().hits == before + 1
@@ -0,0 +1,92 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+from entropy.weather.client import WeatherClient, CircuitBreaker
+
+
+class FakeOpenMeteo(BaseHTTPRequestHandler):
+    """Remplaçant local d'Open-Meteo : la température renvoyée est la latitude demandée."""
+    status = 200
+    delay = 0.0
+    calls = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        type(self).calls.append((float(query["latitude"][0]), float(query["longitude"][0])))
+        time.sleep(type(self).delay)
+        body = json.dumps({
+            "current_weather": {"temperature": float(query["latitude"][0]), "windspeed": 3.5},
+            "hourly": {"relative_humidity_2m": [65], "pressure_msl": [1013.2], "cloudcover": [20],
+                       "precipitation": [0.0], "windgusts_10m": [10.0]}
+        }).encode()
+        self.send_response(type(self).status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def open_meteo():
+    FakeOpenMeteo.status = 200
+    FakeOpenMeteo.delay = 0.0
+    FakeOpenMeteo.calls = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenMeteo)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1/forecast"
+    server.shutdown()
+    server.server_close()
+
+COORDINATES = [[49.1, 2.0], [48.7, 2.7], [48.4, 2.0], [48.8, 1.7]]
+
+def test_area_fetch_is_concurrent_and_ordered(open_meteo):
+    FakeOpenMeteo.delay = 0.2
+    client = WeatherClient(base_url=open_meteo)
+    start = time.monotonic()
+    data = client.get_area(COORDINATES)
+    elapsed = time.monotonic() - start
+    assert [d["temperature"] for d in data] == [49.1, 48.7, 48.4, 48.8]
+    assert data[0]["humidity"] == 65
+    assert elapsed < 0.6  # 4 x 0.2s en série
+
+def test_ttl_cache_avoids_refetch(open_meteo):
+    client = WeatherClient(base_url=open_meteo, ttl=60)
+    client.get_area(COORDINATES)
+    client.get_area(COORDINATES)
+    assert len(FakeOpenMeteo.calls) == 4
+
+def test_stale_while_revalidate(open_meteo):
+    client = WeatherClient(base_url=open_meteo, ttl=0.0, stale_ttl=60)
+    assert client.get_current(49.1, 2.0)["temperature"] == 49.1
+    FakeOpenMeteo.delay = 0.3
+    start = time.monotonic()
+    stale = client.get_current(49.1, 2.0)
+    assert time.monotonic() - start < 0.2  # servi depuis le cache sans attendre
+    assert stale["temperature"] == 49.1
+    time.sleep(0.5)
+    assert len(FakeOpenMeteo.calls) == 2  # rafraîchi en arrière-plan
+
+def test_circuit_breaker_stops_hammering_failing_upstream(open_meteo):
+    FakeOpenMeteo.status = 500
+    client = WeatherClient(base_url=open_meteo, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    for _ in range(5):
+        assert client.get_current(49.1, 2.0) is None
+    assert len(FakeOpenMeteo.calls) == 2
+    assert client.breaker.state == "open"
+
+def test_circuit_breaker_half_open_recovers(open_meteo):
+    FakeOpenMeteo.status = 500
+    client = WeatherClient(base_url=open_meteo, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.1))
+    assert client.get_current(49.1, 2.0) is None
+    FakeOpenMeteo.status = 200
+    time.sleep(0.15)
+    assert client.get_current(49.1, 2.0)["temperature"] == 49.1
+    assert client.breaker.state == "closed"
@@ -24,6 +24,7 @@ let explosionIntensity = 0;
 let cachedFrameData = null;
 let lastFetchTime = 0;
 const FETCH_INTERVAL = 100; // ms
+let simulationSession = null; // Session de simulation côté serveur (état conservé entre les requêtes)
 
 let spherePool = [];
 let cubePool = [];
@@ -90,6 +91,7 @@ export function initCentrifugeLaserV2Visualizer(containerId) {
       .then(res => res.json())
       .then(data => {
         console.log("Données Centrifugeuse Laser V2 reçues:", data);
+        simulationSession = data.session || null;
         createCentrifugeV2System(data.frames);
         animateCentrifugeV2();
       })
@@ -196,9 +198,12 @@ export function initCentrifugeLaserV2Visualizer(containerId) {
 
     // OPTIMISATION: Fetch seulement toutes les 100ms
     if (currentTime - lastFetchTime > FETCH_INTERVAL) {
-      fetch("/api/geometry/centrifuge_laser_v2/animate")
+      const sessionQuery = simulationSession ? `&session=${encodeURIComponent(simulationSession)}` : "";
+      fetch(`/api/geometry/centrifuge_laser_v2/animate?frames=1${sessionQuery}`)
         .then(res => res.json())
         .then(data => {
+          if (data.restarted) console.warn("Session Centrifugeuse Laser V2 perdue, simulation recommencée:", data.session);
+          if (data.session) simulationSession = data.session;
           if (data.frames && data.frames.length > 0) {
             cachedFrameData = data.frames[0];
           }